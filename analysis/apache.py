@@ -0,0 +1,89 @@
+import pandas as pd
+from utils.constants import status_descriptions
+
+"""
+Summary tables of parsed Apache SSL/access logs, without any Streamlit dependency.
+"""
+
+
+def status_code_counts(df):
+    status_counts = df['status'].dropna().astype(int).value_counts().reset_index()
+    status_counts.columns = ['Status', 'Count']
+    status_counts['Status Description'] = status_counts['Status'].map(status_descriptions).fillna("Unknown")
+    return status_counts[['Status', 'Status Description', 'Count']]
+
+
+def top_urls(df, n=10):
+    url_counts = df['url'].value_counts().head(n).reset_index()
+    url_counts.columns = ['URL', 'Count']
+    return url_counts
+
+
+def request_hours(df):
+    return df['timestamp'].dt.strftime('%Y-%m-%d %H:00')
+
+
+def top_ips(df, n=10):
+    ip_counts = df['ip'].value_counts().head(n).reset_index()
+    ip_counts.columns = ['IP', 'Count']
+    return ip_counts
+
+
+# All requests of each of the top N IPs, oldest first
+def top_ip_requests_map(df, top_n=10):
+    ip_counts = df['ip'].value_counts().head(top_n).index.tolist()
+    ip_requests_map = {}
+    for ip in ip_counts:
+        ip_df = df[df['ip'] == ip][['timestamp', 'url']].sort_values('timestamp')
+        ip_df = ip_df.rename(columns={'timestamp': 'Time', 'url': 'URL'})
+        ip_requests_map[ip] = ip_df
+    return ip_requests_map
+
+
+def tls_usage(df):
+    return df.groupby(['protocol', 'cipher']).size().reset_index(name='Count')
+
+
+def method_counts(df):
+    method_counts = df['method'].value_counts().reset_index()
+    method_counts.columns = ['Method', 'Count']
+    return method_counts
+
+
+_RESPONSE_COLUMN_NAMES = {
+    'index': 'Row', 'url': 'URL', 'size_kb': 'Size (KB)', 'ip': 'IP', 'timestamp': 'Timestamp',
+    'method': 'Method', 'status': 'Status', 'filename': 'Filename',
+    'user_agent': 'User Agent', 'referer': 'Referer', 'response_time': 'Response Time'
+}
+
+
+# The largest and smallest responses, with sizes in KB
+def largest_smallest_responses(df, n_largest=20, n_smallest=10):
+    columns = ['url', 'size']
+    # Add more columns if they exist
+    for col in ['filename', 'ip', 'timestamp', 'method', 'status', 'user_agent', 'referer', 'response_time']:
+        if col in df.columns:
+            columns.insert(0 if col == 'filename' else len(columns), col)
+    # Convert size to KB for display (rounded to 2 decimals)
+    df = df.copy()
+    df['size_kb'] = (df['size'] / 1024).round(2)
+    columns_display = [col if col != 'size' else 'size_kb' for col in columns]
+    largest = df[columns_display].sort_values('size_kb', ascending=False).head(n_largest).reset_index().rename(
+        columns=_RESPONSE_COLUMN_NAMES
+    )
+    smallest = df[columns_display].sort_values('size_kb', ascending=True).head(n_smallest).reset_index().rename(
+        columns=_RESPONSE_COLUMN_NAMES
+    )
+    return largest, smallest
+
+
+# Hourly request counts of the n most frequent values of column (url, ip, ...)
+def hourly_counts_for_top(df, column, n):
+    # Ensure timestamp is datetime
+    df = df[df['timestamp'].notnull()].copy()
+    df['timestamp'] = pd.to_datetime(df['timestamp'], errors='coerce')
+    top_values = df[column].value_counts().head(n).index.tolist()
+    df_top = df[df[column].isin(top_values)].copy()
+    # Group by hour and column
+    df_top['hour'] = df_top['timestamp'].dt.strftime('%Y-%m-%d %H:00')
+    return df_top.groupby(['hour', column]).size().reset_index(name='Count')
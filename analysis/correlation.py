@@ -0,0 +1,71 @@
+import pandas as pd
+
+from analysis.cube import cube_counts, without_warnings
+
+"""
+Error correlation across files: which error types (or message templates, see data/templates.py) occur in
+which file within a date and hh:mm range.
+
+get_date_options, get_time_options, time_range, filter_df_by_range, matrix_rows and build_error_matrix back
+the interactive matrix in report/correlation.py; dates are "YYYY-MM-DD" and times "hh:mm" strings. The
+date and time options come from the minutes of the reference file in the TimeIndex of analysis/time_index.py
+(which also looks up the entries of the details table), and the matrix is counted from the slice of the
+event cube of analysis/cube.py in the selected [start, end) range. error_matrix is the same
+Type x Source File matrix over the whole time span, as written by the command-line analyzer.
+"""
+
+MATRIX_BY = ("Type", "Template")
+# A range can hold hundreds of templates; the matrix shows the most frequent ones
+MAX_TEMPLATE_ROWS = 20
+
+
+def get_date_options(time_index, selected_file):
+    minutes = pd.DatetimeIndex(time_index.minutes.get(selected_file, []))
+    return [str(day.date()) for day in minutes.normalize().unique()]
+
+
+def get_time_options(time_index, selected_file, selected_date):
+    day = pd.Timestamp(selected_date)
+    return list(time_index.minutes_between(selected_file, day, day + pd.Timedelta(days=1)).strftime("%H:%M"))
+
+
+# [start, end) of the minutes from start_time to end_time ("hh:mm") on selected_date
+def time_range(selected_date, start_time, end_time):
+    day = pd.Timestamp(selected_date)
+    start = day + pd.Timedelta(hours=int(start_time[:2]), minutes=int(start_time[3:]))
+    end = day + pd.Timedelta(hours=int(end_time[:2]), minutes=int(end_time[3:]) + 1)
+    return start, end
+
+
+# The rows of a cube (sorted by Minute) with start <= Minute < end
+def filter_df_by_range(cube, start, end):
+    first, last = cube["Minute"].to_numpy().searchsorted([start.to_datetime64(), end.to_datetime64()])
+    return cube.iloc[first:last]
+
+
+# Rows of the matrix: every error type of the cube, or the MAX_TEMPLATE_ROWS most frequent templates of
+# the filtered cube
+def matrix_rows(cube, filtered, by="Type"):
+    if by == "Template":
+        counts = cube_counts(filtered, "Template").sort_values(ascending=False, kind="stable")
+        return list(counts[counts > 0].index[:MAX_TEMPLATE_ROWS])
+    return sorted(cube["Type"].unique())
+
+
+def build_error_matrix(filtered, all_error_types, all_files, by="Type"):
+    matrix = (
+        cube_counts(filtered, [by, "Source File"])
+        .unstack(fill_value=0)
+        .reindex(index=all_error_types, columns=all_files, fill_value=0)
+        .reset_index()
+    )
+    matrix = matrix.set_index(by)
+    matrix = matrix.reindex(sorted(matrix.index), fill_value=0)
+    return matrix
+
+
+def error_matrix(cube):
+    df = without_warnings(cube)
+    all_error_types = sorted(df["Type"].unique())
+    all_files = sorted(df["Source File"].unique())
+    return build_error_matrix(df, all_error_types, all_files)
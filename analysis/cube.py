@@ -0,0 +1,64 @@
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+"""
+Pre-aggregated event counts of parsed 3DEXPERIENCE logs: one row per (Minute, Source File, Type) combination
+of the frame, with its number of entries in "Count". Minute is the entry's Timestamp floored to the minute,
+NaT for the entries logged before the first timestamp of their file; the other dimensions keep the
+categorical dtypes of the frame. The rows are sorted by Minute (NaT last), so a time range of the cube is a
+slice (see analysis.correlation.filter_df_by_range).
+
+The metrics table, the type distribution, the timeline and the correlation matrix only count entries, so
+analysis/metrics.py, analysis/type_distribution.py, analysis/timeline.py and analysis/correlation.py work on
+the cube (a few rows per minute and file) instead of the row-level frame, summing Count where they used to
+count rows. Code and Template multiply the combinations (a cube on them is nearly as long as the frame), so
+they are only counted in the DETAIL_DIMENSIONS cube the correlation matrix reads when it groups on
+templates. data/cache.get_event_cube and get_detail_cube build them once per parsed dataset, and
+extend_event_cube adds the rows appended to a followed log.
+"""
+
+CUBE_DIMENSIONS = ["Minute", "Source File", "Type"]
+DETAIL_DIMENSIONS = CUBE_DIMENSIONS + ["Code", "Template"]
+
+
+def build_event_cube(df, dimensions=CUBE_DIMENSIONS):
+    if df.empty:
+        return pd.DataFrame(columns=dimensions + ["Count"])
+    columns = [col for col in dimensions[1:] if col in df.columns]
+    return (
+        df.groupby([df["Timestamp"].dt.floor("min").rename("Minute")] + columns, observed=True, dropna=False)
+        .size()
+        .reset_index(name="Count")
+    )
+
+
+# The cube of a frame after rows were appended to it, from the cube of the earlier rows and the appended
+# rows df: only these are grouped, then the two cubes are summed
+def extend_event_cube(cube, df, dimensions=CUBE_DIMENSIONS):
+    new = build_event_cube(df, dimensions)
+    if cube.empty or new.empty:
+        return new if cube.empty else cube
+    both = pd.concat([cube, new], ignore_index=True)
+    columns = [col for col in dimensions if col in both.columns]
+    for col in columns[1:]:
+        if not isinstance(both[col].dtype, pd.CategoricalDtype):
+            both[col] = union_categoricals([cube[col], new[col]], sort_categories=True)
+    return both.groupby(columns, observed=True, dropna=False)["Count"].sum().reset_index()
+
+
+# Boolean array of the warning rows of a cube (or frame); the check runs on the categories, not on every row
+def is_warning(cube):
+    types = cube["Type"]
+    if isinstance(types.dtype, pd.CategoricalDtype):
+        warnings = [value for value in types.cat.categories if str(value).lower() == "warning"]
+        return types.isin(warnings).to_numpy()
+    return (types.str.lower() == "warning").to_numpy()
+
+
+def without_warnings(cube):
+    return cube[~is_warning(cube)]
+
+
+# Counts of a cube grouped by the given dimensions
+def cube_counts(cube, by):
+    return cube.groupby(by, observed=True)["Count"].sum()
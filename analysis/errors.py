@@ -0,0 +1,180 @@
+from functools import reduce
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from analysis.cube import is_warning
+
+"""
+Row filters behind the "All Errors" table and the "Filter by Type or Exception" table of parsed
+3DEXPERIENCE logs. "ALL" (or an empty time prefix) leaves the corresponding column unfiltered.
+
+The parsed frame has no Date and Time columns: the filters work on Timestamp, and with_date_time adds
+the two display columns to the (filtered) rows that are actually shown or exported.
+
+EntryIndex answers the filters of the "All Errors" table (file, type, date, an hh:mm or hh:mm:ss time
+prefix, warnings shown or not) without scanning the frame: it holds the row ids of every file, type and
+date (each a slice of one stable argsort, so in frame order), the row ids of the non-warning entries and the
+time_text of every row, rendered once into an Arrow-backed string array. rows intersects the sorted id arrays of the selected filters and prefix-matches the time
+text of the remaining rows only; frame returns those rows with the Date and Time display columns. narrow and
+values_in serve the "Filter by Type or Exception" table, which filters the row ids of "All Errors" further.
+data/cache.py caches the index per dataset and the row ids per filter tuple; for a followed log, extend
+groups only the appended rows and merges them in.
+"""
+
+
+_NS_PER_DAY = 86_400 * 10**9
+_DIGITS = 10 ** np.arange(5, -1, -1)
+
+
+# str() of the datetime.time of every timestamp ("hh:mm:ss", plus ".ffffff" when there are microseconds),
+# missing for NaT, as an Arrow-backed string Series. The characters are computed from the int64 nanoseconds
+# and written into one byte buffer, so no Python string is created per row.
+def time_text(timestamps):
+    missing = timestamps.isna().to_numpy()
+    micros = timestamps.to_numpy(dtype="datetime64[ns]").view(np.int64) % _NS_PER_DAY // 1000
+    seconds, fraction = np.divmod(micros, 10**6)
+    chars = np.full((len(micros), 15), ord(":"), dtype=np.uint8)
+    for i, field in enumerate((seconds // 3600, seconds // 60 % 60, seconds % 60)):
+        chars[:, 3 * i] = field // 10 + ord("0")
+        chars[:, 3 * i + 1] = field % 10 + ord("0")
+    chars[:, 8] = ord(".")
+    chars[:, 9:] = fraction[:, None] // _DIGITS % 10 + ord("0")
+    lengths = np.where(missing, 0, np.where(fraction == 0, 8, 15))
+    offsets = np.zeros(len(micros) + 1, dtype=np.int32)
+    np.cumsum(lengths, out=offsets[1:])
+    text = pa.StringArray.from_buffers(
+        len(micros), pa.py_buffer(offsets), pa.py_buffer(chars[np.arange(15) < lengths[:, None]]),
+        pa.py_buffer(np.packbits(~missing, bitorder="little")), int(missing.sum()),
+    )
+    return pd.Series(pd.arrays.ArrowStringArray(text), index=timestamps.index)
+
+
+# Adds the Date (datetime.date) and Time (hh:mm:ss string) display columns after Line
+def with_date_time(df):
+    df = df.copy()
+    position = df.columns.get_loc("Line") + 1 if "Line" in df.columns else 0
+    df.insert(position, "Date", df["Timestamp"].dt.date)
+    df.insert(position + 1, "Time", df["Timestamp"].dt.strftime("%H:%M:%S").fillna(""))
+    return df
+
+
+# (values, row ids of every value) of a Series: value i holds order[bounds[i]:bounds[i + 1]]
+def _row_groups(values, sort=True):
+    codes, uniques = pd.factorize(values, sort=sort)
+    order = np.argsort(codes, kind="stable")
+    bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+    return list(uniques), order, bounds
+
+
+# _row_groups of values after the rows from start on, whose values are new_values, were appended: every
+# value's new row ids go after its earlier ones, and values not seen before get the next group numbers
+def _extend_row_groups(positions, order, bounds, new_values, start):
+    local_codes, uniques = pd.factorize(new_values)
+    positions = dict(positions)
+    to_group = np.array([positions.setdefault(value, len(positions)) for value in uniques] + [-1], dtype=np.int64)
+    # Slot 0 holds the rows without a value (code -1), slot i + 1 the rows of value i
+    slots = to_group[local_codes] + 1
+    old_counts = np.zeros(len(positions) + 1, dtype=np.int64)
+    old_counts[:len(bounds)] = np.diff(bounds, prepend=0)
+    new_counts = np.bincount(slots, minlength=len(positions) + 1)
+    starts = np.concatenate([[0], np.cumsum(old_counts + new_counts)])
+    merged = np.empty(starts[-1], dtype=np.int64)
+    old_starts = np.cumsum(old_counts) - old_counts
+    merged[np.arange(len(order)) + np.repeat(starts[:-1] - old_starts, old_counts)] = order
+    new_order = np.argsort(slots, kind="stable")
+    sorted_slots = slots[new_order]
+    within = np.arange(len(slots)) - np.repeat(np.cumsum(new_counts) - new_counts, new_counts)
+    merged[starts[sorted_slots] + old_counts[sorted_slots] + within] = new_order + start
+    return positions, merged, starts[1:]
+
+
+# (group name, values) of the columns EntryIndex groups the rows by
+def _group_columns(df):
+    return ("file", df["Source File"]), ("type", df["Type"]), ("date", df["Timestamp"].dt.normalize())
+
+
+class EntryIndex:
+    def __init__(self, df):
+        self.n_rows = len(df)
+        self._groups = {}
+        for name, values in _group_columns(df):
+            uniques, order, bounds = _row_groups(values)
+            self._groups[name] = ({value: i for i, value in enumerate(uniques)}, order, bounds)
+        self._set_values()
+        self._non_warning_rows = np.flatnonzero(~is_warning(df))
+        self.time_text = time_text(df["Timestamp"]).reset_index(drop=True)
+
+    def _set_values(self):
+        self.files = sorted(self._groups["file"][0])
+        self.types = sorted(self._groups["type"][0])
+        self.dates = [day.date() for day in sorted(self._groups["date"][0])]
+
+    # Adds the rows appended to the frame the index was built from: df holds them, the first one at row id
+    # start (the current n_rows). Only the new rows are grouped; their ids go after the earlier ones.
+    def extend(self, df, start):
+        for name, values in _group_columns(df):
+            self._groups[name] = _extend_row_groups(*self._groups[name], values, start)
+        self._set_values()
+        self._non_warning_rows = np.concatenate([self._non_warning_rows, start + np.flatnonzero(~is_warning(df))])
+        self.time_text = pd.concat([self.time_text, time_text(df["Timestamp"])], ignore_index=True)
+        self.n_rows += len(df)
+        return self
+
+    # Row ids (sorted) of the rows where the column named by group equals value
+    def _value_rows(self, group, value):
+        positions, order, bounds = self._groups[group]
+        if value not in positions:
+            return np.empty(0, dtype=np.int64)
+        i = positions[value]
+        return order[bounds[i]:bounds[i + 1]]
+
+    # Row ids (sorted) of the entries of the frame the index was built from that pass the filters
+    def rows(self, selected_file="ALL", selected_type="ALL", selected_date="ALL", time_prefix="",
+             show_warnings=True):
+        selections = []
+        if not show_warnings:
+            selections.append(self._non_warning_rows)
+        if selected_file != "ALL":
+            selections.append(self._value_rows("file", selected_file))
+        if selected_date != "ALL":
+            selections.append(self._value_rows("date", pd.Timestamp(selected_date)))
+        if selected_type != "ALL":
+            selections.append(self._value_rows("type", selected_type))
+        if selections:
+            selections.sort(key=len)
+            rows = reduce(lambda a, b: np.intersect1d(a, b, assume_unique=True), selections)
+        else:
+            rows = np.arange(self.n_rows)
+        if time_prefix.strip():
+            matches = self.time_text.take(rows).str.startswith(time_prefix.strip())
+            rows = rows[matches.fillna(False).to_numpy(dtype=bool)]
+        return rows
+
+    # The row ids among rows (sorted) of selected_file and selected_type ("ALL" for any)
+    def narrow(self, rows, selected_file="ALL", selected_type="ALL"):
+        for group, value in (("file", selected_file), ("type", selected_type)):
+            if value != "ALL":
+                rows = np.intersect1d(rows, self._value_rows(group, value), assume_unique=True)
+        return rows
+
+    # The distinct values (sorted) of the column named by group ("file", "type" or "date") at the row ids rows
+    def values_in(self, group, rows):
+        positions, order, bounds = self._groups[group]
+        if not len(positions):
+            return []
+        selected = np.zeros(self.n_rows, dtype=bool)
+        selected[rows] = True
+        # Group i holds order[bounds[i]:bounds[i + 1]]; rows without a value sort before bounds[0]
+        hits = np.add.reduceat(selected[order], bounds[:-1])
+        return sorted(value for value, hit in zip(positions, hits) if hit)
+
+    # The rows of df at the given row ids with the Date and Time columns of with_date_time
+    def frame(self, df, rows):
+        shown = df.iloc[rows]
+        position = shown.columns.get_loc("Line") + 1 if "Line" in shown.columns else 0
+        shown.insert(position, "Date", shown["Timestamp"].dt.date)
+        time = self.time_text.take(rows).str.slice(0, 8).fillna("")
+        shown.insert(position + 1, "Time", time.to_numpy(dtype=object))
+        return shown
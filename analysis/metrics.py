@@ -0,0 +1,52 @@
+import re
+
+from analysis.cube import cube_counts
+
+"""
+Per-file error metrics for parsed 3DEXPERIENCE logs, without any Streamlit dependency.
+
+error_summary counts the entries of every Type in every (cleaned) source file, with a "Total" row at the
+bottom, from the event cube of analysis/cube.py. It is the table shown by report/metrics.py and written by
+the command-line analyzer.
+prefilter_summary reports how many lines of the parsed files never reached the parser's regexes and
+message_pool_summary how far interning (data.parser.intern_messages) deduplicated the messages.
+"""
+
+
+# Clean file names: remove extension and date
+def clean_filename(fname):
+    # Zip members are named "member (archive/dir)"; only the member's own name is cleaned
+    fname, sep, location = fname.partition(" (")
+    # Remove extension
+    fname = re.sub(r'\.[^.]+$', '', fname)
+    # Remove date patterns like 2025-07-01 or 20250701 or similar
+    fname = re.sub(r'[-_.]?\d{4}[-_.]?\d{2}[-_.]?\d{2}', '', fname)
+    return fname + sep + location
+
+
+def error_summary(cube):
+    summary = cube_counts(cube, ["Type", "Source File"]).unstack(fill_value=0)
+    # Files whose names clean to the same name (e.g. the same log on several days) share a column
+    cleaned = [clean_filename(name) for name in summary.columns]
+    summary = summary.T.groupby(cleaned).sum().T.sort_index()
+    # Add a "Total" row at the bottom for each file
+    summary.loc["Total"] = summary.sum(axis=0)
+    return summary.reset_index().rename(columns={"Type": "Error Type"})
+
+
+# How many lines the parser's prefilter kept away from the regexes (see data/mmap_parser.py), or None when
+# the frame has no line counts (e.g. followed logs)
+def prefilter_summary(df):
+    lines = df.attrs.get("lines")
+    if not lines:
+        return None
+    skipped = df.attrs["skipped_lines"]
+    return f"Prefilter skipped {skipped:,} of {lines:,} lines ({skipped / lines:.1%}) without running the regexes."
+
+
+# Rows per distinct message text after data.parser.intern_messages, or None when the frame was not interned
+def message_pool_summary(df):
+    distinct = df.attrs.get("distinct_messages")
+    if not distinct:
+        return None
+    return f"{len(df):,} messages share {distinct:,} distinct texts ({len(df) / distinct:,.1f}x dedup)."
@@ -0,0 +1,56 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+"""
+Server-side sorting and paging of large result tables: the dashboard only materializes (and sends to the
+browser) the rows of the visible page, whatever the number of matching rows.
+
+sort_keys ranks the values of a column once (equal values share a rank, -1 for missing values), so that
+sort_rows orders any subset of row ids by an integer argsort of their ranks instead of sorting the values
+again; ties keep row order and missing values come last in both directions, like sort_values with
+kind="stable". For a followed log, extend_ranked_values ranks the appended values into them. page_bounds
+clamps a 1-based page number and returns the [start, end) slice of the page.
+"""
+
+PAGE_SIZES = (50, 100, 500, 1000)
+_LAST = np.iinfo(np.int64).max
+
+
+def sort_keys(values):
+    return ranked_values(values)[0]
+
+
+# (sort_keys of values, the sorted distinct values the ranks index)
+def ranked_values(values):
+    if isinstance(values.dtype, pd.CategoricalDtype) and not values.cat.categories.is_monotonic_increasing:
+        # Rank by value, not by the order the categories were added in
+        values = values.cat.reorder_categories(values.cat.categories.sort_values())
+    codes, uniques = pd.factorize(values, sort=True)
+    return codes.astype(np.int64), pd.Index(np.asarray(uniques))
+
+
+# ranked_values of a column after new_values were appended to it, from those of the earlier values: the
+# earlier ranks are renumbered through the merged distinct values instead of sorting the column again
+def extend_ranked_values(keys, uniques, new_values):
+    new_keys, new_uniques = ranked_values(new_values)
+    merged = uniques.union(new_uniques)
+    # -1 (missing) stays -1 through the last slot
+    old_ranks = np.append(merged.get_indexer(uniques), -1)
+    new_ranks = np.append(merged.get_indexer(new_uniques), -1)
+    return np.concatenate([old_ranks[keys], new_ranks[new_keys]]), merged
+
+
+def sort_rows(rows, keys, ascending=True):
+    ranks = keys[rows]
+    ranks = np.where(ranks < 0, _LAST, ranks if ascending else -ranks)
+    return rows[np.argsort(ranks, kind="stable")]
+
+
+# (start, end, page, n_pages) of page (1-based, clamped to the existing pages) of n_rows rows
+def page_bounds(n_rows, page, page_size):
+    n_pages = max(1, math.ceil(n_rows / page_size))
+    page = min(max(page, 1), n_pages)
+    start = (page - 1) * page_size
+    return start, min(start + page_size, n_rows), page, n_pages
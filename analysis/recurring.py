@@ -0,0 +1,18 @@
+"""
+Most frequent (Source File, Type, Code, Template) combinations of parsed 3DEXPERIENCE logs, warnings excluded.
+Messages that only differ by ids, numbers or object names share a Template (see data/templates.py); Example
+is the first message of each group.
+"""
+
+
+def top_recurring_messages(df, selected_file="ALL", n=10):
+    # Exclude warnings
+    df = df[df["Type"].str.lower() != "warning"]
+    if selected_file != "ALL":
+        df = df[df["Source File"] == selected_file]
+    top_messages = (
+        df.groupby(["Source File", "Type", "Code", "Template"], observed=True)
+        .agg(Count=("Message", "size"), Example=("Message", "first"))
+        .reset_index()
+    )
+    return top_messages.sort_values("Count", ascending=False).head(n)
@@ -0,0 +1,123 @@
+import re
+from bisect import bisect_left
+
+import numpy as np
+import pandas as pd
+
+"""
+Full-text search over the Message column of parsed 3DEXPERIENCE logs.
+
+MessageIndex is an inverted index over the distinct messages of a frame (entries repeat the same texts, see
+data.parser.intern_messages): every lowercase token (a run of word characters) maps to the ids of the
+distinct messages containing it. The postings are stored as one sorted vocabulary, an offsets array and one
+array of message ids, so the tokens sharing a prefix are a contiguous range found by bisection. search
+matches the distinct messages first and returns the row ids (in frame order) of the entries holding them,
+so its cost follows the number of distinct messages, not of rows. extend adds the rows appended to a
+followed log, tokenizing only the messages it has not seen.
+
+Queries are case-insensitive and made of terms that must all match:
+  word          a message token equal to word
+  word*         a message token starting with word
+  "a phrase"    the tokens of the phrase, adjacent and in order
+A term holding several tokens (e.g. java.lang.NullPointerException) is matched as a phrase; a trailing *
+makes its last token a prefix. Terms without any word character are ignored.
+"""
+
+_TOKEN = re.compile(r"\w+")
+_TERM = re.compile(r'"([^"]*)"?|(\S+)')
+
+
+# (tokens, last token is a prefix) of every term of a query
+def parse_query(query):
+    terms = []
+    for phrase, word in _TERM.findall(query.lower()):
+        text = phrase or word
+        tokens = _TOKEN.findall(text)
+        if tokens:
+            terms.append((tokens, not phrase and text.endswith("*")))
+    return terms
+
+
+# (message id, token) pairs of messages, whose ids start at first_id: every distinct lowercase token of a
+# message once, as a Series of tokens indexed by message id
+def _message_tokens(messages, first_id=0):
+    return pd.Series(
+        [sorted(set(_TOKEN.findall(message.lower()))) for message in messages],
+        index=pd.RangeIndex(first_id, first_id + len(messages)), dtype=object,
+    ).explode().dropna()
+
+
+class MessageIndex:
+    def __init__(self, df):
+        codes, messages = pd.factorize(df["Message"]) if not df.empty else (np.empty(0, dtype=np.int64), [])
+        self._codes = codes.astype(np.int32)
+        self._messages = list(messages)
+        self._message_ids = None
+        tokens = _message_tokens(self._messages)
+        token_codes, vocabulary = pd.factorize(tokens, sort=True)
+        order = np.lexsort((tokens.index.to_numpy(), token_codes))
+        self.vocabulary = list(vocabulary)
+        self._ids = tokens.index.to_numpy()[order].astype(np.int32)
+        self._offsets = np.searchsorted(token_codes[order], np.arange(len(self.vocabulary) + 1))
+
+    # Adds the rows appended to the frame the index was built from (df holds them, the first one at row id
+    # start): only the messages not seen before are tokenized, and their postings merged into the index
+    def extend(self, df, start):
+        if self._message_ids is None:
+            self._message_ids = {message: i for i, message in enumerate(self._messages)}
+        codes, messages = pd.factorize(df["Message"])
+        first_id = len(self._messages)
+        ids = np.array([self._message_ids.setdefault(message, len(self._message_ids)) for message in messages],
+                       dtype=np.int32)
+        self._messages.extend(messages[ids >= first_id])
+        self._codes = np.concatenate([self._codes, ids[codes]])
+        tokens = _message_tokens(self._messages[first_id:], first_id)
+        if tokens.empty:
+            return self
+        vocabulary = pd.Index(self.vocabulary, dtype=object).union(pd.Index(tokens.unique(), dtype=object))
+        token_codes = np.concatenate([
+            np.repeat(vocabulary.get_indexer(self.vocabulary), np.diff(self._offsets)),
+            vocabulary.get_indexer(tokens.to_numpy()),
+        ])
+        # The earlier postings come first and hold the smaller message ids, so a stable sort on the token
+        # keeps the ids of every token sorted
+        order = np.argsort(token_codes, kind="stable")
+        self.vocabulary = list(vocabulary)
+        self._ids = np.concatenate([self._ids, tokens.index.to_numpy().astype(np.int32)])[order]
+        self._offsets = np.searchsorted(token_codes[order], np.arange(len(self.vocabulary) + 1))
+        return self
+
+    # Boolean mask over the distinct messages containing a token equal to (or starting with) token
+    def _token_mask(self, token, prefix=False):
+        mask = np.zeros(len(self._messages), dtype=bool)
+        lo = bisect_left(self.vocabulary, token)
+        if prefix:
+            # Every token starting with token sorts before token + the highest code point
+            hi = bisect_left(self.vocabulary, token + "\U0010ffff", lo)
+        else:
+            hi = lo + 1 if lo < len(self.vocabulary) and self.vocabulary[lo] == token else lo
+        mask[self._ids[self._offsets[lo]:self._offsets[hi]]] = True
+        return mask
+
+    def _term_mask(self, tokens, prefix):
+        mask = self._token_mask(tokens[-1], prefix)
+        for token in tokens[:-1]:
+            mask &= self._token_mask(token)
+        if len(tokens) > 1:
+            # The tokens are all there; keep the messages where they are adjacent and in order
+            pattern = re.compile(
+                r"(?<!\w)" + r"\W+".join(map(re.escape, tokens)) + ("" if prefix else r"(?!\w)"), re.IGNORECASE
+            )
+            for i in np.flatnonzero(mask):
+                mask[i] = pattern.search(self._messages[i]) is not None
+        return mask
+
+    # Row ids (sorted) of the entries whose message matches every term of query; None for an empty query
+    def search(self, query):
+        terms = parse_query(query)
+        if not terms:
+            return None
+        mask = np.ones(len(self._messages), dtype=bool)
+        for tokens, prefix in terms:
+            mask &= self._term_mask(tokens, prefix)
+        return np.flatnonzero(mask[self._codes])
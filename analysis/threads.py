@@ -0,0 +1,138 @@
+import re
+from collections import defaultdict
+
+import pandas as pd
+
+"""
+Thread dump analysis on the output of parse_openj9_thread_dump (one list of lines per thread), without any
+Streamlit dependency. extract_thread_info returns the per-thread maps every other function here works on:
+thread_states, thread_waiting_on, lock_owners, thread_stack_map (top non-JDK frame) and thread_blocks
+(full "at ..." stack).
+"""
+
+
+def extract_thread_info(threads):
+    lock_owners = {}
+    thread_waiting_on = {}
+    thread_stack_map = {}
+    thread_states = {}
+    thread_blocks = {}
+
+    for thread in threads:
+        thread_text = "\n".join(thread)
+        thread_name_match = re.match(r'^\"([^\"]+)\"', thread[0])
+        thread_name = thread_name_match.group(1) if thread_name_match else "Unknown"
+
+        state_match = re.search(r'java\.lang\.Thread\.State:\s+(\w+)', thread_text)
+        state = state_match.group(1) if state_match else "UNKNOWN"
+        thread_states[thread_name] = state
+
+        locked_objs = re.findall(r'- locked <([^>]+)>', thread_text)
+        for obj in locked_objs:
+            lock_owners[obj] = thread_name
+
+        waiting_match = re.search(r'- waiting to lock <([^>]+)>', thread_text)
+        if waiting_match:
+            thread_waiting_on[thread_name] = waiting_match.group(1)
+
+        top_method = "N/A"
+        stack = []
+        for line in thread:
+            if line.strip().startswith("at "):
+                stack.append(line.strip())
+                if top_method == "N/A" and not any(pkg in line for pkg in ['java.', 'jdk.', 'sun.']):
+                    top_method = line.strip()
+        thread_stack_map[thread_name] = top_method
+        thread_blocks[thread_name] = stack
+
+    return thread_states, thread_waiting_on, lock_owners, thread_stack_map, thread_blocks
+
+
+def get_threads_by_state(thread_states, full_stack_map):
+    state_map = {}
+    for state in set(thread_states.values()):
+        threads = []
+        for thread_name, thread_state in thread_states.items():
+            if thread_state == state:
+                stack = full_stack_map.get(thread_name, [])
+                if isinstance(stack, list):
+                    stack_str = "\n".join([frame for frame in stack if isinstance(frame, str)])
+                elif isinstance(stack, str):
+                    stack_str = stack
+                else:
+                    stack_str = "N/A"
+                threads.append((thread_name, stack_str))
+        state_map[state] = threads
+    return state_map
+
+
+def get_blocked_info(thread_states, thread_waiting_on, lock_owners, stack_map):
+    blocked_info = []
+    method_counts = defaultdict(int)
+    for thread_name, lock in thread_waiting_on.items():
+        if thread_states.get(thread_name) == "BLOCKED":
+            blocking_thread = lock_owners.get(lock, "Unknown")
+            blocked_stack = stack_map.get(thread_name, "N/A")
+            blocking_stack = stack_map.get(blocking_thread, "N/A")
+            blocked_info.append({
+                "Blocked Thread": thread_name,
+                "Waiting on Lock": lock,
+                "Blocked Stack": blocked_stack,
+                "Blocking Thread": blocking_thread,
+                "Blocking Stack": blocking_stack
+            })
+            method_counts[blocked_stack] += 1
+    return blocked_info, method_counts
+
+
+# Follows the wait-for graph (thread -> owner of the lock it waits on) and returns the threads of the first
+# cycle found, or None
+def find_deadlock(thread_waiting_on, lock_owners):
+    wait_for = {}
+    for thread, lock in thread_waiting_on.items():
+        owner = lock_owners.get(lock)
+        if owner:
+            wait_for[thread] = owner
+    for start in wait_for:
+        path = set()
+        t = start
+        while t in wait_for and t not in path:
+            path.add(t)
+            t = wait_for[t]
+        if t == start:
+            return path
+    return None
+
+
+def thread_state_counts(thread_states):
+    state_counts = pd.Series(thread_states, dtype=object).value_counts().reset_index()
+    state_counts.columns = ["State", "Count"]
+    return state_counts
+
+
+def thread_group_counts(thread_states):
+    group_counts = {}
+    for name in thread_states:
+        group = name.split('-')[0] if '-' in name else name
+        group_counts[group] = group_counts.get(group, 0) + 1
+    df = pd.DataFrame(list(group_counts.items()), columns=["Thread Group", "Count"])
+    return df.sort_values("Count", ascending=False).reset_index(drop=True)
+
+
+# (method, number of BLOCKED threads) pairs, most blocked first
+def hotspot_methods(method_counts):
+    return sorted(method_counts.items(), key=lambda x: x[1], reverse=True)
+
+
+def threads_with_method(full_stack_map, thread_states, method_filter):
+    matching_threads = []
+    for thread_name, stack in full_stack_map.items():
+        # Ensure stack is a list before iterating and frame is a string
+        if isinstance(stack, list) and any(isinstance(frame, str) and method_filter in frame for frame in stack):
+            full_trace = "\n".join([frame for frame in stack if isinstance(frame, str)])
+            matching_threads.append({
+                "Thread Name": thread_name,
+                "Thread State": thread_states.get(thread_name, "UNKNOWN"),
+                "Stack Trace": full_trace
+            })
+    return matching_threads
@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+
+from analysis.cube import is_warning
+
+"""
+Sorted timestamp index of parsed 3DEXPERIENCE logs for the correlation matrix, warnings excluded.
+
+TimeIndex sorts the positions of the non-warning entries with a timestamp by (Source File, Timestamp) once,
+so that the entries of one file in a [start, end) range are two np.searchsorted lookups and a slice instead
+of a scan of the frame; rows returns them as positions into the frame the index was built from, in frame
+order. minutes holds the distinct minutes of every file (sorted), which get_time_options and
+get_date_options in analysis/correlation.py read instead of the frame. data/cache.get_time_index builds it
+once per parsed dataset; for a followed log, extend merges the appended rows into it.
+"""
+
+_NS_PER_MINUTE = 60 * 10**9
+
+
+# The distinct minutes (sorted) of sorted int64 nanosecond timestamps
+def _distinct_minutes(ns):
+    minutes = ns // _NS_PER_MINUTE * _NS_PER_MINUTE
+    return minutes[np.r_[True, minutes[1:] != minutes[:-1]]].view("datetime64[ns]")
+
+
+class TimeIndex:
+    def __init__(self, df, start=0):
+        self.files = []
+        self.minutes = {}
+        # Positions of every file's entries sorted by timestamp, and those timestamps
+        self._orders = {}
+        self._timestamps = {}
+        if df.empty:
+            return
+        positions = np.flatnonzero(~is_warning(df) & df["Timestamp"].notna().to_numpy())
+        ns = df["Timestamp"].to_numpy(dtype="datetime64[ns]").view(np.int64)[positions]
+        files = pd.Categorical(df["Source File"])
+        codes = files.codes[positions]
+        # Stable: entries with equal (file, timestamp) stay in frame order
+        order = np.lexsort((ns, codes))
+        positions, ns, sorted_codes = positions[order] + start, ns[order], codes[order]
+        for code, name in enumerate(files.categories):
+            lo, hi = np.searchsorted(sorted_codes, [code, code + 1])
+            if lo == hi:
+                continue
+            self.files.append(name)
+            self._orders[name] = positions[lo:hi]
+            self._timestamps[name] = ns[lo:hi]
+            self.minutes[name] = _distinct_minutes(ns[lo:hi])
+
+    # Adds the rows appended to the frame the index was built from: df holds them, the first one at position
+    # start. Every file's new entries are merged into its sorted entries, after the equal timestamps.
+    def extend(self, df, start):
+        new = TimeIndex(df, start)
+        for name in new.files:
+            if name not in self._orders:
+                self.files.append(name)
+                self._orders[name] = new._orders[name]
+                self._timestamps[name] = new._timestamps[name]
+                self.minutes[name] = new.minutes[name]
+                continue
+            timestamps = self._timestamps[name]
+            at = np.searchsorted(timestamps, new._timestamps[name], side="right")
+            self._orders[name] = np.insert(self._orders[name], at, new._orders[name])
+            self._timestamps[name] = np.insert(timestamps, at, new._timestamps[name])
+            self.minutes[name] = np.union1d(self.minutes[name], new.minutes[name])
+        self.files.sort()
+        return self
+
+    # Positions (in frame order) of the entries of file with start <= Timestamp < end
+    def rows(self, file, start, end):
+        if file not in self._orders:
+            return np.empty(0, dtype=np.int64)
+        first, last = np.searchsorted(self._timestamps[file], [pd.Timestamp(start).value, pd.Timestamp(end).value])
+        return np.sort(self._orders[file][first:last])
+
+    # The file's distinct minutes in [start, end)
+    def minutes_between(self, file, start, end):
+        minutes = self.minutes.get(file, np.empty(0, dtype="datetime64[ns]"))
+        first, last = np.searchsorted(minutes, [pd.Timestamp(start).to_datetime64(), pd.Timestamp(end).to_datetime64()])
+        return pd.DatetimeIndex(minutes[first:last])
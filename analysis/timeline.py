@@ -0,0 +1,16 @@
+from analysis.cube import cube_counts, without_warnings
+
+"""
+Per-minute event counts of parsed 3DEXPERIENCE logs for the timeline chart, warnings excluded, from the
+event cube of analysis/cube.py.
+"""
+
+
+# Cube rows of non-warning entries with a timestamp
+def timeline_events(cube):
+    return without_warnings(cube).dropna(subset=["Minute"])
+
+
+def events_per_minute(timeline_df, selected_files):
+    filtered_df = timeline_df[timeline_df["Source File"].isin(selected_files)]
+    return cube_counts(filtered_df, ["Minute", "Source File"]).reset_index(name="Count")
@@ -0,0 +1,23 @@
+import pandas as pd
+
+from analysis.cube import cube_counts, without_warnings
+
+"""
+Count of every error Type in every source file of parsed 3DEXPERIENCE logs, warnings excluded, from the
+event cube of analysis/cube.py. Every (Type, Source File) combination is present, with 0 where a file has
+no entry of that type.
+"""
+
+
+def type_distribution(cube):
+    # Exclude warnings
+    df = without_warnings(cube)
+    type_dist = cube_counts(df, ["Type", "Source File"]).reset_index(name="Count")
+    if type_dist.empty:
+        return type_dist
+
+    # Ensure all combinations of Type and Source File are present (even if count is 0)
+    all_types = sorted(df["Type"].unique())
+    all_files = sorted(df["Source File"].unique())
+    full_index = pd.MultiIndex.from_product([all_types, all_files], names=["Type", "Source File"])
+    return type_dist.set_index(["Type", "Source File"]).reindex(full_index, fill_value=0).reset_index()
@@ -0,0 +1,59 @@
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from benchmarks.synthetic_logs import synthetic_apache_lines
+from data.apache_vectorized import (
+    parse_apache_logs_vectorized, parse_apache_timestamps, parse_apache_file, combine_apache_frames, APACHE_TS_FORMAT,
+)
+from data.parser import parse_apache_logs
+
+"""
+Throughput of the row-by-row Apache parser + pd.to_datetime against the vectorized pyarrow engine, over str
+lines and end to end from the file's bytes (parse_apache_file + combine_apache_frames, as the dashboard does).
+
+Run from the repository root:  python benchmarks/bench_apache.py [n_lines]
+"""
+
+
+def _row_engine(lines):
+    df = parse_apache_logs(lines)
+    df["timestamp"] = pd.to_datetime(df["timestamp"], format=APACHE_TS_FORMAT, errors="coerce")
+    df["status"] = pd.to_numeric(df["status"], errors="coerce")
+    df["size"] = pd.to_numeric(df["size"], errors="coerce")
+    return df
+
+
+def _vectorized_engine(lines):
+    df = parse_apache_logs_vectorized(lines)
+    df["timestamp"] = parse_apache_timestamps(df["timestamp"])
+    return df
+
+
+def main(n_lines=1_000_000):
+    lines = synthetic_apache_lines(n_lines)
+    results = {}
+    for name, engine in [("row", _row_engine), ("vectorized", _vectorized_engine)]:
+        start = time.perf_counter()
+        results[name] = engine(lines)
+        elapsed = time.perf_counter() - start
+        print(f"{name:16} {n_lines:>10,} lines  {elapsed:6.2f}s  {n_lines / elapsed:>12,.0f} lines/s")
+    data = ("\n".join(lines) + "\n").encode("utf-8")
+    for engine in ("python", "vectorized"):
+        start = time.perf_counter()
+        df = combine_apache_frames([parse_apache_file(io.BytesIO(data), engine)])
+        elapsed = time.perf_counter() - start
+        print(f"{engine + ' file':16} {n_lines:>10,} lines  {elapsed:6.2f}s  {n_lines / elapsed:>12,.0f} lines/s")
+        assert len(df) == len(results["row"]), "file engines returned a different number of rows"
+    vectorized = results["vectorized"].astype({col: object for col in ["ip", "method", "url", "protocol", "cipher"]})
+    vectorized[["protocol", "cipher"]] = vectorized[["protocol", "cipher"]].replace({pd.NA: None})
+    assert results["row"].equals(vectorized), "engines returned different frames"
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
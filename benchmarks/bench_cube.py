@@ -0,0 +1,114 @@
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic_logs import synthetic_stderr_lines, synthetic_mxtrace_lines
+from analysis.correlation import error_matrix, filter_df_by_range, matrix_rows, build_error_matrix
+from analysis.cube import DETAIL_DIMENSIONS, build_event_cube, without_warnings
+from analysis.time_index import TimeIndex
+from analysis.metrics import error_summary
+from analysis.timeline import timeline_events, events_per_minute
+from analysis.type_distribution import type_distribution
+from data.file_cache import assemble_parsed_files
+from data.parser import parse_log_lines
+
+"""
+Cost of the 3DX charts per Streamlit rerun: the aggregations behind the metrics table, the type
+distribution, the timeline and the correlation matrix, answered from the event cube of analysis/cube.py,
+against the row-level groupby each of them ran before; and the entries of the correlation details table,
+looked up in the TimeIndex of analysis/time_index.py against boolean masks over the frame. The frame is built like benchmarks/bench_memory.py
+(synthetic stderr.log and mxtrace.log results repeated under distinct file names up to n_rows rows).
+
+The cube has a row per (minute, file, type) that occurs, so its size, and the cost of a rerun, follows the
+number of such combinations rather than the number of entries. The synthetic logs are sparse (about 25
+entries per file and minute, over a thousand distinct codes): the detail cube, which adds code and template,
+is nearly as long as the frame, which is why only the template matrix reads it.
+
+Run from the repository root:  python benchmarks/bench_cube.py [n_rows]
+"""
+
+
+def _timed(run, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _charts(cube, start, end):
+    error_summary(cube)
+    type_distribution(cube)
+    timeline = timeline_events(cube)
+    events_per_minute(timeline, sorted(timeline["Source File"].unique()))
+    error_matrix(cube)
+    cube = without_warnings(cube)
+    filtered = filter_df_by_range(cube, start, end)
+    build_error_matrix(filtered, matrix_rows(cube, filtered), sorted(cube["Source File"].unique()))
+
+
+def _template_matrix(detail, start, end):
+    detail = without_warnings(detail)
+    filtered = filter_df_by_range(detail, start, end)
+    rows = matrix_rows(detail, filtered, "Template")
+    build_error_matrix(filtered, rows, sorted(detail["Source File"].unique()), "Template")
+
+
+def _row_level(df, start, end):
+    non_warnings = df[df["Type"].str.lower() != "warning"]
+    df.groupby(["Type", "Source File"], observed=True).size()
+    non_warnings.groupby(["Type", "Source File"], observed=True).size()
+    timeline = non_warnings.dropna(subset=["Timestamp"])
+    timeline.groupby([timeline["Timestamp"].dt.floor("min"), "Source File"], observed=True).size()
+    non_warnings.groupby(["Type", "Source File"], observed=True).size()
+    filtered = non_warnings[(non_warnings["Timestamp"] >= start) & (non_warnings["Timestamp"] < end)]
+    filtered.groupby(["Type", "Source File"], observed=True).size()
+
+
+# The entries of the details table: one file's non-warning entries in the range
+def _details_mask(df, name, start, end):
+    mask = (df["Source File"] == name) & (df["Type"].str.lower() != "warning")
+    return df[mask & (df["Timestamp"] >= start) & (df["Timestamp"] < end)]
+
+
+def main(n_rows=2_000_000):
+    frames = [
+        parse_log_lines(synthetic_stderr_lines(500_000), "stderr.log"),
+        parse_log_lines(synthetic_mxtrace_lines(500_000), "mxtrace.log"),
+    ]
+    names, per_file = [], []
+    while sum(len(df) for df in per_file) < n_rows:
+        i = len(per_file)
+        names.append(f"mxtrace_{i}.log" if i % 2 else f"stderr_{i}.log")
+        per_file.append(frames[i % 2])
+    df = assemble_parsed_files(names, per_file).head(n_rows)
+
+    # The correlation matrix over the first 30 minutes of the logs
+    start = df["Timestamp"].min().floor("min")
+    end = start + pd.Timedelta(minutes=30)
+    name = df["Source File"].cat.categories[0]
+
+    begin = time.perf_counter()
+    cube = build_event_cube(df)
+    cube_time = time.perf_counter() - begin
+    begin = time.perf_counter()
+    detail = build_event_cube(df, DETAIL_DIMENSIONS)
+    detail_time = time.perf_counter() - begin
+    begin = time.perf_counter()
+    time_index = TimeIndex(df)
+    index_time = time.perf_counter() - begin
+    print(f"{len(df):,} rows from {len(names)} files -> cube of {len(cube):,} rows in {cube_time:.2f}s, "
+          f"detail cube of {len(detail):,} rows in {detail_time:.2f}s, time index in {index_time:.2f}s (once)")
+    print(f"row-level groupbys per rerun  {_timed(lambda: _row_level(df, start, end)) * 1000:8.1f} ms")
+    print(f"cube aggregations per rerun   {_timed(lambda: _charts(cube, start, end)) * 1000:8.1f} ms")
+    print(f"template matrix (detail cube) {_timed(lambda: _template_matrix(detail, start, end)) * 1000:8.1f} ms")
+    print(f"details rows by mask          {_timed(lambda: _details_mask(df, name, start, end)) * 1000:8.1f} ms")
+    print(f"details rows by time index    {_timed(lambda: df.iloc[time_index.rows(name, start, end)]) * 1000:8.1f} ms")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000)
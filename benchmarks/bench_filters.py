@@ -0,0 +1,115 @@
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic_logs import synthetic_stderr_lines, synthetic_mxtrace_lines
+from analysis.errors import EntryIndex, time_text, with_date_time
+from analysis.paging import page_bounds, sort_keys, sort_rows
+from analysis.search import MessageIndex
+from data.file_cache import assemble_parsed_files
+from data.parser import parse_log_lines
+
+"""
+Cost of the "All Errors" filters per Streamlit rerun: _filter_entries plus with_date_time (boolean masks
+over the frame and a copy of the selected rows, as the table filtered before EntryIndex) against the row ids of EntryIndex and its frame, for a few
+filter tuples; MessageIndex.search against str.contains over Message for a few queries; and one sorted page
+of 100 rows (sort_rows over cached sort_keys, then the page's frame) against sorting the whole filtered frame.
+The frame is built like benchmarks/bench_memory.py (synthetic stderr.log and mxtrace.log
+results repeated under distinct file names up to n_rows rows).
+
+Run from the repository root:  python benchmarks/bench_filters.py [n_rows]
+"""
+
+
+def _timed(run, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+# The "All Errors" filters as boolean masks over the whole frame
+def _filter_entries(df, selected_file="ALL", selected_type="ALL", selected_date="ALL", time_prefix="",
+                    show_warnings=True):
+    filtered_df = df
+    # Only show warnings if asked to
+    if not show_warnings:
+        filtered_df = filtered_df[filtered_df["Type"].str.lower() != "warning"]
+
+    if selected_file != "ALL":
+        filtered_df = filtered_df[filtered_df["Source File"] == selected_file]
+    if selected_date != "ALL":
+        filtered_df = filtered_df[filtered_df["Timestamp"].dt.normalize() == pd.Timestamp(selected_date)]
+    if time_prefix.strip():
+        # Allow filtering by hh:mm or hh:mm:ss
+        filtered_df = filtered_df[
+            time_text(filtered_df["Timestamp"]).str.startswith(time_prefix.strip(), na=False)
+        ]
+    if selected_type != "ALL":
+        filtered_df = filtered_df[filtered_df["Type"] == selected_type]
+    return filtered_df.copy()
+
+
+def main(n_rows=2_000_000):
+    frames = [
+        parse_log_lines(synthetic_stderr_lines(500_000), "stderr.log"),
+        parse_log_lines(synthetic_mxtrace_lines(500_000), "mxtrace.log"),
+    ]
+    names, per_file = [], []
+    while sum(len(df) for df in per_file) < n_rows:
+        i = len(per_file)
+        names.append(f"mxtrace_{i}.log" if i % 2 else f"stderr_{i}.log")
+        per_file.append(frames[i % 2])
+    df = assemble_parsed_files(names, per_file).head(n_rows)
+
+    start = time.perf_counter()
+    entry_index = EntryIndex(df)
+    print(f"{len(df):,} rows from {len(names)} files, index built in {time.perf_counter() - start:.2f}s (once)")
+
+    day = entry_index.dates[0]
+    cases = {
+        "no filter, warnings hidden": ("ALL", "ALL", "ALL", "", False),
+        "one file": (entry_index.files[0], "ALL", "ALL", "", False),
+        "file + date + type": (entry_index.files[0], "Exception", day, "", False),
+        "date + time prefix": ("ALL", "ALL", day, "09:1", True),
+    }
+    print(f"{'filters':28} {'rows':>10} {'masks':>10} {'index':>10}")
+    for name, filters in cases.items():
+        masks = _timed(lambda: with_date_time(_filter_entries(df, *filters)))
+        rows = entry_index.rows(*filters)
+        index = _timed(lambda: entry_index.frame(df, entry_index.rows(*filters)))
+        print(f"{name:28} {len(rows):>10,} {masks * 1000:>8.0f}ms {index * 1000:>8.0f}ms")
+
+    start = time.perf_counter()
+    message_index = MessageIndex(df)
+    print(f"\nmessage index of {len(message_index.vocabulary):,} tokens built in {time.perf_counter() - start:.2f}s (once)")
+    queries = {
+        "nullpointerexception": r"(?<!\w)nullpointerexception(?!\w)",
+        "servlet*": r"(?<!\w)servlet",
+        '"business object"': r"(?<!\w)business\W+object(?!\w)",
+    }
+    print(f"{'query':28} {'rows':>10} {'contains':>10} {'index':>10}")
+    for query, pattern in queries.items():
+        contains = _timed(lambda: df["Message"].str.contains(pattern, case=False).to_numpy().nonzero()[0])
+        rows = message_index.search(query)
+        index = _timed(lambda: message_index.search(query))
+        print(f"{query:28} {len(rows):>10,} {contains * 1000:>8.0f}ms {index * 1000:>8.1f}ms")
+
+    rows = entry_index.rows("ALL", "ALL", "ALL", "", True)
+    print(f"\n{'sorted by':28} {'rows':>10} {'frame':>10} {'page':>10}")
+    for column in ("Message", "Timestamp"):
+        keys = sort_keys(df[column])
+        whole = _timed(lambda: entry_index.frame(df, rows).sort_values(column, kind="stable"))
+        start, end, _, _ = page_bounds(len(rows), 2, 100)
+        page = _timed(lambda: entry_index.frame(df, sort_rows(rows, keys)[start:end]))
+        print(f"{column:28} {len(rows):>10,} {whole * 1000:>8.0f}ms {page * 1000:>8.0f}ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000)
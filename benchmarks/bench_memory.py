@@ -0,0 +1,64 @@
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic_logs import synthetic_stderr_lines, synthetic_mxtrace_lines
+from data.file_cache import assemble_parsed_files
+from data.parser import parse_log_lines
+
+"""
+Memory of the combined 3DEXPERIENCE frame of get_parsed_df: the compact schema (categorical Type, Code and
+Source File, int32 Line, no Date/Time) against the previous one (object Source File, int64 Line and Python
+date/time objects in Date and Time next to Timestamp). The frame is built from synthetic stderr.log and
+mxtrace.log parse results, repeated under distinct file names up to n_rows rows.
+
+The "Template" column of data/templates.py is categorical in both layouts. Message holds the same string
+objects in both layouts; deep memory_usage counts every reference, so its column is reported apart.
+
+Run from the repository root:  python benchmarks/bench_memory.py [n_rows]
+"""
+
+
+def _previous_layout(df):
+    df = df.astype({"Line": np.int64, "Source File": object})
+    df.insert(1, "Date", df["Timestamp"].dt.date)
+    df.insert(2, "Time", df["Timestamp"].dt.time)
+    return df
+
+
+def _report(name, df, elapsed):
+    usage = df.memory_usage(deep=True, index=False)
+    others = usage.drop("Message").sum()
+    columns = "  ".join(f"{col}={usage[col] / 1e6:,.0f}" for col in df.columns if col != "Message")
+    print(f"{name:9} {others / 1e6:>8,.0f} MB without Message ({elapsed:5.1f}s to build)  {columns}")
+
+
+def main(n_rows=5_000_000):
+    frames = [
+        parse_log_lines(synthetic_stderr_lines(500_000), "stderr.log"),
+        parse_log_lines(synthetic_mxtrace_lines(500_000), "mxtrace.log"),
+    ]
+    names, per_file = [], []
+    while sum(len(df) for df in per_file) < n_rows:
+        i = len(per_file)
+        names.append(f"mxtrace_{i}.log" if i % 2 else f"stderr_{i}.log")
+        per_file.append(frames[i % 2])
+
+    start = time.perf_counter()
+    df = assemble_parsed_files(names, per_file).head(n_rows)
+    compact_time = time.perf_counter() - start
+    start = time.perf_counter()
+    previous = _previous_layout(df)
+    previous_time = compact_time + time.perf_counter() - start
+
+    print(f"{len(df):,} rows from {len(names)} files, Message {df['Message'].memory_usage(deep=True) / 1e6:,.0f} MB")
+    _report("previous", previous, previous_time)
+    _report("compact", df, compact_time)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5_000_000)
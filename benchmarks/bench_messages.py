@@ -0,0 +1,61 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic_logs import synthetic_stderr_lines, synthetic_mxtrace_lines
+from data.mmap_parser import parse_log_bytes
+from data.parser import concat_parsed_frames, intern_messages
+
+"""
+Memory of the Message column of a combined 3DEXPERIENCE frame: one str object per row (what the parsers
+produced before the message pool), the per-parse pool of the parsers, and intern_messages over the combined
+frame. Every file is parsed on its own from synthetic stderr.log and mxtrace.log bytes, like uploads or
+process pool workers, so the files hold separate copies of the texts they share.
+
+The sizes count each distinct str object once plus 8 bytes of reference per row; deep memory_usage would
+count a shared object again for every row that references it.
+
+Run from the repository root:  python benchmarks/bench_messages.py [n_files] [lines_per_file]
+"""
+
+
+def _column_bytes(messages):
+    objects = {id(message): message for message in messages}
+    return sum(sys.getsizeof(message) for message in objects.values()) + 8 * len(messages), len(objects)
+
+
+def _report(name, messages):
+    size, objects = _column_bytes(messages)
+    print(f"{name:15} {size / 1e6:>8,.1f} MB in {objects:>10,} str objects")
+
+
+def main(n_files=20, lines_per_file=200_000):
+    data = [
+        ("\n".join(synthetic_stderr_lines(lines_per_file, seed=i)) + "\n").encode("ascii")
+        if i % 2 == 0 else
+        ("\n".join(synthetic_mxtrace_lines(lines_per_file, seed=i)) + "\n").encode("ascii")
+        for i in range(n_files)
+    ]
+    names = [f"stderr_{i}.log" if i % 2 == 0 else f"mxtrace_{i}.log" for i in range(n_files)]
+
+    start = time.perf_counter()
+    df = concat_parsed_frames([parse_log_bytes(d, name) for d, name in zip(data, names)])
+    parse_time = time.perf_counter() - start
+    rows = len(df)
+    print(f"{rows:,} rows from {n_files} files, parsed in {parse_time:.1f}s")
+
+    # Copies of every row's text stand for the unpooled parser output
+    _report("one per row", [message.encode("ascii").decode("ascii") for message in df["Message"]])
+    _report("per-parse pool", list(df["Message"]))
+    start = time.perf_counter()
+    intern_messages(df)
+    intern_time = time.perf_counter() - start
+    _report("interned", list(df["Message"]))
+    distinct = df.attrs["distinct_messages"]
+    print(f"intern_messages {intern_time:.2f}s, {distinct:,} distinct messages ({rows / distinct:,.1f}x dedup)")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
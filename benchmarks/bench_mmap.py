@@ -0,0 +1,68 @@
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic_logs import synthetic_stderr_lines, synthetic_mxtrace_lines
+from data.ingest import iter_lines
+from data.mmap_parser import parse_log_bytes, parse_log_file
+from data.parser import parse_log_lines, _may_match_error
+
+"""
+Throughput of parse_log_lines over a streamed file against parse_log_file (mmap) and parse_log_bytes (the
+in-memory upload path) on synthetic 3DEXPERIENCE logs written to a temporary directory, with the share of
+lines the bytes prefilter kept away from the regexes. The synthetic logs are error-dense (about 12% of the lines are
+errors); "quiet" keeps 8% of those lines, closer to a production stderr.log, and "crlf" writes the lines with
+Windows line endings.
+
+Run from the repository root:  python benchmarks/bench_mmap.py [n_lines]
+"""
+
+
+def _quiet(lines):
+    rng = random.Random(0)
+    return [line for line in lines if not _may_match_error(line) or rng.random() < 0.08]
+
+
+def _timed(parse):
+    start = time.perf_counter()
+    df = parse()
+    return df, time.perf_counter() - start
+
+
+def _streamed(path, filename):
+    with open(path, "rb") as f:
+        return parse_log_lines(iter_lines(f), filename)
+
+
+def main(n_lines=1_000_000):
+    cases = [
+        ("stderr.log", "", synthetic_stderr_lines(n_lines), "\n"),
+        ("stderr.log", "quiet", _quiet(synthetic_stderr_lines(n_lines)), "\n"),
+        ("stderr.log", "crlf", synthetic_stderr_lines(n_lines), "\r\n"),
+        ("mxtrace.log", "", synthetic_mxtrace_lines(n_lines), "\n"),
+    ]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for filename, label, lines, newline in cases:
+            path = os.path.join(tmp_dir, filename)
+            with open(path, "w", encoding="utf-8", newline="") as f:
+                f.write(newline.join(lines) + newline)
+            mb = os.path.getsize(path) / 1e6
+            before_df, before = _timed(lambda: _streamed(path, filename))
+            after_df, after = _timed(lambda: parse_log_file(path))
+            assert before_df.equals(after_df), "parse_log_file differs from parse_log_lines"
+            with open(path, "rb") as f:
+                data = f.read()
+            state = {}
+            bytes_df, in_memory = _timed(lambda: parse_log_bytes(data, filename, state=state))
+            assert before_df.equals(bytes_df), "parse_log_bytes differs from parse_log_lines"
+            print(f"{filename:12} {label:6} {mb:>6,.0f} MB  rows={len(after_df):>8,} ({len(after_df) / len(lines):4.0%})  "
+                  f"skipped={state['skipped_lines'] / state['lines']:4.0%}  streamed={mb / before:>5,.0f} MB/s  "
+                  f"mmap={mb / after:>5,.0f} MB/s  bytes={mb / in_memory:>5,.0f} MB/s  speedup={before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,35 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic_logs import synthetic_stderr_lines, synthetic_mxtrace_lines
+from data.parser import parse_log_lines
+
+"""
+Throughput of parse_log_lines on synthetic 3DEXPERIENCE logs, with and without the literal prefilter.
+
+Run from the repository root:  python benchmarks/bench_parser.py [n_lines]
+"""
+
+
+def _lines_per_sec(lines, filename, **kwargs):
+    start = time.perf_counter()
+    df = parse_log_lines(lines, filename, **kwargs)
+    elapsed = time.perf_counter() - start
+    return df, len(lines) / elapsed
+
+
+def main(n_lines=500_000):
+    for filename, make_lines in [("stderr.log", synthetic_stderr_lines), ("mxtrace.log", synthetic_mxtrace_lines)]:
+        lines = make_lines(n_lines)
+        before_df, before = _lines_per_sec(lines, filename, prefilter=False)
+        after_df, after = _lines_per_sec(lines, filename, prefilter=True)
+        assert before_df.equals(after_df), "prefilter changed the parse result"
+        print(f"{filename:12} {n_lines:>10,} lines  rows={len(after_df):>8,}  "
+              f"before={before:>12,.0f} lines/s  after={after:>12,.0f} lines/s  speedup={after / before:.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500_000)
@@ -0,0 +1,59 @@
+import os
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic_logs import synthetic_stderr_lines, synthetic_mxtrace_lines
+from data.timestamps import (
+    TimestampDecoder, datetime_to_ns, TOMCAT_TS_FORMAT, MXTRACE_TS_FORMATS, APACHE_ERROR_TS_FORMAT
+)
+from utils.regex_patterns import timestamp_regex, mxtrace_ts_pattern, apache_ts_pattern
+
+"""
+Throughput of datetime.strptime against TimestampDecoder on the timestamps of synthetic logs.
+
+Run from the repository root:  python benchmarks/bench_timestamps.py [n_lines]
+"""
+
+
+def _strptime(value, formats):
+    for fmt in formats:
+        try:
+            return datetime_to_ns(datetime.strptime(value, fmt))
+        except ValueError:
+            continue
+    return None
+
+
+def _matches(lines, pattern):
+    return [m.group(1) for line in lines if (m := pattern.search(line))]
+
+
+def main(n_lines=500_000):
+    stderr_lines = synthetic_stderr_lines(n_lines)
+    mxtrace_lines = synthetic_mxtrace_lines(n_lines)
+    # The mxtrace headers are stored in both layouts, as seen in real files
+    mxtrace_values = _matches(mxtrace_lines, mxtrace_ts_pattern)
+    mxtrace_values += [" ".join([v.split()[1], v.split()[0]] + v.split()[2:]) for v in mxtrace_values]
+    cases = [
+        ("tomcat", _matches(stderr_lines, timestamp_regex), (TOMCAT_TS_FORMAT,), TimestampDecoder.tomcat),
+        ("mxtrace", mxtrace_values, MXTRACE_TS_FORMATS, TimestampDecoder.mxtrace),
+        ("apache", _matches(stderr_lines, apache_ts_pattern), (APACHE_ERROR_TS_FORMAT,), TimestampDecoder.apache_error),
+    ]
+    for name, values, formats, decode in cases:
+        start = time.perf_counter()
+        expected = [_strptime(v, formats) for v in values]
+        before = len(values) / (time.perf_counter() - start)
+        decoder = TimestampDecoder()
+        start = time.perf_counter()
+        got = [decode(decoder, v) for v in values]
+        after = len(values) / (time.perf_counter() - start)
+        assert got == expected, f"{name}: decoder differs from strptime"
+        print(f"{name:8} {len(values):>10,} timestamps  strptime={before:>12,.0f}/s  "
+              f"decoder={after:>12,.0f}/s  speedup={after / before:.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500_000)
@@ -0,0 +1,95 @@
+import random
+from datetime import datetime, timedelta
+
+"""
+Generators for synthetic 3DEXPERIENCE logs used by the benchmark scripts.
+
+The line mix roughly follows what we see in production stderr.log files: mostly INFO/debug output and
+stack frames, with a small share of SEVERE/WARNING/Error lines and exceptions. mxtrace files use the
+":Thu Jun 26 17:11:23 2025" header format, Apache access/SSL logs follow APACHE_ACCESS_LOG_PATTERN and
+APACHE_SSL_LOG_PATTERN.
+"""
+
+_CLASSES = [
+    "com.dassault_systemes.enovia.bom.BOMUtil",
+    "com.matrixone.apps.domain.DomainObject",
+    "com.dassault_systemes.platform.restServices.RestService",
+    "org.apache.catalina.core.StandardWrapperValve",
+    "com.dassault_systemes.vplm.modeler.PLMCoreModeler",
+]
+_EXCEPTIONS = [
+    "java.lang.NullPointerException",
+    "com.matrixone.apps.domain.util.FrameworkException",
+    "java.io.IOException",
+    "java.sql.SQLRecoverableException",
+]
+_URLS = ["/3dspace/resources/v1/modeler/dseng", "/3dspace/webapps/ENOWCHA/index.html",
+         "/3dpassport/login", "/3dspace/servlet/fcs/checkin", "/3dspace/common/emxNavigator.jsp"]
+
+
+def _tomcat_ts(ts):
+    return ts.strftime("%d-%b-%Y %H:%M:%S.") + f"{ts.microsecond // 1000:03d}"
+
+
+def synthetic_stderr_lines(n_lines, seed=0):
+    rng = random.Random(seed)
+    ts = datetime(2025, 6, 26, 8, 0, 0)
+    lines = []
+    for i in range(n_lines):
+        ts += timedelta(milliseconds=rng.randint(1, 400))
+        r = rng.random()
+        cls = rng.choice(_CLASSES)
+        if r < 0.30:
+            lines.append(f"{_tomcat_ts(ts)} INFO [http-nio-8080-exec-{i % 50}] {cls}.process Request served")
+        elif r < 0.34:
+            lines.append(f"{_tomcat_ts(ts)} SEVERE [http-nio-8080-exec-{i % 50}] {cls}.invoke Servlet.service() failed")
+        elif r < 0.37:
+            lines.append(f"{_tomcat_ts(ts)} WARNING [main] {cls}.init Deprecated property used")
+        elif r < 0.39:
+            lines.append(f"Error #{rng.randint(1900000, 1900100)}: No business object found for id {rng.randint(1, 10**6)}")
+        elif r < 0.40:
+            lines.append(f"System Error: #1500029 Transaction aborted for user user{rng.randint(1, 200)}")
+        elif r < 0.42:
+            lines.append(f"{rng.choice(_EXCEPTIONS)}: unexpected state in {cls}")
+        elif r < 0.44:
+            lines.append(f"[{ts.strftime('%a %b %d %H:%M:%S')}.{ts.microsecond:06d} {ts.year}] [ssl:info] [pid {rng.randint(1000, 9999)}] Connection closed")
+        elif r < 0.70:
+            lines.append(f"\tat {cls}.method{rng.randint(1, 40)}({cls.rsplit('.', 1)[1]}.java:{rng.randint(10, 2000)})")
+        else:
+            lines.append(f"DEBUG {cls} cache size={rng.randint(1, 10000)} hits={rng.randint(1, 10**6)} object={rng.randint(1, 10**6)}")
+    return lines
+
+
+def synthetic_mxtrace_lines(n_lines, seed=0):
+    rng = random.Random(seed)
+    ts = datetime(2025, 6, 26, 8, 0, 0)
+    lines = []
+    for i in range(n_lines):
+        r = rng.random()
+        if r < 0.15:
+            ts += timedelta(seconds=rng.randint(1, 5))
+            lines.append(f"thread {i % 16} mql:{ts.strftime('%a %b %d %H:%M:%S %Y')}")
+        elif r < 0.20:
+            lines.append(f"Warning #{rng.randint(1000, 2000)} Attribute not found on type Part")
+        elif r < 0.23:
+            lines.append(f"{rng.choice(_EXCEPTIONS)} raised in trigger")
+        else:
+            lines.append(f"  print bus Part P-{rng.randint(1, 10**6)} A select attribute[Weight] dump |;")
+    return lines
+
+
+def synthetic_apache_lines(n_lines, seed=0):
+    rng = random.Random(seed)
+    ts = datetime(2025, 6, 26, 8, 0, 0)
+    lines = []
+    for _ in range(n_lines):
+        ts += timedelta(milliseconds=rng.randint(1, 200))
+        ip = f"10.0.{rng.randint(0, 20)}.{rng.randint(1, 254)}"
+        url = rng.choice(_URLS)
+        stamp = ts.strftime("%d/%b/%Y:%H:%M:%S +0200")
+        if rng.random() < 0.3:
+            lines.append(f'[{stamp}] {ip} TLSv1.2 ECDHE-RSA-AES256-GCM-SHA384 "GET {url} HTTP/1.1" {rng.randint(0, 50000)}')
+        else:
+            status = rng.choice([200, 200, 200, 302, 304, 404, 500])
+            lines.append(f'{ip} - - [{stamp}] "GET {url} HTTP/1.1" {status} {rng.randint(0, 50000)}')
+    return lines
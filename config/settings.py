@@ -1,4 +1,16 @@
-import streamlit as st
+import os
 
-st.set_page_config(page_title="Logs Analyzer", layout="wide")
-APP_TITLE = "📊 3DEXPERIENCE Log Analysis Dashboard"
\ No newline at end of file
+# Passed to st.set_page_config by logsAnalyzerApp.py; importing this module must not touch Streamlit
+PAGE_CONFIG = {"page_title": "Logs Analyzer", "layout": "wide"}
+APP_TITLE = "📊 3DEXPERIENCE Log Analysis Dashboard"
+
+# Number of worker processes used to parse uploaded 3DX log files in parallel (1 = parse serially)
+PARSE_WORKERS = 1
+
+# Directory of the on-disk Parquet cache of parsed 3DX log files (None disables it)
+PARSE_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".logs_analyzer_cache")
+
+# Directories the dashboard may read log files from in place or follow ("Analyze log files on this server",
+# "Follow live log files on this server"); any other path is rejected, symlinks are resolved first. Set
+# LOGS_ANALYZER_LOG_ROOTS to a list of directories separated by os.pathsep. Empty disables server paths.
+SERVER_LOG_ROOTS = [root for root in os.environ.get("LOGS_ANALYZER_LOG_ROOTS", "").split(os.pathsep) if root]
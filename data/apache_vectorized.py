@@ -0,0 +1,332 @@
+import io
+import itertools
+from datetime import timedelta, timezone
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from data.ingest import iter_lines, lstrip_lines
+from data.mmap_parser import _has_lone_cr
+from data.parser import APACHE_COLUMNS, NAT_NS, parse_apache_logs
+from utils.regex_patterns import APACHE_ACCESS_LOG_PATTERN, APACHE_SSL_LOG_PATTERN
+
+"""
+Vectorized engine for Apache SSL/access logs, built on pyarrow compute kernels.
+
+parse_apache_logs_vectorized returns the same rows as parse_apache_logs. Lines are loaded in batches of
+BATCH_LINES into one Arrow string array:
+  1. The SSL pattern runs as a match-only (DFA) pass over the lines starting with "[", and the access
+     pattern runs over every line the SSL pass rejected, exactly like the SSL-first order of the row loop.
+  2. RE2 is slow at returning capture groups, so the named groups are cut out of the matching lines with
+     literal splits instead. For lines that matched, the patterns leave no choice: \\S+ runs end at the
+     next space, [^\\]]+ ends at the first "]", and so on.
+  3. Rows are merged back into line order. Text columns are returned as Arrow-backed pandas strings
+     (missing values are pd.NA), status and size already as numbers.
+The patterns are rewritten for RE2 so that \\S excludes the same ASCII characters as Python's \\S. Lines
+with non-ASCII characters, where Unicode \\s and \\d differ between the two engines, go through the
+Python regexes instead.
+
+parse_apache_stream and parse_apache_bytes read the raw bytes instead of str lines: a block of complete lines
+is wrapped in an Arrow string array as is (pa.py_buffer), with offsets at its b"\\n" found by numpy, and the
+line endings are trimmed by pyarrow, so no Python object is created per line. Blocks that str.splitlines()
+would split differently (\\v, \\f, \\x1c-\\x1e, U+0085, U+2028, U+2029 or a \\r that is not part of a
+CRLF ending) or that are not valid UTF-8 go through iter_lines instead.
+
+parse_apache_timestamps replaces pd.to_datetime(..., format="%d/%b/%Y:%H:%M:%S %z"): every distinct
+timestamp string is parsed only once, and strings in the fixed "26/Jun/2025:08:00:00 +0200" layout are
+decoded from character positions with numpy. Anything else falls back to pd.to_datetime.
+
+parse_apache_file and combine_apache_frames are the per-file and combining steps of the dashboard's Apache
+tab; the command-line analyzer runs parse_apache_file in worker processes.
+"""
+
+BATCH_LINES = 1_000_000
+# Bytes read at a time by parse_apache_stream
+BLOCK_BYTES = 64 * 1024 * 1024
+NUMERIC_COLUMNS = ("status", "size")
+APACHE_TS_FORMAT = "%d/%b/%Y:%H:%M:%S %z"
+
+# Python's \S on ASCII text also excludes \x0b and \x1c-\x1f, RE2's does not
+_ASCII_NON_SPACE = r"[^\t\n\x0b\x0c\r \x1c-\x1f]"
+
+
+def _re2_anchored(pattern):
+    return "^(?:" + pattern.pattern.replace(r"\S", _ASCII_NON_SPACE) + ")"
+
+
+_SSL_RE2 = _re2_anchored(APACHE_SSL_LOG_PATTERN)
+_ACCESS_RE2 = _re2_anchored(APACHE_ACCESS_LOG_PATTERN)
+_FIXED_TS_RE2 = r"^[0-9]{2}/[A-Za-z]{3}/[0-9]{4}:[0-9]{2}:[0-9]{2}:[0-9]{2} [+-][0-9]{4}$"
+# Line boundaries of str.splitlines() other than \n and \r, and the ASCII whitespace str.lstrip() removes
+_ASCII_BOUNDARIES = (b"\x0b", b"\x0c", b"\x1c", b"\x1d", b"\x1e")
+_UNICODE_BOUNDARIES = ("\x85".encode(), "\u2028".encode(), "\u2029".encode())
+_ASCII_WHITESPACE = b" \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f"
+_MONTHS = pa.array(["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"])
+
+
+def _is_ascii(arr):
+    data = arr.buffers()[2]
+    return data is None or data.size == 0 or np.frombuffer(data, dtype=np.uint8).max() < 0x80
+
+
+def _part(parts, index):
+    return pc.list_element(parts, index)
+
+
+def _leading_digits(arr):
+    return pc.struct_field(pc.extract_regex(arr, r"^(?P<digits>[0-9]+)"), [0])
+
+
+def _ssl_columns(rows):
+    # [timestamp] ip tlsver cipher "method url protocol" size
+    parts = pc.split_pattern(pc.utf8_slice_codeunits(rows, 1), "] ", max_splits=1)
+    timestamp = _part(parts, 0)
+    parts = pc.split_pattern(_part(parts, 1), " ", max_splits=3)
+    request = pc.split_pattern(pc.utf8_slice_codeunits(_part(parts, 3), 1), " ", max_splits=3)
+    nulls = pa.nulls(len(rows), pa.large_string())
+    return {
+        "ip": _part(parts, 0), "timestamp": timestamp, "method": _part(request, 0), "url": _part(request, 1),
+        "status": nulls, "size": _leading_digits(_part(request, 3)),
+        "protocol": _part(parts, 1), "cipher": _part(parts, 2),
+    }
+
+
+def _access_columns(rows):
+    # ip - - [timestamp] "method url protocol" status size
+    parts = pc.split_pattern(rows, " - - [", max_splits=1)
+    ip = _part(parts, 0)
+    parts = pc.split_pattern(_part(parts, 1), '] "', max_splits=1)
+    timestamp = _part(parts, 0)
+    request = pc.split_pattern(_part(parts, 1), " ", max_splits=4)
+    nulls = pa.nulls(len(rows), pa.large_string())
+    return {
+        "ip": ip, "timestamp": timestamp, "method": _part(request, 0), "url": _part(request, 1),
+        "status": _part(request, 3), "size": _leading_digits(_part(request, 4)),
+        "protocol": nulls, "cipher": nulls,
+    }
+
+
+# Row-by-row fallback with the Python regexes, same logic as parse_apache_logs
+def _python_columns(lines):
+    row_pos = []
+    columns = {col: [] for col in APACHE_COLUMNS}
+    for pos, line in enumerate(lines):
+        m = APACHE_SSL_LOG_PATTERN.match(line)
+        if m:
+            values = dict(m.groupdict(), status=None, protocol=m.group("tlsver"))
+        elif (m := APACHE_ACCESS_LOG_PATTERN.match(line)):
+            values = dict(m.groupdict(), protocol=None, cipher=None)
+        else:
+            continue
+        row_pos.append(pos)
+        for col in APACHE_COLUMNS:
+            columns[col].append(values[col])
+    return row_pos, {col: pa.array(values, pa.large_string()) for col, values in columns.items()}
+
+
+def _parse_batch(arr):
+    row_ids = np.arange(len(arr))
+    pieces = []
+
+    if not _is_ascii(arr):
+        ascii_mask = pc.string_is_ascii(arr).to_numpy(zero_copy_only=False)
+        slow_ids = row_ids[~ascii_mask]
+        row_pos, columns = _python_columns(arr.take(slow_ids).to_pylist())
+        pieces.append((slow_ids[row_pos], columns))
+        arr = arr.filter(ascii_mask)
+        row_ids = row_ids[ascii_mask]
+
+    # SSL lines start with "[", so the SSL pattern only needs to run on those
+    ssl_mask = pc.starts_with(arr, "[").to_numpy(zero_copy_only=False)
+    ssl_candidates = np.flatnonzero(ssl_mask)
+    ssl_mask[ssl_candidates] = pc.match_substring_regex(arr.take(ssl_candidates), _SSL_RE2).to_numpy(
+        zero_copy_only=False)
+    if ssl_mask.any():
+        pieces.append((row_ids[ssl_mask], _ssl_columns(arr.filter(ssl_mask))))
+
+    rest = arr.filter(~ssl_mask)
+    rest_ids = row_ids[~ssl_mask]
+    access_mask = pc.match_substring_regex(rest, _ACCESS_RE2).to_numpy(zero_copy_only=False)
+    if access_mask.any():
+        pieces.append((rest_ids[access_mask], _access_columns(rest.filter(access_mask))))
+
+    if not pieces:
+        return None
+    if len(pieces) == 1:
+        columns = pieces[0][1]
+    else:
+        order = np.argsort(np.concatenate([ids for ids, _ in pieces]), kind="stable")
+        columns = {col: pa.concat_arrays([cols[col] for _, cols in pieces]).take(order) for col in APACHE_COLUMNS}
+    return pd.DataFrame({col: _to_pandas(col, columns[col]) for col in APACHE_COLUMNS})
+
+
+# String columns stay Arrow-backed; status and size get the dtypes pd.to_numeric gives the row engine
+def _to_pandas(col, values):
+    if col in NUMERIC_COLUMNS:
+        try:
+            return pc.cast(values, pa.int64()).to_pandas()
+        except pa.ArrowInvalid:
+            return pd.to_numeric(values.to_pandas(), errors="coerce")
+    return pd.arrays.ArrowStringArray(values)
+
+
+def _concat_frames(frames):
+    frames = [df for df in frames if df is not None]
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True)
+
+
+def parse_apache_logs_vectorized(lines, batch_lines=BATCH_LINES):
+    lines = iter(lines)
+    frames = []
+    while batch := list(itertools.islice(lines, batch_lines)):
+        frames.append(_parse_batch(pa.array(batch, type=pa.large_string())))
+    return _concat_frames(frames)
+
+
+# The lines of data (complete lines) as one Arrow string array, split like iter_lines without a Python object
+# per line; None when iter_lines is needed (other line boundaries, a lone \r, invalid UTF-8)
+def _split_lines(data):
+    if any(boundary in data for boundary in _ASCII_BOUNDARIES) or _has_lone_cr(data):
+        return None
+    buf = np.frombuffer(data, dtype=np.uint8)
+    ascii_only = not len(buf) or buf.max() < 0x80
+    if not ascii_only and any(boundary in data for boundary in _UNICODE_BOUNDARIES):
+        return None
+    ends = np.flatnonzero(buf == 0x0A) + 1
+    if len(buf) and (not len(ends) or ends[-1] != len(buf)):
+        ends = np.append(ends, len(buf))
+    offsets = np.concatenate([[0], ends]).astype(np.int64)
+    arr = pa.LargeStringArray.from_buffers(len(ends), pa.py_buffer(offsets), pa.py_buffer(data))
+    if not ascii_only:
+        try:
+            arr.validate(full=True)
+        except pa.ArrowInvalid:
+            return None
+    # Every line holds its b"\n" (or b"\r\n", or a final b"\r") and nothing else of the kind
+    return pc.utf8_rtrim(arr, characters="\r\n")
+
+
+# The lines of data as one Arrow string array; with strip_leading, leading whitespace is dropped first like
+# lstrip_lines does
+def _line_array(data, strip_leading):
+    if strip_leading:
+        data = data.lstrip(_ASCII_WHITESPACE)
+    # Non-ASCII text right at the start may be Unicode whitespace, which lstrip_lines also drops
+    arr = None if strip_leading and data[:1] >= b"\x80" else _split_lines(data)
+    if arr is None:
+        lines = iter_lines(io.BytesIO(data))
+        arr = pa.array(list(lstrip_lines(lines) if strip_leading else lines), type=pa.large_string())
+    return arr
+
+
+def _parse_array(arr, batch_lines=BATCH_LINES):
+    return [_parse_batch(arr.slice(start, batch_lines)) for start in range(0, len(arr), batch_lines)]
+
+
+# parse_apache_logs_vectorized over the lines of data (complete lines, e.g. the bytes appended to a followed
+# file); strip_leading drops leading whitespace first like lstrip_lines. Returns the frame and whether data
+# held any line (after stripping).
+def parse_apache_bytes(data, strip_leading=False):
+    arr = _line_array(data, strip_leading)
+    return _concat_frames(_parse_array(arr)), len(arr) > 0
+
+
+# Same as parse_apache_logs_vectorized(lstrip_lines(iter_lines(stream))); the stream is read block_bytes at
+# a time and cut after its last complete line
+def parse_apache_stream(stream, block_bytes=BLOCK_BYTES):
+    if hasattr(stream, "seek"):
+        stream.seek(0)
+    frames = []
+    pending = b""
+    started = False
+    while True:
+        block = stream.read(block_bytes)
+        data = pending + block
+        cut = data.rfind(b"\n") + 1 if block else len(data)
+        if cut:
+            arr = _line_array(data[:cut], strip_leading=not started)
+            started = started or len(arr) > 0
+            frames.extend(_parse_array(arr))
+        pending = data[cut:]
+        if not block:
+            return _concat_frames(frames)
+
+
+# Decodes "26/Jun/2025:08:00:00 +0200" strings from fixed positions. Returns UTC nanoseconds, UTC offsets
+# in minutes and a mask of the strings that could be decoded this way.
+def _decode_fixed_timestamps(arr):
+    def number(start, stop):
+        return pc.cast(pc.utf8_slice_codeunits(arr, start, stop), pa.int64()).to_numpy()
+
+    day, year, hour, minute, second = number(0, 2), number(7, 11), number(12, 14), number(15, 17), number(18, 20)
+    month = pc.fill_null(pc.index_in(pc.utf8_lower(pc.utf8_slice_codeunits(arr, 3, 6)), value_set=_MONTHS), -1)
+    month = month.to_numpy()
+    sign = np.where(pc.equal(pc.utf8_slice_codeunits(arr, 21, 22), "-").to_numpy(zero_copy_only=False), -1, 1)
+    offset_hours, offset_minutes = number(22, 24), number(24, 26)
+
+    month_start = ((year - 1970) * 12 + np.maximum(month, 0)).astype("datetime64[M]").astype("datetime64[D]")
+    next_month = (month_start.astype("datetime64[M]") + 1).astype("datetime64[D]")
+    days_in_month = (next_month - month_start).astype(np.int64)
+    decodable = (
+        (month >= 0) & (day >= 1) & (day <= days_in_month) & (year >= 1678) & (year <= 2261)
+        & (hour < 24) & (minute < 60) & (second < 60) & (offset_hours < 24) & (offset_minutes < 60)
+    )
+    offsets = sign * (offset_hours * 60 + offset_minutes)
+    local_ns = (month_start + (day - 1)).astype("datetime64[ns]").view(np.int64)
+    local_ns = local_ns + ((hour * 60 + minute) * 60 + second) * 1_000_000_000
+    return np.where(decodable, local_ns - offsets * 60_000_000_000, NAT_NS), offsets, decodable
+
+
+def parse_apache_timestamps(values):
+    codes, uniques = pd.factorize(values)
+    utc_ns = np.full(len(uniques), NAT_NS, dtype=np.int64)
+    offsets = np.zeros(len(uniques), dtype=np.int64)
+    decoded = np.zeros(len(uniques), dtype=bool)
+
+    if len(uniques):
+        arr = pa.array(np.asarray(uniques, dtype=object), type=pa.large_string())
+        fixed = np.flatnonzero(pc.match_substring_regex(arr, _FIXED_TS_RE2).to_numpy(zero_copy_only=False))
+        if len(fixed):
+            fixed_ns, fixed_offsets, fixed_ok = _decode_fixed_timestamps(arr.take(fixed))
+            utc_ns[fixed] = fixed_ns
+            offsets[fixed] = fixed_offsets
+            decoded[fixed[fixed_ok]] = True
+
+    # Anything the fast path could not decode gets the exact pd.to_datetime behaviour
+    for pos in np.flatnonzero(~decoded):
+        ts = pd.to_datetime(uniques[pos], format=APACHE_TS_FORMAT, errors="coerce")
+        if ts is not pd.NaT:
+            utc_ns[pos] = ts.value
+            offsets[pos] = ts.utcoffset() // timedelta(minutes=1)
+
+    row_ns = np.where(codes >= 0, utc_ns[codes], NAT_NS)
+    valid = row_ns != NAT_NS
+    if not valid.any():
+        return pd.Series(row_ns.view("datetime64[ns]"), index=values.index)
+    timestamps = pd.DatetimeIndex(row_ns.view("datetime64[ns]")).tz_localize("UTC")
+    used_offsets = np.unique(offsets[codes[valid]])
+    if len(used_offsets) == 1:
+        # Same fixed-offset timezone pd.to_datetime returns for a single %z value
+        timestamps = timestamps.tz_convert(timezone(timedelta(minutes=int(used_offsets[0]))))
+    return pd.Series(timestamps, index=values.index)
+
+
+# engine="vectorized" uses parse_apache_logs_vectorized, engine="python" the parse_apache_logs row loop
+def parse_apache_file(file_obj, engine="vectorized"):
+    if engine == "vectorized":
+        return parse_apache_stream(file_obj)
+    return parse_apache_logs(lstrip_lines(iter_lines(file_obj)))
+
+
+def combine_apache_frames(frames):
+    all_dfs = [df for df in frames if not df.empty]
+    df = pd.concat(all_dfs, ignore_index=True) if all_dfs else pd.DataFrame()
+    if not df.empty:
+        df['timestamp'] = parse_apache_timestamps(df['timestamp'])
+        df['status'] = pd.to_numeric(df['status'], errors='coerce')
+        df['size'] = pd.to_numeric(df['size'], errors='coerce')
+    return df
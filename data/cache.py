@@ -1,115 +1,291 @@
+"""
+Streamlit caching layer: st.cache_data wrappers around the Streamlit-free parsing in data/ and analysis/.
+
+Parsed frames carry the names and content hashes of their logs in df.attrs["sources"] (followed logs, which
+are not hashed, their path and follow id in df.attrs["followed"]); the caches of what is derived from a frame
+key on those and its row count, so each is built once per dataset rather than on every rerun.
+"""
+import hashlib
+import os
 import streamlit as st
-from data.parser import parse_log_lines, parse_apache_logs, parse_openj9_thread_dump
+from data.disk_cache import cache_key, content_digest
+from data.file_cache import parse_files_cached, assemble_parsed_files
+from analysis import threads as thread_analysis
+from analysis.cube import DETAIL_DIMENSIONS, build_event_cube, extend_event_cube
+from analysis.errors import EntryIndex
+from analysis.paging import extend_ranked_values, ranked_values, sort_keys
+from analysis.search import MessageIndex
+from analysis.time_index import TimeIndex
+from data.apache_vectorized import parse_apache_file, combine_apache_frames
+from data.compressed import expand_compressed, log_name
+from data.parallel import parse_paths_parallel
+from data.follow import LogFollower, append_apache_frame
+from data.parser import concat_parsed_frames, intern_messages
+from data.session import read_session, session_sources
 import pandas as pd
-import re
 
-"""
-The get_parsed_df function is designed to process a list of uploaded log files and return a single, 
-combined pandas DataFrame containing parsed log information. 
-It is decorated with @st.cache_data(show_spinner=False), which means Streamlit will cache the function’s 
-output to avoid redundant computation when the same files are uploaded again, improving performance and 
-user experience.
-
-Inside the function, an empty list all_dfs is initialized to collect DataFrames generated from each file. 
-The function iterates over each uploaded_file in the provided list. For each file, it reads the file’s contents, 
-decodes them as UTF-8 (ignoring any decoding errors), and splits the content into individual lines. These lines, 
-along with the lowercased file name, are passed to the parse_log_lines function, which parses the log lines and 
-returns a DataFrame with structured log data.
-
-If the resulting DataFrame from parse_log_lines is not empty, a new column "Source File" is added to indicate 
-the origin of each log entry, and the DataFrame is appended to all_dfs. After all files are processed, if any 
-DataFrames were collected, they are concatenated into a single DataFrame using pd.concat, with 
-ignore_index=True to reset the index. If no valid log entries were found in any file, 
-an empty DataFrame is returned.
-"""
 # For Server Logs
+# Only the file contents are hashed (compressed uploads are expanded into their logs first, see
+# data/compressed.py); the combined frame is cached on the tuple of per-file digests and names, and when it
+# changes each file is looked up in the memory and disk caches of data/file_cache.py, so only new files are
+# parsed (in a process pool when workers > 1, see data/parallel.py)
+def get_parsed_df(uploaded_files, workers=1, cache_dir=None):
+    files = expand_compressed(uploaded_files)
+    digests = tuple(content_digest(f) for f in files)
+    names = tuple(f.name for f in files)
+    return _combine_parsed_files(digests, names, files, workers, cache_dir)
+
+
+# The leading underscore keeps st.cache_data from hashing the files again; digests already identify them
 @st.cache_data(show_spinner=False)
-def get_parsed_df(uploaded_files):
-    all_dfs = []
-    for uploaded_file in uploaded_files:
-        lines = uploaded_file.read().decode("utf-8", errors="ignore").splitlines()
-        df = parse_log_lines(lines, uploaded_file.name.lower())
-        if not df.empty:
-            df["Source File"] = uploaded_file.name
-            all_dfs.append(df)
-    if all_dfs:
-        return pd.concat(all_dfs, ignore_index=True)
-    return pd.DataFrame()
+def _combine_parsed_files(digests, names, _uploaded_files, workers, cache_dir):
+    keys = [cache_key(digest, name) for digest, name in zip(digests, names)]
+    df = assemble_parsed_files(names, parse_files_cached(_uploaded_files, keys, workers, cache_dir))
+    df.attrs["sources"] = [{"name": name, "blake2b": digest} for name, digest in zip(names, digests)]
+    return df
+
+
+# For Server Logs given as paths on this server (parsed in place from the mmap'ed files, see data/mmap_parser.py)
+# The paths are cached on their size and modification time, so a file that changed is parsed again
+def get_parsed_paths_df(paths, workers=1):
+    stats = []
+    for path in paths:
+        file_stat = os.stat(path)
+        stats.append((path, file_stat.st_size, file_stat.st_mtime_ns))
+    return _parse_server_files(tuple(stats), workers)
+
+
+@st.cache_data(show_spinner=False)
+def _parse_server_files(stats, workers):
+    logs = expand_compressed([path for path, _, _ in stats])
+    df = assemble_parsed_files([log_name(log) for log in logs], parse_paths_parallel(logs, workers))
+    df.attrs["sources"] = session_sources(logs)
+    return df
 
 
 # For Apache Logs
+# engine="vectorized" uses the pyarrow engine in data/apache_vectorized.py, engine="python" the row loop
 @st.cache_data(show_spinner=False)
-def get_parsed_apache_df(uploaded_files):
-    all_records = []
-    for f in uploaded_files:
-        content = f.read().decode("utf-8", errors="ignore")
-        lines = content.strip().splitlines()
-        all_records.extend(parse_apache_logs(lines))
-    df = pd.DataFrame(all_records)
+def get_parsed_apache_df(uploaded_files, engine="vectorized"):
+    files = expand_compressed(uploaded_files)
+    df = combine_apache_frames([parse_apache_file(f, engine) for f in files])
+    df.attrs["sources"] = session_sources(files)
+    return df
+
+
+
+
+# For followed (live) log files
+# The LogFollower of every path is kept in the session, so each rerun only parses what was appended. So is
+# the combined frame: it is returned as is while no file has new rows, and otherwise only the new rows are
+# appended to it (the rows of several files are in the order they were read); it is rebuilt when a path is
+# added or removed or a file is read again from the start (a new follow id, see LogFollower.source_key)
+def get_followed_df(paths, kind, key):
+    followers = st.session_state.setdefault(key, {})
+    for path in list(followers):
+        if path not in paths:
+            del followers[path]
+    for path in paths:
+        if path not in followers:
+            followers[path] = LogFollower(path, kind)
+        followers[path].poll()
+    followed = [followers[path].source_key() for path in paths]
+    lengths = [len(followers[path].df) for path in paths]
+    combined = st.session_state.get(f"{key}_combined")
+    if combined is not None and combined["followed"] == followed:
+        if combined["lengths"] == lengths:
+            return combined["df"]
+        frames = [followers[path].df.iloc[before:] for path, before in zip(paths, combined["lengths"])]
+        df, pool = combined["df"], combined["pool"]
+    else:
+        frames = [followers[path].df for path in paths]
+        df, pool = None, {}
+    df = _append_followed(df, [frame for frame in frames if not frame.empty], kind, pool)
     if not df.empty:
-        df['timestamp'] = pd.to_datetime(df['timestamp'], format='%d/%b/%Y:%H:%M:%S %z', errors='coerce')
-        df['status'] = pd.to_numeric(df['status'], errors='coerce')
-        df['size'] = pd.to_numeric(df['size'], errors='coerce')
+        # A followed file keeps changing, so its content is not hashed; the caches tell followed files
+        # apart by path and follow id instead
+        df.attrs["sources"] = session_sources(paths, digests=False)
+        df.attrs["followed"] = followed
+    st.session_state[f"{key}_combined"] = {"followed": followed, "lengths": lengths, "df": df, "pool": pool}
     return df
 
 
+# df (None for none yet) with the new rows of the followed files (frames) appended; pool interns their
+# messages
+def _append_followed(df, frames, kind, pool):
+    if kind == "3dx":
+        frames = [frame.copy() for frame in frames]
+        for frame in frames:
+            intern_messages(frame, pool)
+    if df is not None and not df.empty:
+        frames = [df] + frames
+    if not frames:
+        return pd.DataFrame()
+    if kind == "3dx":
+        combined = concat_parsed_frames(frames)
+        combined.attrs["distinct_messages"] = len(pool)
+        return combined
+    combined = frames[0]
+    for frame in frames[1:]:
+        combined = append_apache_frame(combined, frame)
+    return combined
 
 
-# For Thread Dumps
-@st.cache_data(show_spinner=False)
-def extract_thread_info(threads):
-    lock_owners = {}
-    thread_waiting_on = {}
-    thread_stack_map = {}
-    thread_states = {}
-    thread_blocks = {}
 
-    for thread in threads:
-        thread_text = "\n".join(thread)
-        thread_name_match = re.match(r'^\"([^\"]+)\"', thread[0])
-        thread_name = thread_name_match.group(1) if thread_name_match else "Unknown"
 
-        state_match = re.search(r'java\.lang\.Thread\.State:\s+(\w+)', thread_text)
-        state = state_match.group(1) if state_match else "UNKNOWN"
-        thread_states[thread_name] = state
+# What the caches below key a parsed frame on (with its row count): the names and content hashes of its logs,
+# and for followed logs, which are not hashed, their absolute path and follow id
+def _dataset_key(df):
+    sources = tuple((source["name"], source["blake2b"]) for source in df.attrs.get("sources", []))
+    return sources + tuple(df.attrs.get("followed", ()))
+
+
+# A followed frame only grows while its follow ids stay the same (see get_followed_df), so what is derived
+# from it is kept in the session with the follow ids and the row count it covers, and extended with the rows
+# appended since (extend(derived, appended rows, row id of the first one)) instead of being built again
+def _followed_derived(df, name, build, extend):
+    store = st.session_state.setdefault("followed_derived", {})
+    followed, n_rows, derived = store.get(name, (None, 0, None))
+    if followed != df.attrs["followed"] or n_rows > len(df):
+        derived = build(df)
+    elif n_rows < len(df):
+        derived = extend(derived, df.iloc[n_rows:], n_rows)
+    store[name] = (df.attrs["followed"], len(df), derived)
+    return derived
+
+
+# The extend of the TimeIndex, EntryIndex and MessageIndex of a followed frame
+def _extend_index(index, rows, start):
+    return index.extend(rows, start)
+
+
+# The per-minute counts behind the 3DX charts (see analysis/cube.py), cached on the _dataset_key and row count
+# of df like every get_* below
+def get_event_cube(df):
+    if "followed" in df.attrs:
+        return _followed_derived(
+            df, "event_cube", build_event_cube, lambda cube, rows, _: extend_event_cube(cube, rows)
+        )
+    return _event_cube(_dataset_key(df), len(df), df)
+
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _event_cube(dataset, n_rows, _df):
+    return build_event_cube(_df)
+
+
+# The cube with Code and Template as well, only read by the correlation matrix when it groups on templates
+def get_detail_cube(df):
+    if "followed" in df.attrs:
+        return _followed_derived(
+            df, "detail_cube", lambda frame: build_event_cube(frame, DETAIL_DIMENSIONS),
+            lambda cube, rows, _: extend_event_cube(cube, rows, DETAIL_DIMENSIONS),
+        )
+    return _detail_cube(_dataset_key(df), len(df), df)
+
 
-        locked_objs = re.findall(r'- locked <([^>]+)>', thread_text)
-        for obj in locked_objs:
-            lock_owners[obj] = thread_name
+@st.cache_data(show_spinner=False, max_entries=4)
+def _detail_cube(dataset, n_rows, _df):
+    return build_event_cube(_df, DETAIL_DIMENSIONS)
 
-        waiting_match = re.search(r'- waiting to lock <([^>]+)>', thread_text)
-        if waiting_match:
-            thread_waiting_on[thread_name] = waiting_match.group(1)
 
-        top_method = "N/A"
-        stack = []
-        for line in thread:
-            if line.strip().startswith("at "):
-                stack.append(line.strip())
-                if top_method == "N/A" and not any(pkg in line for pkg in ['java.', 'jdk.', 'sun.']):
-                    top_method = line.strip()
-        thread_stack_map[thread_name] = top_method
-        thread_blocks[thread_name] = stack
+# The sorted timestamp index of the correlation matrix (see analysis/time_index.py)
+def get_time_index(df):
+    if "followed" in df.attrs:
+        return _followed_derived(df, "time_index", TimeIndex, _extend_index)
+    return _time_index(_dataset_key(df), len(df), df)
 
-    return thread_states, thread_waiting_on, lock_owners, thread_stack_map, thread_blocks
 
+@st.cache_data(show_spinner=False, max_entries=4)
+def _time_index(dataset, n_rows, _df):
+    return TimeIndex(_df)
 
 
+# The filter index of the "All Errors" table (see analysis/errors.py)
+def get_entry_index(df):
+    if "followed" in df.attrs:
+        return _followed_derived(df, "entry_index", EntryIndex, _extend_index)
+    return _entry_index(_dataset_key(df), len(df), df)
+
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _entry_index(dataset, n_rows, _df):
+    return EntryIndex(_df)
+
+
+# Row ids of EntryIndex.rows for the filter tuple (selected_file, selected_type, selected_date, time_prefix,
+# show_warnings) of the frame df
+def get_filtered_rows(df, entry_index, filters):
+    return _filtered_rows(_dataset_key(df), len(df), filters, entry_index)
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _filtered_rows(dataset, n_rows, filters, _entry_index):
+    return _entry_index.rows(*filters)
+
+
+# The full-text message index of the "All Errors" search box (see analysis/search.py)
+def get_message_index(df):
+    if "followed" in df.attrs:
+        return _followed_derived(df, "message_index", MessageIndex, _extend_index)
+    return _message_index(_dataset_key(df), len(df), df)
+
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _message_index(dataset, n_rows, _df):
+    return MessageIndex(_df)
+
+
+# Identifies a CSV export of the rows of df (see report/export.py), so a prepared file is offered only while
+# the dataset, the row selection and the compression are unchanged
+def get_export_key(df, rows, compress):
+    return _dataset_key(df), len(df), hashlib.blake2b(rows.tobytes(), digest_size=16).hexdigest(), compress
+
+
+# Row ids of MessageIndex.search for query on the frame df (None for an empty query)
+def get_search_rows(df, message_index, query):
+    return _search_rows(_dataset_key(df), len(df), query, message_index)
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _search_rows(dataset, n_rows, query, _message_index):
+    return _message_index.search(query)
+
+
+# The ranks the table pages of column are sorted by (see analysis/paging.py)
+def get_sort_keys(df, column):
+    if "followed" in df.attrs:
+        return _followed_derived(
+            df, ("sort_keys", column), lambda frame: ranked_values(frame[column]),
+            lambda ranked, rows, _: extend_ranked_values(*ranked, rows[column]),
+        )[0]
+    return _sort_keys(_dataset_key(df), len(df), column, df)
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _sort_keys(dataset, n_rows, column, _df):
+    return sort_keys(_df[column])
+
+
+# For saved sessions (data/session.py): (kind, df, metadata) of an uploaded session file
+@st.cache_data(show_spinner=False)
+def load_session(session_file):
+    return read_session(session_file.getvalue())
+
+
+# Identifies a saved session of df (see report/export.py), like get_export_key does a CSV export
+def get_session_key(kind, df, fmt):
+    return kind, _dataset_key(df), len(df), fmt
+
+
+
+
+# For Thread Dumps
+@st.cache_data(show_spinner=False)
+def extract_thread_info(threads):
+    return thread_analysis.extract_thread_info(threads)
+
 
 @st.cache_data(show_spinner=False)
 def get_threads_by_state(thread_states, full_stack_map):
-    state_map = {}
-    for state in set(thread_states.values()):
-        threads = []
-        for thread_name, thread_state in thread_states.items():
-            if thread_state == state:
-                stack = full_stack_map.get(thread_name, [])
-                if isinstance(stack, list):
-                    stack_str = "\n".join([frame for frame in stack if isinstance(frame, str)])
-                elif isinstance(stack, str):
-                    stack_str = stack
-                else:
-                    stack_str = "N/A"
-                threads.append((thread_name, stack_str))
-        state_map[state] = threads
-    return state_map
\ No newline at end of file
+    return thread_analysis.get_threads_by_state(thread_states, full_stack_map)
@@ -0,0 +1,188 @@
+import bz2
+import gzip
+import io
+import lzma
+import os
+import posixpath
+import zipfile
+
+"""
+Transparent reading of compressed logs (gzip, bz2, xz, zstd and zip archives).
+
+expand_compressed turns a list of uploaded files or paths into the list of logs they contain: plain files are
+kept as they are, a gzip/bz2/xz/zstd file becomes one CompressedLog and a zip archive becomes one CompressedLog
+per member. The compression is detected from the first bytes of the file, not from its name. A CompressedLog
+reads like an uploaded file (read/seek(0)/name), but read() returns the decompressed bytes, decompressed
+block by block while the parsers consume them, so the plain text is never held in memory or written to disk.
+
+A CompressedLog is named after the file it contains: "stderr.log.gz" holds "stderr.log", and the member
+"node1/mxtrace.log" of "logs.zip" is "mxtrace.log (logs.zip/node1)", so the name still starts like the log
+file's own name (which is what the parser and the command-line classification look at).
+
+zstd needs the optional zstandard package; every other format is in the standard library.
+
+This module must not import streamlit: worker processes import it on start-up.
+"""
+
+# Extensions the uploaders accept in addition to the plain log extensions
+COMPRESSED_TYPES = ["gz", "bz2", "xz", "zst", "zip"]
+_SUFFIXES = (".gz", ".bz2", ".xz", ".zst")
+_SNIFF_BYTES = 6
+
+
+def sniff_compression(head):
+    if head.startswith(b"\x1f\x8b"):
+        return "gzip"
+    if head.startswith(b"BZh") and head[3:4].isdigit():
+        return "bz2"
+    if head.startswith(b"\xfd7zXZ\x00"):
+        return "xz"
+    if head.startswith(b"\x28\xb5\x2f\xfd"):
+        return "zstd"
+    if head.startswith((b"PK\x03\x04", b"PK\x05\x06")):
+        return "zip"
+    return None
+
+
+def _is_path(source):
+    return isinstance(source, (str, os.PathLike))
+
+
+def _source_name(source):
+    return os.path.basename(source) if _is_path(source) else source.name
+
+
+def _read_head(source):
+    if _is_path(source):
+        with open(source, "rb") as f:
+            return f.read(_SNIFF_BYTES)
+    if hasattr(source, "getvalue"):
+        return source.getvalue()[:_SNIFF_BYTES]
+    source.seek(0)
+    head = source.read(_SNIFF_BYTES)
+    source.seek(0)
+    return head
+
+
+def _open_zstd(raw):
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError(
+            "Reading zstd-compressed logs requires the zstandard package (pip install zstandard)"
+        ) from None
+    # read_across_frames: files written by pzstd or concatenated with cat hold several frames
+    return zstandard.ZstdDecompressor().stream_reader(raw, read_across_frames=True, closefd=True)
+
+
+_OPENERS = {"gzip": gzip.open, "bz2": bz2.open, "xz": lzma.open}
+
+
+# A compressed upload or file on disk, shared by the CompressedLogs of all its zip members
+class Archive:
+    def __init__(self, source, compression):
+        self.source = source
+        self.name = _source_name(source)
+        self.compression = compression
+        # Set by disk_cache.content_digest, so the members of a zip hash the archive once
+        self.digest = None
+
+    # Binary stream of the compressed bytes, or the path itself (the openers then own the file they open)
+    def open_raw(self):
+        if _is_path(self.source):
+            return self.source
+        if hasattr(self.source, "getvalue"):
+            return io.BytesIO(self.source.getvalue())
+        self.source.seek(0)
+        return io.BytesIO(self.source.read())
+
+    def members(self):
+        with zipfile.ZipFile(self.open_raw()) as archive:
+            return [
+                info.filename for info in archive.infolist()
+                if not info.is_dir() and not info.filename.startswith("__MACOSX/")
+            ]
+
+
+class CompressedLog:
+    def __init__(self, archive, member=None):
+        self.archive = archive
+        self.member = member
+        if member is None:
+            root, suffix = os.path.splitext(archive.name)
+            self.filename = root if suffix.lower() in _SUFFIXES else archive.name
+            self.name = self.filename
+        else:
+            self.filename = posixpath.basename(member)
+            location = posixpath.join(archive.name, posixpath.dirname(member)).rstrip("/")
+            self.name = f"{self.filename} ({location})"
+        self._stream = None
+
+    # A new binary stream of the decompressed content
+    def open(self):
+        raw = self.archive.open_raw()
+        if self.member is not None:
+            with zipfile.ZipFile(raw) as archive:
+                # The member stream keeps the archive file open until it is closed itself
+                return archive.open(self.member)
+        if self.archive.compression == "zstd":
+            return _open_zstd(open(raw, "rb") if _is_path(raw) else raw)
+        return _OPENERS[self.archive.compression](raw, "rb")
+
+    # File-like reading, as iter_lines and the thread dump tab do with uploaded files
+    def read(self, size=-1):
+        if self._stream is None:
+            self._stream = self.open()
+        data = self._stream.read(size)
+        if size is None or size < 0 or not data:
+            self.close()
+        return data
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if offset != 0 or whence != io.SEEK_SET:
+            raise io.UnsupportedOperation("a compressed log can only be rewound to its start")
+        self.close()
+        return 0
+
+    def close(self):
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+
+    # Same log with its archive at path (a copy of the compressed bytes), so worker processes can open it
+    def at_path(self, path):
+        archive = Archive(path, self.archive.compression)
+        log = CompressedLog(archive, self.member)
+        log.name, log.filename = self.name, self.filename
+        return log
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state["_stream"] = None
+        return state
+
+
+# Uploaded files or paths -> the logs they contain, in order (zip members in archive order)
+def expand_compressed(files):
+    logs = []
+    for source in files:
+        compression = sniff_compression(_read_head(source))
+        if compression is None:
+            logs.append(source)
+            continue
+        archive = Archive(source, compression)
+        if compression == "zip":
+            logs.extend(CompressedLog(archive, member) for member in archive.members())
+        else:
+            logs.append(CompressedLog(archive))
+    return logs
+
+
+# Name of an expanded log: CompressedLog.name, the uploaded file's name or the basename of a path
+def log_name(log):
+    return log.name if isinstance(log, CompressedLog) else _source_name(log)
+
+
+# Binary stream of the (decompressed) content of an expanded path
+def open_log(log):
+    return log.open() if isinstance(log, CompressedLog) else open(log, "rb")
@@ -0,0 +1,50 @@
+import gzip
+import io
+
+"""
+CSV export of large frames without building the whole CSV as one string.
+
+write_csv writes the given rows of a frame to a binary file in batches of CSV_BATCH_ROWS: each batch is taken
+from its slice of the row ids (through frame, which may add columns, or df.iloc) and written with
+DataFrame.to_csv, so at no point is more than one batch of rows or of CSV text held in memory.
+csv_export_file does so into a BytesIO, optionally through gzip, and returns it rewound for
+st.download_button. Streamlit keeps the bytes of a download in memory whatever it is given, so the buffer is
+not spooled to disk; the gzip option is what keeps it small (CSV of parsed logs compresses about tenfold).
+
+Left to itself, to_csv picks the layout of datetime values per block of rows it writes (date only, or the
+shortest seconds fraction that fits the block), so one column could change layout from row to row. Every
+batch is written with the explicit DATE_FORMAT instead: the output is that of
+frame(df, rows).to_csv(index=False, date_format=DATE_FORMAT), whatever the batch size.
+"""
+
+CSV_BATCH_ROWS = 50_000
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
+
+
+def _take_rows(df, rows):
+    return df.iloc[rows]
+
+
+# frame(df, rows) builds the rows of one batch; the default takes them as they are
+def write_csv(df, rows, binary_file, batch_rows=CSV_BATCH_ROWS, frame=_take_rows):
+    text = io.TextIOWrapper(binary_file, encoding="utf-8", newline="")
+    if len(rows) == 0:
+        frame(df, rows).to_csv(text, index=False)
+    for start in range(0, len(rows), batch_rows):
+        batch = frame(df, rows[start:start + batch_rows])
+        batch.to_csv(text, index=False, header=start == 0, date_format=DATE_FORMAT)
+    text.flush()
+    # Leave binary_file open for the caller
+    text.detach()
+
+
+def csv_export_file(df, rows, compress=False, batch_rows=CSV_BATCH_ROWS, frame=_take_rows):
+    buffer = io.BytesIO()
+    if compress:
+        # mtime=0 keeps the archive identical for identical rows
+        with gzip.GzipFile(fileobj=buffer, mode="wb", mtime=0) as gz:
+            write_csv(df, rows, gz, batch_rows, frame)
+    else:
+        write_csv(df, rows, buffer, batch_rows, frame)
+    buffer.seek(0)
+    return buffer
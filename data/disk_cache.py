@@ -0,0 +1,107 @@
+import hashlib
+import os
+import uuid
+
+import pandas as pd
+
+from data.compressed import CompressedLog
+from data.parser import PARSER_VERSION, PARSED_COLUMNS
+from data.templates import TEMPLATE_VERSION
+
+"""
+Disk-backed cache of parse_log_lines results, one Parquet file per uploaded file.
+
+Entries are keyed by a BLAKE2b hash of the file content plus PARSER_VERSION, TEMPLATE_VERSION and the part of
+the file name the parser looks at (whether it is an mxtrace log), so the same file hits the cache after a
+restart, under another upload order or inside another file set. The frame is stored as it is, with the
+"Template" column mined for the file (Parquet keeps the categorical Type/Code/Template and the int32 Line). A file without log entries is stored as a zero-row frame and loads as an
+empty DataFrame.
+
+Entries are written to a temporary file and renamed into place, so a crash never leaves a half-written
+entry behind. Loading an entry touches its mtime, and store() evicts the least recently used entries
+until the cache directory is back under max_bytes. Unreadable entries count as misses.
+"""
+
+MAX_CACHE_BYTES = 2 * 1024 * 1024 * 1024
+HASH_CHUNK_BYTES = 4 * 1024 * 1024
+_SUFFIX = ".parquet"
+
+
+def content_digest(file_obj):
+    if isinstance(file_obj, CompressedLog):
+        # Hash the compressed archive (once for all of its members) and the member instead of decompressing
+        archive = file_obj.archive
+        if archive.digest is None:
+            archive.digest = content_digest(archive.source)
+        member = f"{archive.digest}/{file_obj.member or ''}".encode()
+        return hashlib.blake2b(member, digest_size=16).hexdigest()
+    if isinstance(file_obj, (str, os.PathLike)):
+        with open(file_obj, "rb") as f:
+            return content_digest(f)
+    digest = hashlib.blake2b(digest_size=16)
+    if hasattr(file_obj, "getvalue"):
+        digest.update(file_obj.getvalue())
+    else:
+        file_obj.seek(0)
+        while chunk := file_obj.read(HASH_CHUNK_BYTES):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cache_key(digest, filename):
+    kind = "mxtrace" if filename.lower().startswith("mxtrace") else "log"
+    return f"v{PARSER_VERSION}-t{TEMPLATE_VERSION}-{kind}-{digest}"
+
+
+def _entry_path(cache_dir, key):
+    return os.path.join(cache_dir, key + _SUFFIX)
+
+
+def load(cache_dir, key):
+    path = _entry_path(cache_dir, key)
+    try:
+        df = pd.read_parquet(path)
+        os.utime(path)
+    except (OSError, ValueError):
+        # Missing, or corrupt/truncated (pyarrow's ArrowInvalid is a ValueError)
+        return None
+    if df.empty:
+        empty = pd.DataFrame()
+        empty.attrs.update(df.attrs)
+        return empty
+    return df
+
+
+def store(cache_dir, key, df, max_bytes=MAX_CACHE_BYTES):
+    os.makedirs(cache_dir, exist_ok=True)
+    columns = PARSED_COLUMNS + (["Template"] if "Template" in df.columns else [])
+    stored = df[columns] if not df.empty else pd.DataFrame({col: [] for col in PARSED_COLUMNS})
+    # The line counts of with_line_stats are kept in the Parquet metadata along with the frame
+    stored.attrs.update(df.attrs)
+    path = _entry_path(cache_dir, key)
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    try:
+        stored.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return
+    evict(cache_dir, max_bytes)
+
+
+def evict(cache_dir, max_bytes=MAX_CACHE_BYTES):
+    entries = []
+    for entry in os.scandir(cache_dir):
+        if entry.is_file() and entry.name.endswith(_SUFFIX):
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
@@ -0,0 +1,90 @@
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from data import disk_cache
+from data.parallel import parse_file, parse_files_parallel
+from data.parser import concat_parsed_frames, intern_messages, source_file_column
+from data.templates import add_templates
+
+"""
+Per-file parsing of 3DEXPERIENCE logs with an in-memory and an optional on-disk cache, without any
+Streamlit dependency (data/cache.py adds the st.cache_data layer on top).
+
+parse_files_cached looks every file up by its key (disk_cache.cache_key of its content digest, which
+data/cache.py computes once per file), first in an in-process LRU of per-file results (_FILE_FRAMES), then in
+the disk cache (see data/disk_cache.py), and parses only the files found in neither, serially or in the
+process pool. The "Template" column of data/templates.py is mined for each parsed file right away and cached
+with it, so adding a file to a set mines the new file only. assemble_parsed_files adds "Source File" (and
+"Template" to the frames of files parsed without the cache, e.g. server paths), concatenates the per-file
+frames, which unions their template texts into shared template ids, and interns their messages
+(data.parser.intern_messages); the combined frame's attrs hold the total "lines" and "skipped_lines" (lines
+the prefilter of data/mmap_parser.py kept away from the regexes) of the files that report them, and
+"distinct_messages".
+"""
+# Per-file parse results of this process keyed by disk_cache.cache_key, least recently used first
+_FILE_FRAMES = OrderedDict()
+_FILE_FRAMES_LOCK = threading.Lock()
+MAX_MEMORY_FILES = 64
+
+
+def _remember_frame(key, df):
+    with _FILE_FRAMES_LOCK:
+        _FILE_FRAMES[key] = df
+        _FILE_FRAMES.move_to_end(key)
+        while len(_FILE_FRAMES) > MAX_MEMORY_FILES:
+            _FILE_FRAMES.popitem(last=False)
+
+
+def _recall_frame(key):
+    with _FILE_FRAMES_LOCK:
+        df = _FILE_FRAMES.get(key)
+        if df is not None:
+            _FILE_FRAMES.move_to_end(key)
+        return df
+
+
+# Returns one parse_log_lines frame per file (with "Template", without "Source File"), parsing only uncached files
+def parse_files_cached(uploaded_files, keys, workers=1, cache_dir=None):
+    frames = [_recall_frame(key) for key in keys]
+    if cache_dir:
+        for i, key in enumerate(keys):
+            if frames[i] is None:
+                frames[i] = disk_cache.load(cache_dir, key)
+                if frames[i] is not None:
+                    _remember_frame(key, frames[i])
+
+    misses = [i for i, df in enumerate(frames) if df is None]
+    if misses:
+        files = [uploaded_files[i] for i in misses]
+        if workers > 1:
+            parsed = parse_files_parallel(files, workers)
+        else:
+            parsed = (parse_file(f) for f in files)
+        for i, df in zip(misses, parsed):
+            frames[i] = df = add_templates(df)
+            _remember_frame(keys[i], df)
+            if cache_dir:
+                disk_cache.store(cache_dir, keys[i], df)
+    return frames
+
+
+def assemble_parsed_files(names, frames):
+    all_dfs = [
+        df.assign(**{"Source File": source_file_column(name, len(df))})
+        for name, df in zip(names, frames) if not df.empty
+    ]
+    for df in all_dfs:
+        if "Template" not in df.columns:
+            add_templates(df)
+    if not all_dfs:
+        combined = pd.DataFrame()
+    else:
+        combined = concat_parsed_frames(all_dfs)
+        intern_messages(combined)
+    counted = [df.attrs for df in frames if "skipped_lines" in df.attrs]
+    if counted:
+        combined.attrs["lines"] = sum(attrs["lines"] for attrs in counted)
+        combined.attrs["skipped_lines"] = sum(attrs["skipped_lines"] for attrs in counted)
+    return combined
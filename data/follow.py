@@ -0,0 +1,144 @@
+import itertools
+import os
+from datetime import timezone
+
+import pandas as pd
+
+from data.parallel import parse_chunk_bytes, continue_chunk
+from data.parser import concat_parsed_frames, source_file_column
+from data.templates import TemplateIds
+
+"""
+Tail-follow mode for log files that are still being written (server-side paths, not uploads).
+
+A LogFollower remembers how far it has read a file. Every poll() reads only the bytes appended since the
+previous poll, up to the last complete line (an unterminated last line waits for its newline), parses them
+and appends the rows to its frame:
+  - kind "3dx": the bytes go through parse_chunk_bytes like a chunk of data/parallel.py, and continue_chunk
+    carries the Line numbering and the last seen timestamp over from the previous increments. A TemplateIds
+    (data/templates.py) mines only the messages not seen in earlier increments and gives the template ids
+    of the new rows, which are appended to the "Template" column.
+  - kind "apache": the bytes go through parse_apache_bytes/combine_apache_frames; leading whitespace is
+    only stripped until the first non-blank line of the file, like content.strip() on the whole file.
+After every poll the frame holds the same values as a full parse of the file's complete lines (the "Template"
+categories are in order of first appearance), so a refresh costs a
+parse of the new bytes plus appending them to the frame.
+
+A file that was replaced (different device/inode, e.g. logrotate), truncated (smaller than the read
+offset) or rewritten in place (its first bytes changed) is read again from the start, and the frame is
+rebuilt from that new content under a new follow_id, so that source_key tells a rebuilt frame from one
+that was appended to.
+"""
+
+FOLLOW_KINDS = ("3dx", "apache")
+READ_BYTES = 32 * 1024 * 1024
+# Bytes at the start of the file compared on every poll to detect a file rewritten in place
+FINGERPRINT_BYTES = 1024
+# Follow ids of the process; a follower takes a new one whenever it starts reading its file from the start
+_FOLLOW_IDS = itertools.count()
+
+
+class LogFollower:
+    def __init__(self, path, kind="3dx"):
+        if kind not in FOLLOW_KINDS:
+            raise ValueError(f"kind must be one of {FOLLOW_KINDS}, got {kind!r}")
+        self.path = path
+        self.kind = kind
+        self.name = os.path.basename(path)
+        self._reset(None)
+
+    def _reset(self, identity):
+        self.follow_id = next(_FOLLOW_IDS)
+        self.offset = 0
+        self.df = pd.DataFrame()
+        self._identity = identity
+        self._fingerprint = b""
+        self._line_offset = 0
+        self._carry_ts = None
+        self._text_started = False
+        self._templates = TemplateIds() if self.kind == "3dx" else None
+
+    def _was_replaced(self, stat, f):
+        if (stat.st_dev, stat.st_ino) != self._identity or stat.st_size < self.offset:
+            return True
+        return f.read(len(self._fingerprint)) != self._fingerprint
+
+    # Parses the complete lines appended since the last poll; returns the number of new rows
+    def poll(self):
+        rows_before = len(self.df)
+        with open(self.path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            if self._was_replaced(stat, f):
+                self._reset((stat.st_dev, stat.st_ino))
+                rows_before = 0
+            f.seek(self.offset)
+            remaining = stat.st_size - self.offset
+            pending = b""
+            while remaining > 0 and (block := f.read(min(READ_BYTES, remaining))):
+                remaining -= len(block)
+                data = pending + block
+                end = data.rfind(b"\n") + 1
+                if end:
+                    self._append(data[:end])
+                    self.offset += end
+                pending = data[end:]
+            if len(self._fingerprint) < FINGERPRINT_BYTES and self.offset:
+                f.seek(0)
+                self._fingerprint = f.read(min(self.offset, FINGERPRINT_BYTES))
+        return len(self.df) - rows_before
+
+    # (absolute path, follow id): the frame only grows (new rows are appended) while the key stays the same,
+    # and two followed files with the same name and row count still have different keys
+    def source_key(self):
+        return os.path.abspath(self.path), self.follow_id
+
+    def _append(self, data):
+        if self.kind == "3dx":
+            new = self._parse_3dx(data)
+        else:
+            new = self._parse_apache(data)
+        if new is None or new.empty:
+            return
+        if self.kind == "3dx":
+            new["Template"] = self._templates.add(new["Message"])
+        if self.df.empty:
+            self.df = new
+        elif self.kind == "3dx":
+            # Same categories on both sides, so the concat only copies the codes
+            self.df["Template"] = self._templates.relabel(self.df["Template"])
+            self.df = concat_parsed_frames([self.df, new])
+        else:
+            self.df = append_apache_frame(self.df, new)
+
+    def _parse_3dx(self, data):
+        columns, state = parse_chunk_bytes(data, self.name)
+        df, self._line_offset, self._carry_ts = continue_chunk(columns, state, self._line_offset, self._carry_ts)
+        if df is None:
+            return None
+        df["Source File"] = source_file_column(self.name, len(df))
+        return df
+
+    def _parse_apache(self, data):
+        from data.apache_vectorized import parse_apache_bytes, combine_apache_frames
+
+        df, has_lines = parse_apache_bytes(data, strip_leading=not self._text_started)
+        self._text_started = self._text_started or has_lines
+        return combine_apache_frames([df])
+
+
+# pd.concat of two combine_apache_frames results, keeping the timestamp dtype a single combine would give:
+# the shared fixed-offset timezone, or UTC once the offsets differ
+def append_apache_frame(df, new):
+    old_ts, new_ts = df["timestamp"], new["timestamp"]
+    if old_ts.dtype != new_ts.dtype:
+        if new_ts.isna().all():
+            new = new.assign(timestamp=pd.Series(pd.NaT, index=new.index, dtype=old_ts.dtype))
+        elif old_ts.isna().all():
+            df = df.assign(timestamp=pd.Series(pd.NaT, index=df.index, dtype=new_ts.dtype))
+        else:
+            # Once the frame is in UTC it stays there, so only the new rows need converting
+            if old_ts.dt.tz != timezone.utc:
+                df = df.assign(timestamp=old_ts.dt.tz_convert(timezone.utc))
+            if new_ts.dt.tz != timezone.utc:
+                new = new.assign(timestamp=new_ts.dt.tz_convert(timezone.utc))
+    return pd.concat([df, new], ignore_index=True)
@@ -0,0 +1,79 @@
+import codecs
+import os
+
+"""
+Streaming ingestion of uploaded log files.
+
+iter_lines reads a file-like object (Streamlit UploadedFile, open binary file, ...) in fixed-size byte
+chunks, decodes them incrementally and yields one line at a time, so peak memory is bounded by the chunk
+size instead of the file size. Lines are split exactly like str.splitlines(): a "\\r\\n" pair that
+straddles two chunks is held back until the next chunk arrives, and multi-byte UTF-8 sequences cut by a
+chunk boundary are completed by the incremental decoder.
+
+allowed_server_paths checks the paths typed into the dashboard against the log directories it may read
+(config.settings.SERVER_LOG_ROOTS) before any of them is opened.
+"""
+
+CHUNK_SIZE = 4 * 1024 * 1024
+
+# Characters str.splitlines() treats as line boundaries
+_LINE_BOUNDARIES = frozenset("\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029")
+
+
+def iter_lines(file_obj, chunk_size=CHUNK_SIZE, encoding="utf-8", errors="ignore"):
+    if hasattr(file_obj, "seek"):
+        file_obj.seek(0)
+    decoder = codecs.getincrementaldecoder(encoding)(errors=errors)
+    pending = ""
+    while True:
+        chunk = file_obj.read(chunk_size)
+        if not chunk:
+            break
+        text = pending + decoder.decode(chunk)
+        if not text:
+            continue
+        lines = text.splitlines()
+        last_char = text[-1]
+        if last_char == "\r":
+            # Could be the first half of "\r\n"; keep it with the pending text
+            pending = lines.pop() + "\r"
+        elif last_char in _LINE_BOUNDARIES:
+            pending = ""
+        else:
+            pending = lines.pop()
+        yield from lines
+    yield from (pending + decoder.decode(b"", final=True)).splitlines()
+
+
+# Equivalent of content.strip().splitlines() for a line stream: drops leading blank lines and the
+# leading whitespace of the first non-blank line. Trailing whitespace is left alone.
+def lstrip_lines(lines):
+    lines = iter(lines)
+    for line in lines:
+        stripped = line.lstrip()
+        if stripped:
+            yield stripped
+            break
+    yield from lines
+
+
+def _is_within(path, root):
+    try:
+        return os.path.commonpath([path, root]) == root
+    except ValueError:
+        # Paths on different drives
+        return False
+
+
+# The real paths (symlinks resolved) of paths; ValueError unless every one of them is inside one of roots
+def allowed_server_paths(paths, roots):
+    real_roots = [os.path.realpath(root) for root in roots]
+    if not real_roots:
+        raise ValueError("reading log files on this server is disabled (no log directories are configured)")
+    real_paths = []
+    for path in paths:
+        real_path = os.path.realpath(path)
+        if not any(_is_within(real_path, root) for root in real_roots):
+            raise ValueError(f"{path} is not inside an allowed log directory")
+        real_paths.append(real_path)
+    return real_paths
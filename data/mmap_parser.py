@@ -0,0 +1,257 @@
+import mmap
+import os
+import re
+
+from data.parser import NAT_NS, build_parsed_frame, _match_error
+from data.timestamps import TimestampDecoder, ns_to_datetime
+from utils.regex_patterns import timestamp_regex, mxtrace_ts_pattern, apache_ts_pattern
+from utils.regex_patterns import (
+    error_regex_bytes, exception_regex_bytes, timestamp_regex_bytes, mxtrace_ts_pattern_bytes,
+    apache_ts_pattern_bytes,
+)
+from utils.regex_patterns import ERROR_KEYWORDS, EXCEPTION_KEYWORD
+
+"""
+parse_log_lines for 3DEXPERIENCE logs working on the raw bytes: files on a local or NFS disk through mmap
+(parse_log_file), in-memory uploads and chunks (parse_log_bytes) and binary streams such as decompressed
+logs (parse_log_stream, read in line-aligned blocks).
+
+They return the same frame (and fill the same state) as parse_log_lines over the same lines, but never decode
+the whole log:
+  - The bytes are scanned in line-aligned blocks of BLOCK_BYTES. bytes.find on the lowercased block locates
+    the lines containing ERROR_KEYWORDS or EXCEPTION_KEYWORD, the literal check of parse_log_lines' prefilter.
+  - Only those candidate lines are cut out of the block and matched with the bytes versions of the regexes
+    (utils/regex_patterns.py), and only the matched groups are decoded.
+  - An error gets the last timestamp seen before it, so the timestamp regexes do not run on every line: the
+    lines before a candidate are walked backwards until one of them carries a timestamp (or the previous
+    candidate is reached), and the lines before that are skipped.
+  - The bytes patterns match like the str patterns only on ASCII text without \\v, \\f, \\r and \\x1c-\\x1f
+    (extra line boundaries and whitespace for str). Lines containing any other byte are candidates too; they
+    are decoded and split like iter_lines does, and go through the str patterns. A \\r right before the
+    \\n (CRLF logs written on Windows) or at the end of the data is part of the line ending: it is cut off
+    the line, which stays on the bytes path.
+The other lines are only counted (bytes.count) and, near a candidate, checked for a timestamp.
+
+The state also gets "skipped_lines": the lines that never reached a regex (neither a candidate nor checked
+for a timestamp). with_line_stats copies "lines" and "skipped_lines" into the frame's attrs, which
+data/file_cache.py sums over the files for the dashboard and the command-line analyzer.
+
+BLOCK_BYTES bounds the memory used on top of the mapping or the stream (a block and its lowercase copy).
+"""
+
+BLOCK_BYTES = 8 * 1024 * 1024
+_KEYWORDS = tuple(keyword.encode("ascii") for keyword in ERROR_KEYWORDS)
+_EXCEPTION_KEYWORD = EXCEPTION_KEYWORD.encode("ascii")
+# Bytes of the lines the bytes patterns handle; lines containing any other byte are decoded
+_PLAIN_BYTES = bytes(range(0x00, 0x0b)) + bytes(range(0x0e, 0x1c)) + bytes(range(0x20, 0x80))
+# The same plus \r, which is only special when it does not end a line
+_PLAIN_OR_CR_BYTES = _PLAIN_BYTES + b"\r"
+_SPECIAL_BYTE = re.compile(rb"[\x0b\x0c\x1c-\x1f\x80-\xff]|\r(?!\n|\Z)")
+
+
+def _match_error_bytes(line):
+    if (err := error_regex_bytes.search(line)):
+        err_type, code, msg = err.groups()
+        return err_type.strip().decode("ascii"), code.decode("ascii") if code else "N/A", msg.strip().decode("ascii")
+    if (exc := exception_regex_bytes.search(line)):
+        return "Exception", exc.group(1).decode("ascii"), line.strip().decode("ascii")
+    return None
+
+
+# Whether the block holds a \r that is neither followed by \n nor at its end
+def _has_lone_cr(block):
+    if b"\r" not in block:
+        return False
+    return block.count(b"\r") != block.count(b"\r\n") + block.endswith(b"\r")
+
+
+# block[start:end] without the \r of a CRLF line ending (end is the index of the b"\n" or the end of the block)
+def _cut_line(block, start, end):
+    if end > start and block[end - 1] == 0x0D:
+        end -= 1
+    return block[start:end]
+
+
+# (start, end) of every candidate line of the block, in order; end is the index of its b"\n" (or len(block))
+def _candidate_lines(block):
+    lines = {}
+
+    def add(pos):
+        start = block.rfind(b"\n", 0, pos) + 1
+        end = block.find(b"\n", pos)
+        lines[start] = len(block) if end == -1 else end
+        return lines[start]
+
+    lowered = block.lower()
+    for keyword in _KEYWORDS:
+        pos = lowered.find(keyword)
+        while pos != -1:
+            pos = lowered.find(keyword, add(pos))
+    pos = block.find(_EXCEPTION_KEYWORD)
+    while pos != -1:
+        pos = block.find(_EXCEPTION_KEYWORD, add(pos))
+    if block.translate(None, _PLAIN_OR_CR_BYTES) or _has_lone_cr(block):
+        match = _SPECIAL_BYTE.search(block)
+        while match:
+            match = _SPECIAL_BYTE.search(block, add(match.start()))
+    return sorted(lines.items())
+
+
+class _MappedLogParser:
+    def __init__(self, is_mxtrace, track_first_ts):
+        self.is_mxtrace = is_mxtrace
+        self.track_first_ts = track_first_ts
+        self.decoder = TimestampDecoder()
+        self.columns = ([], [], [], [], [])
+        # Pool of the messages seen so far, so that repeats share one str object
+        self.messages = {}
+        self.last_ts_ns = NAT_NS
+        self.first_ts_line = None
+        # Lines before the current position, and how many of them went through _timestamp or _line
+        self.lines = 0
+        self.scanned = 0
+
+    # The timestamp update of a line, like parse_log_lines: None for none, NAT_NS for a bad mxtrace header
+    def _timestamp(self, line, text):
+        decoder = self.decoder
+        # The same literal checks as parse_log_lines' prefilter, for str and bytes lines
+        colon, dash, bracket = (":", "-", "[") if text else (b":", b"-", b"[")
+        if self.is_mxtrace:
+            if colon in line and (m := (mxtrace_ts_pattern if text else mxtrace_ts_pattern_bytes).search(line)):
+                ts_ns = decoder.mxtrace(m.group(1) if text else m.group(1).decode("ascii"))
+                return NAT_NS if ts_ns is None else ts_ns
+            return None
+        if dash in line and colon in line and (m := (timestamp_regex if text else timestamp_regex_bytes).search(line)):
+            return decoder.tomcat(m.group(1) if text else m.group(1).decode("ascii"))
+        if bracket in line and (m := (apache_ts_pattern if text else apache_ts_pattern_bytes).search(line)):
+            return decoder.apache_error(m.group(1) if text else m.group(1).decode("ascii"))
+        return None
+
+    # A candidate line (str or bytes) and its _timestamp
+    def _line(self, line, text, ts_ns):
+        self.lines += 1
+        self.scanned += 1
+        if ts_ns is not None:
+            self.last_ts_ns = ts_ns
+            if self.first_ts_line is None:
+                self.first_ts_line = self.lines
+            if self.is_mxtrace:
+                return  # Don't process header as error line
+        if (row := _match_error(line) if text else _match_error_bytes(line)):
+            line_col, ts_col, type_col, code_col, msg_col = self.columns
+            line_col.append(self.lines)
+            ts_col.append(self.last_ts_ns)
+            type_col.append(row[0])
+            code_col.append(row[1])
+            msg_col.append(self.messages.setdefault(row[2], row[2]))
+
+    # Lines block[start:end] hold no candidate; only the last timestamp among them matters, and only if the
+    # next candidate line has none itself (find_last_ts)
+    def _skip_lines(self, block, start, end, find_last_ts=True):
+        if self.track_first_ts and self.first_ts_line is None:
+            # Walk forwards up to the first timestamp of the file
+            while start < end and self.first_ts_line is None:
+                newline = block.find(b"\n", start, end)
+                line_end = end if newline == -1 else newline
+                self.lines += 1
+                self.scanned += 1
+                if (ts_ns := self._timestamp(_cut_line(block, start, line_end), False)) is not None:
+                    self.last_ts_ns = ts_ns
+                    self.first_ts_line = self.lines
+                start = line_end + 1
+            if start >= end:
+                return
+        self.lines += block.count(b"\n", start, end) + (block[end - 1] != 0x0A)
+        if not find_last_ts:
+            return
+        line_end = end if block[end - 1] != 0x0A else end - 1
+        while line_end >= start:
+            line_start = block.rfind(b"\n", start, line_end) + 1 or start
+            self.scanned += 1
+            if (ts_ns := self._timestamp(_cut_line(block, line_start, line_end), False)) is not None:
+                self.last_ts_ns = ts_ns
+                return
+            line_end = line_start - 1
+
+    def parse(self, buf, start, end):
+        while start < end:
+            block_end = start + BLOCK_BYTES
+            if block_end >= end:
+                block_end = end
+            else:
+                newline = buf.find(b"\n", block_end - 1, end)
+                block_end = end if newline == -1 else newline + 1
+            block = buf[start:block_end]
+            pos = 0
+            for line_start, line_end in _candidate_lines(block):
+                line = _cut_line(block, line_start, line_end)
+                if line.translate(None, _PLAIN_BYTES):
+                    if pos < line_start:
+                        self._skip_lines(block, pos, line_start)
+                    # Decoded with its b"\n", which str.splitlines() treats like iter_lines does
+                    for text in block[line_start:line_end + 1].decode("utf-8", errors="ignore").splitlines():
+                        self._line(text, True, self._timestamp(text, True))
+                else:
+                    ts_ns = self._timestamp(line, False)
+                    if pos < line_start:
+                        self._skip_lines(block, pos, line_start, find_last_ts=ts_ns is None)
+                    self._line(line, False, ts_ns)
+                pos = line_end + 1
+            if pos < len(block):
+                self._skip_lines(block, pos, len(block))
+            start = block_end
+
+
+    def finish(self, state):
+        if state is not None:
+            state["lines"] = self.lines
+            state["first_ts_line"] = self.first_ts_line
+            state["last_ts"] = None if self.last_ts_ns == NAT_NS else ns_to_datetime(self.last_ts_ns)
+            state["skipped_lines"] = self.lines - self.scanned
+        return build_parsed_frame(*self.columns)
+
+
+def _parser_for(filename, state):
+    return _MappedLogParser(filename.lower().startswith("mxtrace"), track_first_ts=state is not None)
+
+
+# Same as parse_log_lines(iter_lines(open(path, "rb")), filename, state=state), for the bytes [start, end)
+# of the file (line-aligned, as in data/parallel.py). filename defaults to the file name.
+def parse_log_file(path, filename=None, start=0, end=None, state=None):
+    parser = _parser_for(filename or os.path.basename(path), state)
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        end = size if end is None else min(end, size)
+        if start < end:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                parser.parse(buf, start, end)
+    return parser.finish(state)
+
+
+# Same as parse_log_lines(iter_lines(io.BytesIO(data)), filename, state=state)
+def parse_log_bytes(data, filename, state=None):
+    parser = _parser_for(filename, state)
+    parser.parse(data, 0, len(data))
+    return parser.finish(state)
+
+
+# Same as parse_log_lines(iter_lines(stream), filename, state=state); the stream is read BLOCK_BYTES at a time
+def parse_log_stream(stream, filename, state=None):
+    parser = _parser_for(filename, state)
+    pending = b""
+    while (data := stream.read(BLOCK_BYTES)):
+        data = pending + data
+        cut = data.rfind(b"\n") + 1
+        if cut:
+            parser.parse(data, 0, cut)
+        pending = data[cut:]
+    if pending:
+        parser.parse(pending, 0, len(pending))
+    return parser.finish(state)
+
+
+# Sets df.attrs["lines"] and df.attrs["skipped_lines"] from a parse state and returns df
+def with_line_stats(df, state):
+    df.attrs["lines"] = state["lines"]
+    df.attrs["skipped_lines"] = state["skipped_lines"]
+    return df
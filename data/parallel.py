@@ -0,0 +1,220 @@
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from data.compressed import CompressedLog
+from data.mmap_parser import parse_log_bytes, parse_log_file, parse_log_stream, with_line_stats
+from data.parser import concat_parsed_frames, PARSED_COLUMNS
+
+"""
+Process-pool execution of parse_log_lines across uploaded files and within large files.
+
+Every uploaded file is cut into line-aligned byte ranges of about CHUNK_BYTES (a small file is a single
+range), and all ranges of all files are parsed in one ProcessPoolExecutor. Ranges always end right after
+a b"\\n", which is a line boundary for str.splitlines() and can never sit inside a multi-byte UTF-8
+sequence, so each range decodes and splits exactly like the same lines inside the whole file.
+
+parse_log_lines carries last_ts from line to line, so a range parsed on its own does not know the
+timestamp of the rows before its first timestamp line. Workers report the carry state of their range
+(line count, first timestamp update, final last_ts); _stitch_chunks then offsets the Line numbers, fills
+those leading rows with the last timestamp of the previous range and concatenates the ranges in order.
+parse_files_parallel returns one frame per file, identical to what parse_log_lines returns for it.
+
+parse_paths_parallel does the same for files on disk (used by the command-line analyzer and for server-side
+paths in the dashboard): chunk boundaries are found by reading around each cut point, and every worker
+parses only its own byte range of the mmap'ed file with parse_log_file (data/mmap_parser.py), so neither the
+parent nor the workers read or decode the whole file.
+
+Compressed logs (data/compressed.py) cannot be cut at byte offsets, so each one is a single task whose worker
+decompresses it while parsing; the members of a zip archive are separate tasks and are parsed in parallel.
+Workers open the archive themselves: uploaded archives are copied (still compressed) to a temporary
+directory for the duration of the parse, so the archive bytes are not pickled once per member.
+
+Every range is parsed from its bytes by data/mmap_parser.py, which only sends the lines holding an error
+keyword (and the timestamp lines around them) to the regexes; the stitched frame carries the line count and
+the number of skipped lines in its attrs (with_line_stats).
+
+Workers send back the columns of their frame (PARSED_COLUMNS) as arrays, which the parent stitches and
+concatenates without any per-row conversion.
+
+This module must not import streamlit: worker processes import it on start-up.
+"""
+
+CHUNK_BYTES = 32 * 1024 * 1024
+# Read size used to find the end of the line at a chunk cut point of a file on disk
+_SCAN_BYTES = 64 * 1024
+
+
+def _read_bytes(file_obj):
+    if hasattr(file_obj, "getvalue"):
+        return file_obj.getvalue()
+    file_obj.seek(0)
+    return file_obj.read()
+
+
+def split_line_aligned(data, chunk_bytes=CHUNK_BYTES):
+    ranges = []
+    start = 0
+    size = len(data)
+    while start < size:
+        end = start + chunk_bytes
+        if end >= size:
+            end = size
+        else:
+            newline = data.find(b"\n", end - 1)
+            end = size if newline == -1 else newline + 1
+        ranges.append((start, end))
+        start = end
+    return ranges or [(0, 0)]
+
+
+# Same ranges as split_line_aligned, computed without reading the whole file
+def split_file_line_aligned(path, chunk_bytes=CHUNK_BYTES):
+    ranges = []
+    start = 0
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        while start < size:
+            end = start + chunk_bytes
+            if end >= size:
+                end = size
+            else:
+                f.seek(end - 1)
+                scan_pos = end - 1
+                while True:
+                    block = f.read(_SCAN_BYTES)
+                    if not block:
+                        end = size
+                        break
+                    newline = block.find(b"\n")
+                    if newline != -1:
+                        end = scan_pos + newline + 1
+                        break
+                    scan_pos += len(block)
+            ranges.append((start, end))
+            start = end
+    return ranges or [(0, 0)]
+
+
+def _chunk_result(df, state):
+    columns = None if df.empty else {col: df[col].values for col in PARSED_COLUMNS}
+    return columns, state
+
+
+# Runs in the worker process
+def parse_chunk_bytes(data, filename):
+    state = {}
+    return _chunk_result(parse_log_bytes(data, filename, state=state), state)
+
+
+# Turns one parse_chunk_bytes result into a frame continuing after line_offset, whose rows before
+# the chunk's first timestamp line get carry_ts (the last timestamp of the previous chunks). Returns the
+# frame (None if the chunk has no rows), the next line_offset and the next carry_ts.
+def continue_chunk(columns, state, line_offset, carry_ts):
+    df = None
+    if columns is not None:
+        df = pd.DataFrame(columns)
+        if carry_ts is not None:
+            # Rows before the chunk's first timestamp line belong to the previous chunk's last_ts
+            leading = df["Line"] < state["first_ts_line"] if state["first_ts_line"] else slice(None)
+            df.loc[leading, "Timestamp"] = carry_ts
+        df["Line"] += line_offset
+    if state["first_ts_line"] is not None:
+        carry_ts = state["last_ts"]
+    return df, line_offset + state["lines"], carry_ts
+
+
+def _stitch_chunks(chunk_results):
+    frames = []
+    line_offset = 0
+    carry_ts = None
+    skipped_lines = 0
+    for columns, state in chunk_results:
+        df, line_offset, carry_ts = continue_chunk(columns, state, line_offset, carry_ts)
+        skipped_lines += state["skipped_lines"]
+        if df is not None:
+            frames.append(df)
+    df = concat_parsed_frames(frames) if frames else pd.DataFrame()
+    return with_line_stats(df, {"lines": line_offset, "skipped_lines": skipped_lines})
+
+
+# Runs in the worker process
+def parse_chunk_path(path, start, end, filename):
+    state = {}
+    return _chunk_result(parse_log_file(path, filename, start, end, state=state), state)
+
+
+# Runs in the worker process: the whole log is one chunk, decompressed while it is parsed
+def parse_compressed_log(log):
+    state = {}
+    with log.open() as stream:
+        return _chunk_result(parse_log_stream(stream, log.name, state=state), state)
+
+
+# The parse_files_parallel frame of one uploaded file (or CompressedLog), parsed in this process
+def parse_file(f):
+    state = {}
+    if isinstance(f, CompressedLog):
+        with f.open() as stream:
+            df = parse_log_stream(stream, f.name, state=state)
+    else:
+        df = parse_log_bytes(_read_bytes(f), f.name, state=state)
+    return with_line_stats(df, state)
+
+
+# Runs every task (file index, fn, arguments of one chunk) and stitches the chunks of every file in order
+def _run_chunks(tasks, n_files, workers):
+    if len(tasks) <= 1 or workers <= 1:
+        results = [fn(*args) for _, fn, args in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+            futures = [pool.submit(fn, *args) for _, fn, args in tasks]
+            results = [future.result() for future in futures]
+
+    per_file = [[] for _ in range(n_files)]
+    for (file_idx, _, _), result in zip(tasks, results):
+        per_file[file_idx].append(result)
+    return [_stitch_chunks(chunks) for chunks in per_file]
+
+
+# Copies the compressed bytes of an uploaded archive to tmp_dir once, for all of its members
+def _archive_on_disk(log, tmp_dir, copies):
+    if isinstance(log.archive.source, (str, os.PathLike)):
+        return log
+    path = copies.get(id(log.archive))
+    if path is None:
+        path = copies[id(log.archive)] = os.path.join(tmp_dir, str(len(copies)))
+        raw = log.archive.open_raw()
+        with open(path, "wb") as out:
+            shutil.copyfileobj(raw, out)
+    return log.at_path(path)
+
+
+def parse_files_parallel(files, workers, chunk_bytes=CHUNK_BYTES):
+    with tempfile.TemporaryDirectory(prefix="logs_analyzer_") as tmp_dir:
+        tasks = []
+        copies = {}
+        for file_idx, f in enumerate(files):
+            if isinstance(f, CompressedLog):
+                tasks.append((file_idx, parse_compressed_log, (_archive_on_disk(f, tmp_dir, copies),)))
+                continue
+            data = _read_bytes(f)
+            for start, end in split_line_aligned(data, chunk_bytes):
+                tasks.append((file_idx, parse_chunk_bytes, (data[start:end], f.name)))
+        return _run_chunks(tasks, len(files), workers)
+
+
+# paths may also hold the CompressedLogs of data.compressed.expand_compressed
+def parse_paths_parallel(paths, workers, chunk_bytes=CHUNK_BYTES):
+    tasks = []
+    for file_idx, path in enumerate(paths):
+        if isinstance(path, CompressedLog):
+            tasks.append((file_idx, parse_compressed_log, (path,)))
+            continue
+        filename = os.path.basename(path)
+        for start, end in split_file_line_aligned(path, chunk_bytes):
+            tasks.append((file_idx, parse_chunk_path, (path, start, end, filename)))
+    return _run_chunks(tasks, len(paths), workers)
@@ -1,151 +1,202 @@
+import numpy as np
 import pandas as pd
-from datetime import datetime
+from pandas.api.types import union_categoricals
+from data.timestamps import TimestampDecoder, ns_to_datetime
 from utils.regex_patterns import error_regex, exception_regex, timestamp_regex, mxtrace_ts_pattern, apache_ts_pattern
 from utils.regex_patterns import APACHE_ACCESS_LOG_PATTERN, APACHE_SSL_LOG_PATTERN
+from utils.regex_patterns import ERROR_KEYWORDS, EXCEPTION_KEYWORD
 
-def parse_log_lines(lines, filename):
-    results = []
-    last_ts = None
-    last_date = None
-    last_time = None
+# Bump whenever parse_log_lines output changes, so cached parse results are invalidated
+PARSER_VERSION = 3
+# Date and Time are not stored; analysis.errors.with_date_time derives them from Timestamp for display
+PARSED_COLUMNS = ["Line", "Type", "Code", "Message", "Timestamp"]
+# "Source File" and "Template" are added by data.file_cache.assemble_parsed_files
+CATEGORICAL_COLUMNS = ["Type", "Code", "Source File", "Template"]
+NAT_NS = np.iinfo(np.int64).min
 
-    # Use global regex patterns
-    global error_regex, exception_regex, timestamp_regex, mxtrace_ts_pattern, apache_ts_pattern
+
+# Cheap literal check run before error_regex/exception_regex. Non-ASCII lines always go to the full
+# regexes because re.IGNORECASE folds some characters (e.g. "\u017f") that str.lower() does not.
+def _may_match_error(line):
+    if EXCEPTION_KEYWORD in line or not line.isascii():
+        return True
+    lowered = line.lower()
+    for keyword in ERROR_KEYWORDS:
+        if keyword in lowered:
+            return True
+    return False
+
+
+# Returns (Type, Code, Message) for an error/warning/exception line, or None
+def _match_error(line):
+    if (err := error_regex.search(line)):
+        err_type, code, msg = err.groups()
+        return err_type.strip(), code if code else "N/A", msg.strip()
+    if (exc := exception_regex.search(line)):
+        return "Exception", exc.group(1), line.strip()
+    return None
+
+
+def _timestamps_from_ns(ts_ns):
+    return pd.Series(np.array(ts_ns, dtype=np.int64).view("datetime64[ns]"))
+
+
+# The categorical "Source File" column of a parsed frame of n rows
+def source_file_column(name, n):
+    return pd.Categorical.from_codes(np.zeros(n, dtype=np.int8), categories=[name])
+
+
+# Makes every row of Message reference the one str object of its text (rows parsed in other files or
+# processes hold copies of the same texts), so the column's memory scales with the distinct messages.
+# Sets df.attrs["distinct_messages"] and returns the (codes, distinct messages) of pd.factorize. With a pool
+# (a dict of the texts interned so far, data/cache.py keeps one per followed frame) the texts are looked up
+# and added there, so rows appended later share the str objects of the earlier ones.
+def intern_messages(df, pool=None):
+    codes, messages = pd.factorize(df["Message"])
+    if pool is not None:
+        messages = pd.Index([pool.setdefault(message, message) for message in messages], dtype=object)
+    df["Message"] = messages.to_numpy()[codes]
+    df.attrs["distinct_messages"] = len(messages) if pool is None else len(pool)
+    return codes, messages
+
+
+# Concatenates parsed frames and keeps the categorical columns categorical (a plain pd.concat falls
+# back to object dtype when the frames have different categories).
+def concat_parsed_frames(frames):
+    df = pd.concat(frames, ignore_index=True)
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = union_categoricals([f[col] for f in frames], sort_categories=True)
+    return df
+
+
+"""
+parse_log_lines scans stderr.log / mxtrace lines and returns one row per error, warning or exception.
+
+With prefilter=True (the default) every line first goes through cheap literal checks: the timestamp
+regexes only run on lines containing their separator characters, and error_regex/exception_regex only
+run on lines passing _may_match_error. Most lines are rejected after a single pass over the string and
+the output is identical to prefilter=False, which runs all regexes on every line (kept for benchmarks).
+
+Timestamps are decoded by a per-file TimestampDecoder (data/timestamps.py) instead of datetime.strptime.
+
+Matched rows are appended to one list per column and the DataFrame is built from those columns directly.
+Timestamps are collected as int64 nanoseconds (NaT_NS when no timestamp has been seen yet) and viewed as
+datetime64[ns], so no pd.to_datetime pass is needed; Type and Code come out as categoricals and Line as
+int32. The frame holds no per-row Python objects besides Message, and repeated messages go through a
+per-parse pool so that they share one str object (intern_messages does the same across files).
+
+If a state dict is passed, it is filled with the number of lines read ("lines"), the line number of the
+first timestamp update ("first_ts_line", None if there was none) and the final last_ts ("last_ts").
+data/parallel.py uses this to stitch chunks of one file parsed in separate processes.
+"""
+def parse_log_lines(lines, filename, prefilter=True, state=None):
+    line_col = []
+    ts_col = []
+    type_col = []
+    code_col = []
+    msg_col = []
+    messages = {}
+    last_ts_ns = NAT_NS
+    first_ts_line = None
+    i = -1
+    is_mxtrace = filename.startswith("mxtrace")
+    decoder = TimestampDecoder()
 
     for i, line in enumerate(lines):
-        # --- mxtrace ---
-        if filename.startswith("mxtrace"):
-            header_match = mxtrace_ts_pattern.search(line)
-            if header_match:
-                try:
-                    dt_str = header_match.group(1)
-                    # Example: Jun 26 17:11:23 2025 or similar
-                    # But our pattern is ":Jun Thu 26 17:11:23 2025"
-                    # So we need to parse accordingly
-                    # dt_str: 'Jun Thu 26 17:11:23 2025'
-                    # Let's try to parse as "%b %a %d %H:%M:%S %Y" or "%a %b %d %H:%M:%S %Y"
-                    try:
-                        last_ts = datetime.strptime(dt_str, "%a %b %d %H:%M:%S %Y")
-                    except Exception:
-                        last_ts = datetime.strptime(dt_str, "%b %a %d %H:%M:%S %Y")
-                    last_date = last_ts.date()
-                    last_time = last_ts.time()
-                except Exception:
-                    last_ts = None
-                    last_date = None
-                    last_time = None
+        if is_mxtrace:
+            # --- mxtrace ---
+            if (not prefilter or ":" in line) and (header_match := mxtrace_ts_pattern.search(line)):
+                # dt_str: 'Thu Jun 26 17:11:23 2025' or 'Jun Thu 26 17:11:23 2025'
+                # A header that cannot be decoded resets the timestamp
+                ts_ns = decoder.mxtrace(header_match.group(1))
+                last_ts_ns = NAT_NS if ts_ns is None else ts_ns
+                if first_ts_line is None:
+                    first_ts_line = i + 1
                 continue  # Don't process header as error line
+        else:
+            # --- stderr.log and similar ---
+            # Try to extract timestamp from the line
+            ts_ns = None
+            # Try all timestamp patterns
+            if (not prefilter or ("-" in line and ":" in line)) and (m := timestamp_regex.search(line)):
+                ts_ns = decoder.tomcat(m.group(1))
+            elif (not prefilter or "[" in line) and (m := apache_ts_pattern.search(line)):
+                ts_ns = decoder.apache_error(m.group(1))
 
-            # If this is an error/warning line, associate with last_ts
-            if (err := error_regex.search(line)):
-                err_type, code, msg = err.groups()
-                results.append({
-                    "Line": i + 1,
-                    "Timestamp": last_ts,
-                    "Date": last_date,
-                    "Time": last_time,
-                    "Type": err_type.strip(),
-                    "Code": code if code else "N/A",
-                    "Message": msg.strip()
-                })
-            elif (exc := exception_regex.search(line)):
-                exception_name = exc.group(1)
-                results.append({
-                    "Line": i + 1,
-                    "Timestamp": last_ts,
-                    "Date": last_date,
-                    "Time": last_time,
-                    "Type": "Exception",
-                    "Code": exception_name,
-                    "Message": line.strip()
-                })
-            continue
+            # If found, update last_ts
+            if ts_ns is not None:
+                last_ts_ns = ts_ns
+                if first_ts_line is None:
+                    first_ts_line = i + 1
 
-        # --- stderr.log and similar ---
-        # Try to extract timestamp from the line
-        ts = None
-        date = None
-        time_ = None
-        # Try all timestamp patterns
-        if (m := timestamp_regex.search(line)):
-            try:
-                ts = datetime.strptime(m.group(1), "%d-%b-%Y %H:%M:%S.%f")
-                date = ts.date()
-                time_ = ts.time()
-            except Exception:
-                pass
-        elif (m := apache_ts_pattern.search(line)):
-            try:
-                ts = datetime.strptime(m.group(1), "%a %b %d %H:%M:%S.%f %Y")
-                date = ts.date()
-                time_ = ts.time()
-            except Exception:
-                pass
-
-        # If found, update last_ts
-        if ts:
-            last_ts = ts
-            last_date = date
-            last_time = time_
+        if prefilter and not _may_match_error(line):
+            continue
 
         # If this is an error/warning line, associate with last_ts
-        if (err := error_regex.search(line)):
-            err_type, code, msg = err.groups()
-            results.append({
-                "Line": i + 1,
-                "Timestamp": last_ts,
-                "Date": last_date,
-                "Time": last_time,
-                "Type": err_type.strip(),
-                "Code": code if code else "N/A",
-                "Message": msg.strip()
-            })
-        elif (exc := exception_regex.search(line)):
-            exception_name = exc.group(1)
-            results.append({
-                "Line": i + 1,
-                "Timestamp": last_ts,
-                "Date": last_date,
-                "Time": last_time,
-                "Type": "Exception",
-                "Code": exception_name,
-                "Message": line.strip()
-            })
-
-    df = pd.DataFrame(results)
-    if not df.empty and "Timestamp" in df.columns:
-        df["Timestamp"] = pd.to_datetime(df["Timestamp"], errors="coerce")
-        df["Date"] = df["Timestamp"].dt.date
-        df["Time"] = df["Timestamp"].dt.time
-
-    required_columns = ["Line", "Date", "Time", "Type", "Code", "Message", "Timestamp"]
-    df_cols = list(df.columns)
-    if all(col in df_cols for col in required_columns):
-        df = df[required_columns]
+        if (row := _match_error(line)):
+            line_col.append(i + 1)
+            ts_col.append(last_ts_ns)
+            type_col.append(row[0])
+            code_col.append(row[1])
+            msg_col.append(messages.setdefault(row[2], row[2]))
+
+    if state is not None:
+        state["lines"] = i + 1
+        state["first_ts_line"] = first_ts_line
+        state["last_ts"] = None if last_ts_ns == NAT_NS else ns_to_datetime(last_ts_ns)
+
+    return build_parsed_frame(line_col, ts_col, type_col, code_col, msg_col)
+
+
+# The parse_log_lines frame of the collected columns (Timestamp as int64 nanoseconds, NAT_NS for none)
+def build_parsed_frame(line_col, ts_col, type_col, code_col, msg_col):
+    if not line_col:
+        return pd.DataFrame()
+    df = pd.DataFrame({
+        "Line": np.array(line_col, dtype=np.int32),
+        "Type": pd.Categorical(type_col),
+        "Code": pd.Categorical(code_col),
+        "Message": msg_col,
+        "Timestamp": _timestamps_from_ns(ts_col),
+    })
     return df
 
 
-# Parse Apache access and SSL logs
+APACHE_COLUMNS = ["ip", "timestamp", "method", "url", "status", "size", "protocol", "cipher"]
+
+# Parse Apache access and SSL logs into a DataFrame built column by column
 def parse_apache_logs(lines):
-    records = []
+    columns = {col: [] for col in APACHE_COLUMNS}
+    ip, timestamp, method, url = columns["ip"], columns["timestamp"], columns["method"], columns["url"]
+    status, size, protocol, cipher = columns["status"], columns["size"], columns["protocol"], columns["cipher"]
     for line in lines:
         # Try SSL log pattern first
-        m_ssl = APACHE_SSL_LOG_PATTERN.match(line)
-        if m_ssl:
-            d = m_ssl.groupdict()
-            d['status'] = None
-            d['protocol'] = d.pop('tlsver')
-            d['cipher'] = d['cipher']
-            records.append(d)
+        m = APACHE_SSL_LOG_PATTERN.match(line)
+        if m:
+            timestamp.append(m.group("timestamp"))
+            ip.append(m.group("ip"))
+            protocol.append(m.group("tlsver"))
+            cipher.append(m.group("cipher"))
+            method.append(m.group("method"))
+            url.append(m.group("url"))
+            size.append(m.group("size"))
+            status.append(None)
             continue
         # Try access log pattern
-        m_access = APACHE_ACCESS_LOG_PATTERN.match(line)
-        if m_access:
-            d = m_access.groupdict()
-            d['protocol'] = None
-            d['cipher'] = None
-            records.append(d)
-    return records
+        m = APACHE_ACCESS_LOG_PATTERN.match(line)
+        if m:
+            ip.append(m.group("ip"))
+            timestamp.append(m.group("timestamp"))
+            method.append(m.group("method"))
+            url.append(m.group("url"))
+            status.append(m.group("status"))
+            size.append(m.group("size"))
+            protocol.append(None)
+            cipher.append(None)
+    if not ip:
+        return pd.DataFrame()
+    return pd.DataFrame(columns)
 
 
 # Parse OpenJ9 thread dump format
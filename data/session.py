@@ -0,0 +1,133 @@
+import json
+from datetime import timezone
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from data.compressed import log_name
+from data.disk_cache import content_digest
+from data.parser import PARSER_VERSION, APACHE_COLUMNS, PARSED_COLUMNS, intern_messages
+from data.templates import add_file_templates
+
+"""
+Saved analysis sessions: the parsed 3DEXPERIENCE, Apache or thread dump dataset of the dashboard in one
+Parquet or Arrow IPC file (zstd-compressed), which loads back without parsing the logs again.
+
+write_session stores the frame with the schema metadata key METADATA_KEY holding a JSON object:
+  kind            "3dx", "apache" or "threads"
+  session_version SESSION_VERSION, the layout of this file
+  parser_version  data.parser.PARSER_VERSION of the parser that produced the rows
+  sources         [{"name": ..., "blake2b": ...}] of the parsed logs (blake2b is None for followed logs)
+  attrs           the line counts of the frame (see data/mmap_parser.with_line_stats)
+read_session returns the kind, the frame exactly as the dashboard had it (df.attrs["sources"] holds the
+sources) and the metadata. 3DX sessions store PARSED_COLUMNS, "Source File" and "Template" (sessions of
+earlier parser versions get their dtypes and templates on load, and messages are interned again), Apache
+sessions APACHE_COLUMNS. Thread dumps are stored one row per thread ("Source File", "Thread" with the
+thread's lines joined by "\\n"); thread_dump_frame and thread_dumps_from_frame convert from and to the
+[(name, threads)] of the dashboard's thread dump tab.
+"""
+
+SESSION_KINDS = ("3dx", "apache", "threads")
+SESSION_FORMATS = ("parquet", "arrow")
+SESSION_VERSION = 1
+METADATA_KEY = b"logs_analyzer.session"
+COMPRESSION = "zstd"
+_PARQUET_MAGIC = b"PAR1"
+_ARROW_MAGIC = b"ARROW1"
+# df.attrs entries stored in the metadata (sources are stored on their own)
+_STORED_ATTRS = ("lines", "skipped_lines")
+
+
+# [{"name", "blake2b"}] of expanded logs (uploaded files, paths or CompressedLogs)
+def session_sources(logs, digests=True):
+    return [{"name": log_name(log), "blake2b": content_digest(log) if digests else None} for log in logs]
+
+
+def thread_dump_frame(dumps):
+    rows = [(name, "\n".join(thread)) for name, threads in dumps for thread in threads]
+    return pd.DataFrame(rows, columns=["Source File", "Thread"])
+
+
+def thread_dumps_from_frame(df):
+    dumps = {}
+    for name, thread in zip(df["Source File"], df["Thread"]):
+        dumps.setdefault(name, []).append(thread.split("\n"))
+    return list(dumps.items())
+
+
+def _session_table(kind, df):
+    if kind == "3dx" and not df.empty:
+        df = df[PARSED_COLUMNS + ["Source File", "Template"]]
+    elif kind == "apache" and not df.empty:
+        # Without the columns the Apache reports add to the frame they are given (e.g. "hour")
+        df = df[APACHE_COLUMNS]
+    return pa.Table.from_pandas(df, preserve_index=False)
+
+
+def write_session(kind, df, fmt="parquet"):
+    if kind not in SESSION_KINDS:
+        raise ValueError(f"Unknown session kind: {kind}")
+    table = _session_table(kind, df)
+    metadata = {
+        "kind": kind,
+        "session_version": SESSION_VERSION,
+        "parser_version": PARSER_VERSION,
+        "sources": df.attrs.get("sources", []),
+        "attrs": {key: df.attrs[key] for key in _STORED_ATTRS if key in df.attrs},
+    }
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}), METADATA_KEY: json.dumps(metadata)})
+
+    sink = pa.BufferOutputStream()
+    if fmt == "parquet":
+        pq.write_table(table, sink, compression=COMPRESSION)
+    elif fmt == "arrow":
+        options = pa.ipc.IpcWriteOptions(compression=COMPRESSION)
+        with pa.ipc.new_file(sink, table.schema, options=options) as writer:
+            writer.write_table(table)
+    else:
+        raise ValueError(f"Unknown session format: {fmt}")
+    return sink.getvalue().to_pybytes()
+
+
+# The dtypes of data/apache_vectorized.py: Arrow-backed strings and a datetime.timezone (to_pandas gives
+# Python-backed strings and a pytz offset)
+def _apache_frame(table):
+    df = table.to_pandas()
+    strings = [col for col, dtype in df.dtypes.items() if isinstance(dtype, pd.StringDtype)]
+    df[strings] = df[strings].astype(pd.StringDtype("pyarrow"))
+    if "timestamp" in df.columns and getattr(df["timestamp"].dtype, "tz", None) is not None:
+        df["timestamp"] = df["timestamp"].dt.tz_convert(timezone(df["timestamp"].dt.tz.utcoffset(None)))
+    return df
+
+
+# Returns (kind, df, metadata); raises ValueError for anything that is not a saved session
+def read_session(data):
+    if data.startswith(_PARQUET_MAGIC):
+        table = pq.read_table(pa.BufferReader(data))
+    elif data.startswith(_ARROW_MAGIC):
+        table = pa.ipc.open_file(pa.BufferReader(data)).read_all()
+    else:
+        raise ValueError("Not a Parquet or Arrow IPC file")
+    raw = (table.schema.metadata or {}).get(METADATA_KEY)
+    if raw is None:
+        raise ValueError("The file holds no saved logs-analyzer session")
+    metadata = json.loads(raw)
+    if metadata.get("session_version") != SESSION_VERSION or metadata.get("kind") not in SESSION_KINDS:
+        raise ValueError(f"Unsupported session file (version {metadata.get('session_version')})")
+
+    if metadata["kind"] == "apache":
+        df = _apache_frame(table)
+    else:
+        df = table.to_pandas()
+    if metadata["kind"] == "3dx" and not df.empty:
+        df = df.astype({"Line": np.int32, "Source File": "category"})
+        intern_messages(df)
+        if "Template" not in df.columns:
+            add_file_templates(df)
+    elif df.empty:
+        df = pd.DataFrame()
+    df.attrs.update(metadata["attrs"])
+    df.attrs["sources"] = metadata["sources"]
+    return metadata["kind"], df, metadata
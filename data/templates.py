@@ -0,0 +1,207 @@
+import re
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+"""
+Message templates of parsed 3DEXPERIENCE logs (log clustering in the style of Drain, He et al., ICWS 2017).
+
+TemplateMiner.add assigns a message to a cluster of similar messages and returns the cluster's id:
+  1. Variable parts that are easy to recognize (UUIDs, IP addresses, hex values, numbers) are masked with
+     WILDCARD, and the message is split into tokens on whitespace.
+  2. A fixed-depth tree narrows the candidates: messages with a different token count never share a
+     cluster, and the next levels are keyed by the first DEPTH - 2 tokens (tokens containing digits, and
+     any token once a node has MAX_CHILDREN children, go to the WILDCARD child).
+  3. In the leaf, the message joins the cluster whose template has the most equal tokens, if that share
+     reaches SIMILARITY; the positions where they differ become WILDCARD in the template. Otherwise the
+     message starts a new cluster.
+
+add_templates runs the miner over the distinct messages of one parsed file, in order of first appearance
+(a pd.factorize result of its Message column can be passed in instead of factorizing again), and stores the
+result as the categorical "Template" column: its categories are the masked template texts, and clusters
+that end up with the same template text share one category. data/file_cache.py mines every file once, when
+it is parsed, and caches the column with the file's frame; concatenating files (data.parser
+concat_parsed_frames) unions the categories, so the codes of the combined frame are the integer template
+ids the dashboard groups on, shared by the files with the same template text. A message is only compared
+with the messages of its own file, so files can differ in how far they generalize it.
+
+add_file_templates mines a frame of several files file by file (e.g. a session saved before templates).
+TemplateIds does the same for a frame that keeps growing (data/follow.py): add mines only the messages it
+has not seen yet and returns the "Template" column of the appended rows alone, and relabel brings the column
+of the earlier rows up to date. A template seen again can become more general; its category is renamed, so
+the earlier rows keep their codes, unless two templates now share a text (or stop sharing one), which
+recomputes them. The values are those add_templates would give for all the rows added so far, with the
+categories in order of first appearance instead of sorted.
+
+TEMPLATE_VERSION is part of the disk cache keys (data/disk_cache.py); bump it whenever the templates change.
+"""
+
+TEMPLATE_VERSION = 1
+WILDCARD = "<*>"
+DEPTH = 4
+SIMILARITY = 0.4
+MAX_CHILDREN = 100
+
+_MASKS = [
+    re.compile(r"\b[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\b"),
+    re.compile(r"\b\d{1,3}(?:\.\d{1,3}){3}(?::\d+)?\b"),
+    re.compile(r"\b0[xX][0-9a-fA-F]+\b"),
+    re.compile(r"\b(?=[0-9a-fA-F]*\d)(?=[0-9a-fA-F]*[a-fA-F])[0-9a-fA-F]{8,}\b"),
+    re.compile(r"(?<![\w.])[-+]?\d+(?:[.,]\d+)*\b"),
+]
+_HAS_DIGIT = re.compile(r"\d")
+
+
+def mask_message(message):
+    for pattern in _MASKS:
+        message = pattern.sub(WILDCARD, message)
+    return message
+
+
+class TemplateMiner:
+    def __init__(self, depth=DEPTH, similarity=SIMILARITY, max_children=MAX_CHILDREN):
+        self.prefix_tokens = max(depth - 2, 0)
+        self.similarity = similarity
+        self.max_children = max_children
+        self.root = {}
+        # Template tokens of every cluster, indexed by cluster id
+        self.templates = []
+
+    def _leaf(self, tokens):
+        node = self.root.setdefault(len(tokens), {})
+        for token in tokens[:self.prefix_tokens]:
+            if token not in node:
+                if _HAS_DIGIT.search(token) or len(node) >= self.max_children:
+                    token = WILDCARD
+            node = node.setdefault(token, {})
+        # The clusters are kept under a key no token can take
+        return node.setdefault(None, [])
+
+    def _best_cluster(self, clusters, tokens):
+        best, best_score, best_wildcards = None, -1.0, 0
+        for cluster_id in clusters:
+            template = self.templates[cluster_id]
+            same = wildcards = 0
+            for template_token, token in zip(template, tokens):
+                if template_token == WILDCARD:
+                    wildcards += 1
+                elif template_token == token:
+                    same += 1
+            score = same / len(tokens) if tokens else 1.0
+            # Ties go to the more specific template, like Drain
+            if score > best_score or (score == best_score and wildcards < best_wildcards):
+                best, best_score, best_wildcards = cluster_id, score, wildcards
+        return best if best is not None and best_score >= self.similarity else None
+
+    def add(self, message):
+        tokens = mask_message(message).split()
+        clusters = self._leaf(tokens)
+        cluster_id = self._best_cluster(clusters, tokens)
+        if cluster_id is None:
+            cluster_id = len(self.templates)
+            self.templates.append(tokens)
+            clusters.append(cluster_id)
+        else:
+            template = self.templates[cluster_id]
+            for i, (template_token, token) in enumerate(zip(template, tokens)):
+                if template_token != token:
+                    template[i] = WILDCARD
+        return cluster_id
+
+    def template_text(self, cluster_id):
+        return " ".join(self.templates[cluster_id])
+
+
+# The categorical "Template" column of rows assigned to the given clusters of miner
+def template_column(miner, clusters):
+    texts, cluster_codes = np.unique(
+        [miner.template_text(cluster_id) for cluster_id in range(len(miner.templates))], return_inverse=True
+    )
+    return pd.Categorical.from_codes(cluster_codes[clusters], categories=texts)
+
+
+# Adds the categorical "Template" column (see above) to the parsed frame of one file, in place, and returns it
+def add_templates(df, factorized=None):
+    if df.empty:
+        return df
+    message_codes, messages = pd.factorize(df["Message"]) if factorized is None else factorized
+    miner = TemplateMiner()
+    clusters = np.array([miner.add(message) for message in messages], dtype=np.int64)
+    df["Template"] = template_column(miner, clusters[message_codes])
+    return df
+
+
+# add_templates for a frame of several files: the messages of every "Source File" are mined on their own,
+# like data/file_cache.py does before concatenating them
+def add_file_templates(df):
+    if df.empty:
+        return df
+    groups = df.groupby("Source File", observed=True, sort=False).indices
+    columns = [add_templates(df[["Message"]].iloc[rows].copy())["Template"] for rows in groups.values()]
+    templates = union_categoricals(columns, sort_categories=True)
+    codes = np.empty(len(df), dtype=templates.codes.dtype)
+    codes[np.concatenate(list(groups.values()))] = templates.codes
+    df["Template"] = pd.Categorical.from_codes(codes, categories=templates.categories)
+    return df
+
+
+class TemplateIds:
+    def __init__(self):
+        self.miner = TemplateMiner()
+        # Cluster id of every distinct message seen so far, and of the rows of every add
+        self._message_clusters = {}
+        self._clusters = []
+        # Template texts in order of first appearance, and the index into them of every cluster
+        self.categories = []
+        self._cluster_categories = np.empty(0, dtype=np.int64)
+        self._regrouped = False
+
+    # Mines the messages of rows appended to the frame and returns their "Template" column
+    def add(self, messages):
+        codes, distinct = pd.factorize(messages)
+        message_clusters = self._message_clusters
+        for message in distinct:
+            if message not in message_clusters:
+                message_clusters[message] = self.miner.add(message)
+        clusters = np.array([message_clusters[message] for message in distinct], dtype=np.int32)[codes]
+        self._clusters.append(clusters)
+        self._update_categories()
+        return pd.Categorical.from_codes(
+            self._cluster_categories[clusters], categories=self.categories, validate=False
+        )
+
+    # Renames the categories of the clusters whose template became more general and appends the new ones;
+    # the earlier clusters only change category when two of them now share a text (or no longer do)
+    def _update_categories(self):
+        texts = [self.miner.template_text(cluster_id) for cluster_id in range(len(self.miner.templates))]
+        names = [None] * len(self.categories)
+        regrouped = False
+        for cluster_id, category in enumerate(self._cluster_categories):
+            if names[category] is None:
+                names[category] = texts[cluster_id]
+            elif names[category] != texts[cluster_id]:
+                regrouped = True
+        if regrouped or len(set(names)) < len(names):
+            self._regrouped = True
+            names, mapping = [], []
+        else:
+            mapping = list(self._cluster_categories)
+        positions = {name: i for i, name in enumerate(names)}
+        for text in texts[len(mapping):]:
+            if text not in positions:
+                positions[text] = len(names)
+                names.append(text)
+            mapping.append(positions[text])
+        self.categories = names
+        self._cluster_categories = np.array(mapping, dtype=np.int64)
+
+    # The "Template" column returned by earlier adds, under the current categories: the same codes, unless
+    # the clusters were regrouped since, in which case they are recomputed from the rows' cluster ids
+    def relabel(self, column):
+        if self._regrouped:
+            self._regrouped = False
+            codes = self._cluster_categories[np.concatenate(self._clusters)[:len(column)]]
+        else:
+            codes = np.asarray(column.cat.codes)
+        return pd.Categorical.from_codes(codes, categories=self.categories, validate=False)
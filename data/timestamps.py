@@ -0,0 +1,137 @@
+from datetime import datetime, timedelta
+
+"""
+Fast decoding of the timestamps matched by timestamp_regex, mxtrace_ts_pattern and apache_ts_pattern
+(utils/regex_patterns.py), replacing datetime.strptime in parse_log_lines.
+
+The regexes already fix the layout of every match, so a TimestampDecoder slices the fields at known
+positions, looks month and weekday names up in tables and converts to int64 nanoseconds since the epoch.
+Everything up to the minute is decoded once per distinct "minute prefix" and cached; only the seconds and
+the fraction are added per line. A decoder is created per parsed file: for mxtrace headers it remembers
+which of the two layouts ("%a %b ..." or "%b %a ...") matched last and checks that one first.
+
+The result is the same as strptime's in the C locale: names are matched case-insensitively, the weekday is
+only checked to be a weekday name, and impossible dates (31-Apr, 29-Feb of non-leap years, hour 24, second
+60, ...) are rejected. Strings with non-ASCII characters (\\d and \\w in the regexes also match Unicode
+digits and letters) go through strptime itself. Methods return None where strptime would raise.
+"""
+
+TOMCAT_TS_FORMAT = "%d-%b-%Y %H:%M:%S.%f"
+MXTRACE_TS_FORMATS = ("%a %b %d %H:%M:%S %Y", "%b %a %d %H:%M:%S %Y")
+APACHE_ERROR_TS_FORMAT = "%a %b %d %H:%M:%S.%f %Y"
+# Distinct minute prefixes kept per decoder; logs are mostly in time order, so a few are enough
+MAX_CACHED_MINUTES = 4096
+
+_EPOCH = datetime(1970, 1, 1)
+_ONE_MICROSECOND = timedelta(microseconds=1)
+_MONTHS = {name: i for i, name in enumerate(
+    ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"], start=1)}
+_WEEKDAYS = frozenset(["mon", "tue", "wed", "thu", "fri", "sat", "sun"])
+_NS_PER_SECOND = 1_000_000_000
+_MISSING = object()
+
+
+def datetime_to_ns(ts):
+    return (ts - _EPOCH) // _ONE_MICROSECOND * 1000
+
+
+def ns_to_datetime(ns):
+    return _EPOCH + timedelta(microseconds=ns // 1000)
+
+
+def _strptime_ns(value, formats):
+    for fmt in formats:
+        try:
+            return datetime_to_ns(datetime.strptime(value, fmt))
+        except ValueError:
+            continue
+    return None
+
+
+def _minute_ns(year, month, day, hour, minute):
+    # strptime's %d rejects 0 and anything above 31; datetime() rejects the rest
+    if not 1 <= day <= 31 or hour > 23 or minute > 59:
+        return None
+    try:
+        return datetime_to_ns(datetime(year, month, day, hour, minute))
+    except ValueError:
+        return None
+
+
+# Seconds plus a fraction of 1 to 6 digits ("%S.%f"), in nanoseconds
+def _seconds_ns(seconds, fraction):
+    if int(seconds) > 59 or not 1 <= len(fraction) <= 6:
+        return None
+    return int(seconds) * _NS_PER_SECOND + int(fraction.ljust(6, "0")) * 1000
+
+
+class TimestampDecoder:
+    def __init__(self):
+        self._minutes = {}
+        self._mxtrace_weekday_first = True
+
+    def _cached_minute(self, key, decode):
+        minute = self._minutes.get(key, _MISSING)
+        if minute is _MISSING:
+            if len(self._minutes) >= MAX_CACHED_MINUTES:
+                self._minutes.clear()
+            minute = self._minutes[key] = decode()
+        return minute
+
+    # "26-Jun-2025 08:00:00.123" (timestamp_regex)
+    def tomcat(self, value):
+        if not value.isascii():
+            return _strptime_ns(value, (TOMCAT_TS_FORMAT,))
+        minute = self._cached_minute(value[:17], lambda: self._tomcat_minute(value))
+        if minute is None:
+            return None
+        seconds = _seconds_ns(value[18:20], value[21:])
+        return None if seconds is None else minute + seconds
+
+    @staticmethod
+    def _tomcat_minute(value):
+        month = _MONTHS.get(value[3:6].lower())
+        if month is None:
+            return None
+        return _minute_ns(int(value[7:11]), month, int(value[:2]), int(value[12:14]), int(value[15:17]))
+
+    # "Thu Jun 26 17:11:23 2025" or "Jun Thu 26 17:11:23 2025" (mxtrace_ts_pattern)
+    def mxtrace(self, value):
+        if not value.isascii():
+            return _strptime_ns(value, MXTRACE_TS_FORMATS)
+        # Key without the seconds: "Thu Jun 26 17:11 2025"
+        minute = self._cached_minute(value[:-8] + value[-5:], lambda: self._mxtrace_minute(value))
+        if minute is None:
+            return None
+        seconds = int(value[-7:-5])
+        return None if seconds > 59 else minute + seconds * _NS_PER_SECOND
+
+    def _mxtrace_minute(self, value):
+        first, second, day, clock, year = value.split()
+        first, second = first.lower(), second.lower()
+        for weekday_first in (self._mxtrace_weekday_first, not self._mxtrace_weekday_first):
+            weekday, month = (first, second) if weekday_first else (second, first)
+            if weekday in _WEEKDAYS and month in _MONTHS:
+                self._mxtrace_weekday_first = weekday_first
+                return _minute_ns(int(year), _MONTHS[month], int(day), int(clock[:2]), int(clock[3:5]))
+        return None
+
+    # "Thu Jun 26 08:00:00.123456 2025" (apache_ts_pattern, Apache error log lines in stderr.log)
+    def apache_error(self, value):
+        if not value.isascii():
+            return _strptime_ns(value, (APACHE_ERROR_TS_FORMAT,))
+        # Key without the seconds and fraction: "Thu Jun 26 08:00 2025"
+        minute_end = value.rindex(":")
+        minute = self._cached_minute(value[:minute_end] + value[-5:], lambda: self._apache_error_minute(value))
+        if minute is None:
+            return None
+        seconds = _seconds_ns(value[minute_end + 1:minute_end + 3], value[minute_end + 4:-5])
+        return None if seconds is None else minute + seconds
+
+    @staticmethod
+    def _apache_error_minute(value):
+        weekday, month, day, clock, year = value.split()
+        month = _MONTHS.get(month.lower())
+        if weekday.lower() not in _WEEKDAYS or month is None:
+            return None
+        return _minute_ns(int(year), month, int(day), int(clock[:2]), int(clock[3:5]))
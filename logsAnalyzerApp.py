@@ -1,58 +1,129 @@
 # Run your app with - streamlit run C:\Shiv\GitHub\logs-analyzer\logsAnalyzerApp.py
 
 import streamlit as st
-from config.settings import APP_TITLE
+from config.settings import PAGE_CONFIG, PARSE_WORKERS, PARSE_CACHE_DIR, SERVER_LOG_ROOTS
+
 from data.parser import parse_openj9_thread_dump
+from data.compressed import expand_compressed
+from data.ingest import allowed_server_paths
+from data.parser import PARSER_VERSION
+from data.session import session_sources, thread_dump_frame, thread_dumps_from_frame
 from report.threadDump import show_thread_dump_dashboard
 from ui.layout import show_title
-from ui.widgets import file_uploader
-from data.cache import extract_thread_info, get_parsed_df, get_parsed_apache_df
+from ui.widgets import file_uploader, follow_paths_input, server_paths_input, session_uploader
+from data.cache import extract_thread_info, get_parsed_df, get_parsed_apache_df, get_followed_df, get_parsed_paths_df
+from data.cache import get_event_cube, get_time_index, load_session
 
+from analysis.metrics import message_pool_summary, prefilter_summary
 from report.metrics import show_metrics_dashboard
 from report.errors_table import show_all_errors_table
 from report.recurring import show_top_recurring_messages
 from report.type_distribution import show_type_distribution
 from report.timeline import show_timeline_chart
 from report.type_filter import show_type_filter
-from report.export import show_export
+from report.export import show_export, show_session_export
 from report.correlation import show_correlation_matrix
 
 
 from report import apache_reports as reports 
 
+# Must be the first Streamlit command of the script
+st.set_page_config(**PAGE_CONFIG)
 show_title()
 
+
+# The frame of a saved session of the given kind, or None (after showing why) if it cannot be used
+def loaded_session_df(session_file, kind):
+    try:
+        session_kind, df, metadata = load_session(session_file)
+    except ValueError as e:
+        st.error(f"Cannot load session: {e}")
+        return None
+    if session_kind != kind:
+        st.error(f"This session holds {session_kind} data; load it in its own tab.")
+        return None
+    if kind == "3dx" and metadata["parser_version"] != PARSER_VERSION:
+        st.warning("This session was saved by an older parser version; re-parse the logs for up-to-date results.")
+    return df
+
+
+# The paths typed into a server path input, or None (after showing why) if one is outside SERVER_LOG_ROOTS
+def checked_server_paths(paths):
+    try:
+        return allowed_server_paths(paths, SERVER_LOG_ROOTS)
+    except ValueError as e:
+        st.error(f"Cannot read log file: {e}")
+        return None
+
+
 tab1, tab2, tab3 = st.tabs(["3DEXPERIENCE Logs", "Apache Access Logs", "Thread Dump Analysis"])
 with tab1:
     st.markdown("### Server/Mxtrace Logs Analysis")
     st.markdown("Upload your 3DEXPERIENCE log files to analyze errors, warnings, and exceptions.")
     # show_clear_all_files_button() 
     uploaded_files = file_uploader(key="3dx_files")
+    server_paths = server_paths_input(key="3dx_paths")
+    follow_paths = follow_paths_input(key="3dx_follow")
+    session_file = session_uploader(key="3dx_session")
 
+    df = None
     if uploaded_files:
-        df = get_parsed_df(uploaded_files)
+        df = get_parsed_df(uploaded_files, workers=PARSE_WORKERS, cache_dir=PARSE_CACHE_DIR)
+    elif server_paths:
+        if (server_paths := checked_server_paths(server_paths)) is not None:
+            try:
+                df = get_parsed_paths_df(server_paths, workers=PARSE_WORKERS)
+            except OSError as e:
+                st.error(f"Cannot read log file: {e}")
+    elif follow_paths:
+        if (follow_paths := checked_server_paths(follow_paths)) is not None:
+            try:
+                df = get_followed_df(follow_paths, "3dx", key="3dx_followers")
+            except OSError as e:
+                st.error(f"Cannot follow log file: {e}")
+    elif session_file:
+        df = loaded_session_df(session_file, "3dx")
+    if df is not None:
         if df.empty:
             st.warning("No recognizable errors, warnings, or exceptions found in any file.")
         else:
-            st.success(f"✅ Parsed {len(df)} entries from {len(uploaded_files)} file(s).")
-            show_metrics_dashboard(df)
-            selected_file, filtered_df = show_all_errors_table(df)
+            # One source per log read, so an archive counts once per member (see data/compressed.py)
+            st.success(f"✅ Parsed {len(df)} entries from {len(df.attrs['sources'])} file(s).")
+            summaries = [summary for summary in (prefilter_summary(df), message_pool_summary(df)) if summary]
+            if summaries:
+                st.caption(" ".join(summaries))
+            cube = get_event_cube(df)
+            show_metrics_dashboard(cube)
+            selected_file, rows = show_all_errors_table(df)
             show_top_recurring_messages(df, selected_file)
-            show_type_distribution(df)
-            show_timeline_chart(df)
-            show_type_filter(filtered_df)
-            show_export(filtered_df)
-            show_correlation_matrix(df)
+            show_type_distribution(cube)
+            show_timeline_chart(cube)
+            show_type_filter(df, rows)
+            show_export(df, rows)
+            show_session_export("3dx", df, key="3dx_session_export")
+            show_correlation_matrix(df, cube, get_time_index(df))
 
 
 with tab2:
     st.markdown("### Apache SSL/Access Logs Analysis")
     st.markdown("Upload Apache SSL/Access Log Files")
     apache_files = file_uploader(key="apache_files")
+    follow_paths = follow_paths_input(key="apache_follow")
+    session_file = session_uploader(key="apache_session")
 
+    df = None
     if apache_files:
         df = get_parsed_apache_df(apache_files)
         # show_apache_access_log_dashboard(apache_files)
+    elif follow_paths:
+        if (follow_paths := checked_server_paths(follow_paths)) is not None:
+            try:
+                df = get_followed_df(follow_paths, "apache", key="apache_followers")
+            except OSError as e:
+                st.error(f"Cannot follow log file: {e}")
+    elif session_file:
+        df = loaded_session_df(session_file, "apache")
+    if df is not None:
         if df.empty:
             st.warning("No valid Apache access or SSL log entries found.")
         else:
@@ -66,20 +137,39 @@ with tab2:
             reports.show_tls_usage(df)
             reports.show_method_distribution(df)
             reports.show_large_small_responses(df)  # Optional, if implemented        
+            show_session_export("apache", df, key="apache_session_export")
 
 
 with tab3:
     st.markdown("### Thread Dump Analysis")
     st.markdown("Upload Thread Dump Files")
     thread_dump_files = file_uploader(key="thread_dump_files")
+    session_file = session_uploader(key="threads_session")
 
+    # (file name, threads) of every thread dump
+    dumps = None
     if thread_dump_files:
-        for file in thread_dump_files:
+        files = expand_compressed(thread_dump_files)
+        dumps = []
+        for file in files:
             content = file.read().decode("utf-8", errors="ignore")
-            threads = parse_openj9_thread_dump(content)
+            dumps.append((file.name, parse_openj9_thread_dump(content)))
+        sources = session_sources(files)
+    elif session_file:
+        session_df = loaded_session_df(session_file, "threads")
+        if session_df is not None:
+            dumps = thread_dumps_from_frame(session_df)
+            sources = session_df.attrs["sources"]
+
+    if dumps is not None:
+        for name, threads in dumps:
             if not threads:
-                st.warning(f"No valid Dump entries found in {file.name}.")
+                st.warning(f"No valid Dump entries found in {name}.")
             else:
-                st.success(f"Parsed {len(threads)} thread entries from {file.name}.")
+                st.success(f"Parsed {len(threads)} thread entries from {name}.")
                 thread_states, thread_waiting_on, lock_owners, stack_map, full_stack_map = extract_thread_info(threads)
                 show_thread_dump_dashboard(thread_states, thread_waiting_on, lock_owners, stack_map, full_stack_map)
+        if any(threads for _, threads in dumps):
+            dumps_df = thread_dump_frame(dumps)
+            dumps_df.attrs["sources"] = sources
+            show_session_export("threads", dumps_df, key="threads_session_export")
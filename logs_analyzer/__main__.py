@@ -0,0 +1,5 @@
+import sys
+
+from logs_analyzer.cli import main
+
+sys.exit(main())
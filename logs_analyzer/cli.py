@@ -0,0 +1,189 @@
+import argparse
+import glob
+import os
+import sys
+
+"""
+Headless batch analyzer: python -m logs_analyzer PATH_OR_GLOB [...] -o OUT_DIR
+
+Every input is classified by name (--kind auto): *.tdump, javacore* and *threaddump* files are thread dumps,
+names containing "access" or "ssl" are Apache logs, everything else is a 3DEXPERIENCE server/mxtrace log.
+3DEXPERIENCE logs are parsed with parse_paths_parallel (large files are chunked across the worker
+processes); Apache logs and thread dumps are parsed one file per worker process. gzip, bz2, xz, zstd and
+zip inputs are decompressed while they are parsed, and every zip member is classified and parsed as a file of
+its own (see data/compressed.py). The tables of the
+dashboard are written to OUT_DIR as csv, parquet or json:
+  3DEXPERIENCE: metrics, recurring, correlation
+  Apache:       apache_status, apache_top_urls
+  Thread dumps: thread_states, blocked_threads
+
+Nothing here imports Streamlit, and pandas/pyarrow are only imported once the arguments are parsed, so
+"--help" and argument errors return immediately.
+"""
+
+KINDS = ("auto", "3dx", "apache", "threads")
+FORMATS = ("csv", "parquet", "json")
+
+
+def classify(path):
+    name = os.path.basename(path).lower()
+    if name.endswith(".tdump") or name.startswith("javacore") or "threaddump" in name:
+        return "threads"
+    if "access" in name or "ssl" in name:
+        return "apache"
+    return "3dx"
+
+
+def expand_paths(patterns):
+    paths = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern, recursive=True)) if glob.has_magic(pattern) else [pattern]
+        for path in matches:
+            if os.path.isdir(path):
+                paths.extend(sorted(p for p in glob.glob(os.path.join(path, "*")) if os.path.isfile(p)))
+            elif os.path.isfile(path):
+                paths.append(path)
+            else:
+                raise FileNotFoundError(path)
+    # Keep the first occurrence of every file
+    return list(dict.fromkeys(paths))
+
+
+# Runs in the worker process
+def _parse_apache_path(path):
+    from data.apache_vectorized import parse_apache_file
+    from data.compressed import open_log
+    with open_log(path) as f:
+        return parse_apache_file(f)
+
+
+# Runs in the worker process
+def _parse_thread_dump_path(path):
+    from analysis.threads import extract_thread_info
+    from data.compressed import open_log
+    from data.parser import parse_openj9_thread_dump
+    with open_log(path) as f:
+        content = f.read().decode("utf-8", errors="ignore")
+    return extract_thread_info(parse_openj9_thread_dump(content))
+
+
+def _map(fn, paths, workers):
+    if workers <= 1 or len(paths) <= 1:
+        return [fn(path) for path in paths]
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=min(workers, len(paths))) as pool:
+        return list(pool.map(fn, paths))
+
+
+def write_table(df, out_dir, name, fmt):
+    path = os.path.join(out_dir, f"{name}.{fmt}")
+    if fmt == "csv":
+        df.to_csv(path, index=False)
+    elif fmt == "parquet":
+        df.to_parquet(path, index=False)
+    else:
+        df.to_json(path, orient="records", date_format="iso", indent=2)
+    return path
+
+
+def analyze_3dx(paths, workers, top):
+    from analysis.correlation import error_matrix
+    from analysis.cube import build_event_cube
+    from analysis.metrics import error_summary, message_pool_summary, prefilter_summary
+    from analysis.recurring import top_recurring_messages
+    from data.compressed import log_name
+    from data.file_cache import assemble_parsed_files
+    from data.parallel import parse_paths_parallel
+
+    df = assemble_parsed_files([log_name(path) for path in paths], parse_paths_parallel(paths, workers))
+    for summary in (prefilter_summary(df), message_pool_summary(df)):
+        if summary:
+            print(summary, file=sys.stderr)
+    if df.empty:
+        return {}
+    cube = build_event_cube(df)
+    # Source File/Type/Code/Template are categorical; plain strings keep the output files readable by any tool
+    return {
+        "metrics": error_summary(cube),
+        "recurring": top_recurring_messages(df, n=top).astype({"Source File": str, "Type": str, "Code": str, "Template": str}),
+        "correlation": error_matrix(cube).reset_index(),
+    }
+
+
+def analyze_apache(paths, workers, top):
+    from analysis.apache import status_code_counts, top_urls
+    from data.apache_vectorized import combine_apache_frames
+
+    df = combine_apache_frames(_map(_parse_apache_path, paths, workers))
+    if df.empty:
+        return {}
+    return {"apache_status": status_code_counts(df), "apache_top_urls": top_urls(df, n=top)}
+
+
+def analyze_thread_dumps(paths, workers):
+    import pandas as pd
+    from analysis.threads import get_blocked_info, thread_state_counts
+    from data.compressed import log_name
+
+    states, blocked = [], []
+    for path, info in zip(paths, _map(_parse_thread_dump_path, paths, workers)):
+        thread_states, thread_waiting_on, lock_owners, stack_map, _ = info
+        if not thread_states:
+            continue
+        source = log_name(path)
+        states.append(thread_state_counts(thread_states).assign(**{"Source File": source}))
+        blocked_info, _ = get_blocked_info(thread_states, thread_waiting_on, lock_owners, stack_map)
+        blocked.extend(dict(row, **{"Source File": source}) for row in blocked_info)
+    if not states:
+        return {}
+    return {"thread_states": pd.concat(states, ignore_index=True), "blocked_threads": pd.DataFrame(blocked)}
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m logs_analyzer",
+        description="Analyze 3DEXPERIENCE, Apache and thread dump logs without the dashboard.",
+    )
+    parser.add_argument("paths", nargs="+", help="log files, directories or glob patterns")
+    parser.add_argument("-o", "--out", default=".", help="output directory (default: current directory)")
+    parser.add_argument("-f", "--format", choices=FORMATS, default="csv", help="output format (default: csv)")
+    parser.add_argument("-k", "--kind", choices=KINDS, default="auto",
+                        help="treat every input as this kind of log instead of classifying by name")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 1,
+                        help="worker processes (default: number of CPUs)")
+    parser.add_argument("--top", type=int, default=10, help="rows of the recurring/top-URL tables (default: 10)")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        paths = expand_paths(args.paths)
+    except FileNotFoundError as e:
+        parser.error(f"no such file or directory: {e}")
+    if not paths:
+        parser.error("no input files matched")
+
+    from data.compressed import CompressedLog, expand_compressed
+
+    by_kind = {"3dx": [], "apache": [], "threads": []}
+    for path in expand_compressed(paths):
+        name = path.filename if isinstance(path, CompressedLog) else path
+        by_kind[classify(name) if args.kind == "auto" else args.kind].append(path)
+
+    tables = {}
+    if by_kind["3dx"]:
+        tables.update(analyze_3dx(by_kind["3dx"], args.workers, args.top))
+    if by_kind["apache"]:
+        tables.update(analyze_apache(by_kind["apache"], args.workers, args.top))
+    if by_kind["threads"]:
+        tables.update(analyze_thread_dumps(by_kind["threads"], args.workers))
+
+    os.makedirs(args.out, exist_ok=True)
+    for name, df in tables.items():
+        print(write_table(df, args.out, name, args.format))
+    if not tables:
+        print("No recognizable log entries found.", file=sys.stderr)
+        return 1
+    return 0
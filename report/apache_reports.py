@@ -1,7 +1,5 @@
-import pandas as pd
 import streamlit as st
-import altair as alt
-from utils.constants import status_descriptions
+from analysis import apache
 
 """
 The show_request_volume function is designed to visualize the volume of requests over time, grouped by hour. 
@@ -19,9 +17,10 @@ What: Shows how many requests your server received per hour.
 Insight: Helps identify peak usage periods, traffic trends, and potential times of overload or inactivity
 """
 def show_request_volume(df):
+    import altair as alt
     st.markdown("### 📈Shows how many requests the Server received per hour.")
     if df['timestamp'].notnull().any():
-        df['hour'] = df['timestamp'].dt.strftime('%Y-%m-%d %H:00')
+        df['hour'] = apache.request_hours(df)
         chart = alt.Chart(df).mark_bar().encode(
             x=alt.X('hour:N', title='Hour'),
             y=alt.Y('count()', title='Request Count'),
@@ -41,10 +40,7 @@ Insight: Reveals the proportion of successful requests vs. errors. A high number
 def show_status_code_distribution(df):
     st.markdown("### 🛑  Frequency of each HTTP Status Code")
 
-    status_counts = df['status'].dropna().astype(int).value_counts().reset_index()
-    status_counts.columns = ['Status', 'Count']
-    status_counts['Status Description'] = status_counts['Status'].map(status_descriptions).fillna("Unknown")
-    status_counts = status_counts[['Status', 'Status Description', 'Count']]
+    status_counts = apache.status_code_counts(df)
     if not status_counts.empty:
         st.dataframe(status_counts)
 
@@ -64,10 +60,10 @@ What: Table and bar chart of the most frequently accessed endpoints.
 Insight: Identifies your most popular resources/APIs and can highlight hot spots or potential abuse.
 """
 def show_top_urls(df):
+    import altair as alt
     st.markdown("### 🔥 Top 10 Requested URLs")
     if 'url' in df.columns:
-        url_counts = df['url'].value_counts().head(10).reset_index()
-        url_counts.columns = ['URL', 'Count']
+        url_counts = apache.top_urls(df)
         st.dataframe(url_counts)
         bar = alt.Chart(url_counts).mark_bar().encode(
             x=alt.X('Count:Q'),
@@ -107,18 +103,11 @@ Insight: Shows your most active clients, possible bots, or sources of suspicious
 @st.cache_data(show_spinner=False)
 def get_top_ip_requests_map(df, top_n=10):
     # Precompute and cache all requests for the top N IPs
-    ip_counts = df['ip'].value_counts().head(top_n).index.tolist()
-    ip_requests_map = {}
-    for ip in ip_counts:
-        ip_df = df[df['ip'] == ip][['timestamp', 'url']].sort_values('timestamp')
-        ip_df = ip_df.rename(columns={'timestamp': 'Time', 'url': 'URL'})
-        ip_requests_map[ip] = ip_df
-    return ip_requests_map
+    return apache.top_ip_requests_map(df, top_n)
 
 def show_top_ips_with_details(df):
     st.markdown("### 🌐 IP addresses making the most Requests (click IP for details)")
-    ip_counts = df['ip'].value_counts().head(10).reset_index()
-    ip_counts.columns = ['IP', 'Count']
+    ip_counts = apache.top_ips(df)
 
     ip_requests_map = get_top_ip_requests_map(df, top_n=10)
 
@@ -155,9 +144,10 @@ What: Table and bar chart of TLS versions and cipher suites used.
 Insight: Ensures secure protocols are being used and helps detect outdated or insecure connections.
 """
 def show_tls_usage(df):
+    import altair as alt
     if 'protocol' in df.columns and df['protocol'].notnull().any():
         st.markdown("### 🔐 TLS Version & Cipher Suite Usage")
-        tls_counts = df.groupby(['protocol', 'cipher']).size().reset_index(name='Count')
+        tls_counts = apache.tls_usage(df)
         st.dataframe(tls_counts)
         bar = alt.Chart(tls_counts).mark_bar().encode(
             x=alt.X('Count:Q'),
@@ -174,9 +164,9 @@ What: Pie chart and table of HTTP methods (GET, POST, etc.).
 Insight: Shows the usage pattern of your API (read vs. write operations) and can help spot unusual method usage.
 """
 def show_method_distribution(df):
+    import altair as alt
     st.markdown("### 🗂 Method Distribution")
-    method_counts = df['method'].value_counts().reset_index()
-    method_counts.columns = ['Method', 'Count']
+    method_counts = apache.method_counts(df)
     st.dataframe(method_counts)
     pie = alt.Chart(method_counts).mark_arc().encode(
         theta=alt.Theta(field="Count", type="quantitative"),
@@ -196,32 +186,10 @@ empty/small responses (potential errors or misconfigurations).
 def show_large_small_responses(df):
     st.markdown("### 📦 Large/Small Response Sizes (KB)")
     st.write("**All sizes are in kilobytes (KB).**")
-    columns = ['url', 'size']
-    # Add more columns if they exist
-    for col in ['filename', 'ip', 'timestamp', 'method', 'status', 'user_agent', 'referer', 'response_time']:
-        if col in df.columns:
-            columns.insert(0 if col == 'filename' else len(columns), col)
-    # Convert size to KB for display (rounded to 2 decimals)
-    df = df.copy()
-    df['size_kb'] = (df['size'] / 1024).round(2)
-    columns_display = [col if col != 'size' else 'size_kb' for col in columns]
+    largest, smallest = apache.largest_smallest_responses(df)
     st.markdown("#### Top 20 Largest Responses")
-    largest = df[columns_display].sort_values('size_kb', ascending=False).head(20).reset_index().rename(
-        columns={
-            'index': 'Row', 'url': 'URL', 'size_kb': 'Size (KB)', 'ip': 'IP', 'timestamp': 'Timestamp',
-            'method': 'Method', 'status': 'Status', 'filename': 'Filename',
-            'user_agent': 'User Agent', 'referer': 'Referer', 'response_time': 'Response Time'
-        }
-    )
     st.dataframe(largest, use_container_width=True)
     st.markdown("#### Top 10 Smallest Responses")
-    smallest = df[columns_display].sort_values('size_kb', ascending=True).head(10).reset_index().rename(
-        columns={
-            'index': 'Row', 'url': 'URL', 'size_kb': 'Size (KB)', 'ip': 'IP', 'timestamp': 'Timestamp',
-            'method': 'Method', 'status': 'Status', 'filename': 'Filename',
-            'user_agent': 'User Agent', 'referer': 'Referer', 'response_time': 'Response Time'
-        }
-    )
     st.dataframe(smallest, use_container_width=True)
 
 """
@@ -237,17 +205,11 @@ What: Line chart of request trends for the top 5 URLs.
 Insight: Understand the usage pattern of your top resources over time. Spot trends, peaks, and potential issues.
 """
 def show_top_urls_over_time(df):
+    import altair as alt
     st.markdown("### 📈 Top 5 URLs Over Time")
     if 'url' in df.columns and 'timestamp' in df.columns:
-        # Ensure timestamp is datetime
-        df = df[df['timestamp'].notnull()].copy()
-        df['timestamp'] = pd.to_datetime(df['timestamp'], errors='coerce')
-        # Find top 5 URLs overall
-        top_urls = df['url'].value_counts().head(5).index.tolist()
-        df_top = df[df['url'].isin(top_urls)].copy()
-        # Group by hour and url
-        df_top['hour'] = df_top['timestamp'].dt.strftime('%Y-%m-%d %H:00')
-        url_time_counts = df_top.groupby(['hour', 'url']).size().reset_index(name='Count')
+        # Hourly counts of the top 5 URLs overall
+        url_time_counts = apache.hourly_counts_for_top(df, 'url', 5)
         # Line chart
         chart = alt.Chart(url_time_counts).mark_line(point=True).encode(
             x=alt.X('hour:N', title='Hour', sort='ascending'),
@@ -272,17 +234,11 @@ What: Line chart of request trends for the top 6 IPs.
 Insight: Understand the usage pattern of your top clients over time. Spot trends, peaks, and potential issues.
 """
 def show_top_ips_over_time(df):
+    import altair as alt
     st.markdown("### 📈 Top 6 IPs Over Time")
     if 'ip' in df.columns and 'timestamp' in df.columns:
-        # Ensure timestamp is datetime
-        df = df[df['timestamp'].notnull()].copy()
-        df['timestamp'] = pd.to_datetime(df['timestamp'], errors='coerce')
-        # Find top 6 IPs overall
-        top_ips = df['ip'].value_counts().head(6).index.tolist()
-        df_top = df[df['ip'].isin(top_ips)].copy()
-        # Group by hour and ip
-        df_top['hour'] = df_top['timestamp'].dt.strftime('%Y-%m-%d %H:00')
-        ip_time_counts = df_top.groupby(['hour', 'ip']).size().reset_index(name='Count')
+        # Hourly counts of the top 6 IPs overall
+        ip_time_counts = apache.hourly_counts_for_top(df, 'ip', 6)
         # Line chart
         chart = alt.Chart(ip_time_counts).mark_line(point=True).encode(
             x=alt.X('hour:N', title='Hour', sort='ascending'),
@@ -1,39 +1,15 @@
 import streamlit as st
+import html
+import numpy as np
 import os
 import re
-
-def get_time_options(df, selected_file, selected_date):
-    times = (
-        df[
-            (df["Source File"] == selected_file) & (df["Date"].astype(str) == selected_date)
-        ]["Time"]
-        .astype(str)
-        .apply(lambda t: t[:5] if t not in ["NaT", "None", ""] else None)
-        .dropna()
-        .unique()
-    )
-    return sorted([t for t in times if t and t != "NaT" and t != "None"])
-
-def filter_df_by_range(df, selected_date, selected_times):
-    def time_hhmm(t):
-        t = str(t)
-        return t[:5] if t not in ["NaT", "None", ""] else None
-    return df[
-        (df["Date"].astype(str) == selected_date)
-        & (df["Time"].apply(time_hhmm).isin(selected_times))
-    ]
-
-def build_error_matrix(filtered, all_error_types, all_files):
-    matrix = (
-        filtered.groupby(["Type", "Source File"])
-        .size()
-        .unstack(fill_value=0)
-        .reindex(index=all_error_types, columns=all_files, fill_value=0)
-        .reset_index()
-    )
-    matrix = matrix.set_index("Type")
-    matrix = matrix.reindex(sorted(matrix.index), fill_value=0)
-    return matrix
+from analysis.correlation import (
+    MATRIX_BY, get_date_options, get_time_options, time_range, filter_df_by_range, matrix_rows, build_error_matrix
+)
+from analysis.cube import without_warnings
+from analysis.errors import with_date_time
+from data.cache import get_detail_cube
+from report.paging import show_paged_table
 
 def _short_file_display_name(filename):
     # Remove extension
@@ -45,16 +21,22 @@ def _short_file_display_name(filename):
     name = re.sub(r'[_\-\.]+$', '', name)
     return name
 
-def render_matrix_with_links(matrix, all_files, start_time, end_time, selected_date):
+_ROW_NAMES = {"Type": "Error Type", "Template": "Message Template"}
+
+# Templates hold "<*>": escape it for the HTML cells and keep markdown from reading "*" as emphasis
+def _row_label(value):
+    return html.escape(str(value)).replace("*", "&#42;")
+
+def render_matrix_with_links(matrix, all_files, start_time, end_time, selected_date, by="Type"):
     st.write(
-        "<b>Rows:</b> Error Type &nbsp;&nbsp; <b>Columns:</b> All loaded files<br>"
-        "<b>Values:</b> Total errors for each type in each file (in selected date/time range)",
+        f"<b>Rows:</b> {_ROW_NAMES[by]} &nbsp;&nbsp; <b>Columns:</b> All loaded files<br>"
+        f"<b>Values:</b> Total errors for each {_ROW_NAMES[by].lower()} in each file (in selected date/time range)",
         unsafe_allow_html=True
     )
 
     # Render header row with file names (shortened)
     header_cols = st.columns([2] + [1]*len(all_files))
-    header_cols[0].markdown("<div style='font-size:13px; font-weight:bold; color:#666;'>Error Type</div>", unsafe_allow_html=True)
+    header_cols[0].markdown(f"<div style='font-size:13px; font-weight:bold; color:#666;'>{_ROW_NAMES[by]}</div>", unsafe_allow_html=True)
     for idx, file in enumerate(all_files):
         short_name = _short_file_display_name(file)
         header_cols[idx+1].markdown(
@@ -65,57 +47,51 @@ def render_matrix_with_links(matrix, all_files, start_time, end_time, selected_d
     # Render matrix rows (unchanged)
     for error_type in matrix.index:
         cols = st.columns([2] + [1]*len(all_files))
-        cols[0].markdown(f"<div style='font-size:13px; font-weight:bold'>{error_type}</div>", unsafe_allow_html=True)
+        cols[0].markdown(f"<div style='font-size:13px; font-weight:bold'>{_row_label(error_type)}</div>", unsafe_allow_html=True)
         for idx, file in enumerate(all_files):
             count = matrix.loc[error_type, file]
-            btn_key = f"show_{file}_{error_type}_{start_time}_{end_time}_{selected_date}"
+            btn_key = f"show_{file}_{by}_{error_type}_{start_time}_{end_time}_{selected_date}"
             if count > 0:
                 if cols[idx+1].button(f"{count}", key=btn_key, help=f"Show details for {error_type} in {file}", type="primary"):
-                    st.session_state["show_details"] = (file, error_type, selected_date, start_time, end_time)
+                    st.session_state["show_details"] = (file, by, error_type, selected_date, start_time, end_time)
             else:
                 cols[idx+1].markdown("<div style='color:#888; font-size:15px;'>0</div>", unsafe_allow_html=True)
 
-def show_error_details_table(df, file, error_type, selected_date, selected_times):
-    st.markdown(f"### Details for **{error_type}** in **{file}** ({selected_date} {selected_times[0]} - {selected_times[-1]})")
-    def time_hhmm(t):
-        t = str(t)
-        return t[:5] if t not in ["NaT", "None", ""] else None
-    filtered = df[
-        (df["Source File"] == file)
-        & (df["Type"] == error_type)
-        & (df["Date"].astype(str) == selected_date)
-        & (df["Time"].apply(time_hhmm).isin(selected_times))
-    ]
+def show_error_details_table(df, time_index, file, error_type, selected_date, start_time, end_time, by="Type"):
+    st.markdown(f"### Details for **{_row_label(error_type)}** in **{file}** ({selected_date} {start_time} - {end_time})")
+    in_range = df.iloc[time_index.rows(file, *time_range(selected_date, start_time, end_time))]
+    filtered = in_range[in_range[by] == error_type]
     if filtered.empty:
         st.info("No errors found for this selection.")
         return
-    st.dataframe(
-        filtered[
-            ["Source File", "Line", "Date", "Time", "Type", "Code", "Message", "Timestamp"]
-        ],
-        use_container_width=True
+    show_paged_table(
+        filtered, np.arange(len(filtered)),
+        ["Source File", "Line", "Date", "Time", "Type", "Code", "Message", "Timestamp"],
+        key="corr_details",
+        frame=lambda page_rows: with_date_time(filtered.iloc[page_rows])
     )
 
-def show_correlation_matrix(df):
+# The matrix is counted from the event cube (from the detail cube of df when its rows are templates);
+# time_index (built on df) picks the entries of the details table
+def show_correlation_matrix(df, cube, time_index):
     st.subheader("🔗 Error Correlation Matrix by File and Time Range")
-    df = df[df["Type"].str.lower() != "warning"]
+    cube = without_warnings(cube)
 
     col1, col2, col3, col4 = st.columns(4)
     with col1:
         selected_file = st.selectbox(
             "Select Reference File",
-            options=sorted(df["Source File"].unique()),
+            options=sorted(cube["Source File"].unique()),
             key="corr_file"
         )
     with col2:
-        dates_for_file = df[df["Source File"] == selected_file]["Date"].dropna().astype(str).unique()
         selected_date = st.selectbox(
             "Select Reference Date",
-            options=sorted(dates_for_file),
+            options=get_date_options(time_index, selected_file),
             key="corr_date"
         )
 
-    times_for_file_date = get_time_options(df, selected_file, selected_date)
+    times_for_file_date = get_time_options(time_index, selected_file, selected_date)
     with col3:
         start_time = st.selectbox(
             "Start Time (hh:mm)",
@@ -133,30 +109,36 @@ def show_correlation_matrix(df):
         st.info("No valid times available for the selected file and date.")
         return
 
-    start_idx = times_for_file_date.index(start_time)
-    end_idx = times_for_file_date.index(end_time)
-    if start_idx > end_idx:
+    if start_time > end_time:
         st.warning("Start Time must be before or equal to End Time.")
         return
-    selected_times = times_for_file_date[start_idx:end_idx + 1]
 
-    filtered = filter_df_by_range(df, selected_date, selected_times)
+    selected_range = time_range(selected_date, start_time, end_time)
+    filtered = filter_df_by_range(cube, *selected_range)
     if filtered.empty:
         st.info("No errors found for the selected date and time range.")
         return
 
-    all_error_types = sorted(df["Type"].unique())
-    all_files = sorted(df["Source File"].unique())
-    matrix = build_error_matrix(filtered, all_error_types, all_files)
-
-    render_matrix_with_links(matrix, all_files, start_time, end_time, selected_date)
-
-    # Show details if a button was clicked
+    by = st.radio(
+        "Rows",
+        options=list(MATRIX_BY),
+        format_func=lambda value: _ROW_NAMES[value],
+        horizontal=True,
+        key="corr_rows"
+    ) if "Template" in df.columns else "Type"
+    if by == "Template":
+        cube = without_warnings(get_detail_cube(df))
+        filtered = filter_df_by_range(cube, *selected_range)
+    all_error_types = matrix_rows(cube, filtered, by)
+    all_files = sorted(cube["Source File"].unique())
+    matrix = build_error_matrix(filtered, all_error_types, all_files, by)
+
+    render_matrix_with_links(matrix, all_files, start_time, end_time, selected_date, by)
+
+    # Show details if a button was clicked; they stay (e.g. while paging) until the range changes
     if "show_details" in st.session_state:
-        file, error_type, selected_date, start_time, end_time = st.session_state["show_details"]
-        selected_times = times_for_file_date[
-            times_for_file_date.index(start_time):times_for_file_date.index(end_time)+1
-        ]
-        show_error_details_table(df, file, error_type, selected_date, selected_times)
-        # Optionally clear after showing
-        del st.session_state["show_details"]
\ No newline at end of file
+        file, by, error_type, details_date, details_start, details_end = st.session_state["show_details"]
+        if (details_date, details_start, details_end) == (selected_date, start_time, end_time):
+            show_error_details_table(df, time_index, file, error_type, selected_date, start_time, end_time, by)
+        else:
+            del st.session_state["show_details"]
\ No newline at end of file
@@ -1,7 +1,14 @@
+import numpy as np
 import streamlit as st
-import pandas as pd
+from data.cache import get_entry_index, get_filtered_rows, get_message_index, get_search_rows, get_sort_keys
+from report.paging import show_paged_table
 
+COLUMNS = ["Source File", "Line", "Date", "Time", "Type", "Code", "Message", "Timestamp"]
+
+# The filters run on the cached EntryIndex of df (see analysis/errors.py) instead of masks over the frame,
+# the message search on its MessageIndex (see analysis/search.py)
 def show_all_errors_table(df):
+    entry_index = get_entry_index(df)
     st.subheader("🗂️ All Errors")
 
     # Checkbox to show/hide warnings
@@ -11,14 +18,14 @@ def show_all_errors_table(df):
     with col1:
         selected_file = st.selectbox(
             "Source File",
-            options=["ALL"] + sorted(df["Source File"].unique()),
+            options=["ALL"] + entry_index.files,
             index=0,
             key="all_errors_file"
         )
     with col2:
         selected_date = st.selectbox(
             "Date",
-            options=["ALL"] + sorted(df["Date"].dropna().unique()),
+            options=["ALL"] + entry_index.dates,
             index=0,
             key="all_errors_date"
         )
@@ -27,40 +34,29 @@ def show_all_errors_table(df):
     with col4:
         selected_type = st.selectbox(
             "Type",
-            options=["ALL"] + sorted(df["Type"].unique()),
+            options=["ALL"] + entry_index.types,
             index=0,
             key="all_errors_type"
         )
 
-    filtered_df = df.copy()
-
-    # Only show warnings if checkbox is ticked
-    if not show_warnings:
-        filtered_df = filtered_df[filtered_df["Type"].str.lower() != "warning"]
-
-    if selected_file != "ALL":
-        filtered_df = filtered_df[filtered_df["Source File"] == selected_file]
-    if selected_date != "ALL":
-        filtered_df = filtered_df[filtered_df["Date"] == selected_date]
-    if manual_time.strip():
-        # Allow filtering by hh:mm or hh:mm:ss
-        filtered_df = filtered_df[
-            filtered_df["Time"].astype(str).str.startswith(manual_time.strip())
-        ]
-    if selected_type != "ALL":
-        filtered_df = filtered_df[filtered_df["Type"] == selected_type]
+    search = st.text_input(
+        "Search messages",
+        value="",
+        key="all_errors_search",
+        help='Words must all appear in the message (any case); word* matches a prefix, "quoted words" a phrase.'
+    )
 
-    # Format Time column as string (hh:mm:ss) for display
-    if not filtered_df.empty and "Time" in filtered_df.columns:
-        filtered_df["Time"] = filtered_df["Time"].apply(
-            lambda t: t.strftime("%H:%M:%S") if pd.notnull(t) and t is not None else ""
-        )
+    rows = get_filtered_rows(df, entry_index, (selected_file, selected_type, selected_date, manual_time, show_warnings))
+    matches = get_search_rows(df, get_message_index(df), search.strip())
+    if matches is not None:
+        rows = np.intersect1d(rows, matches, assume_unique=True)
 
-    st.dataframe(
-        filtered_df[
-            ["Source File", "Line", "Date", "Time", "Type", "Code", "Message", "Timestamp"]
-        ],
-        use_container_width=True
+    # Only the visible page goes to the browser; it is sorted on the cached keys of the whole frame
+    show_paged_table(
+        df, rows, COLUMNS, key="all_errors",
+        frame=lambda page_rows: entry_index.frame(df, page_rows),
+        keys=lambda column: get_sort_keys(df, column)
     )
-    # Return the selected file for use in Top Recurring Messages
-    return selected_file, filtered_df
\ No newline at end of file
+    # Return the selected file for use in Top Recurring Messages, and the row ids (positions into df) of
+    # the filtered entries for the type filter and the export, which only take the rows they need
+    return selected_file, rows
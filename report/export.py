@@ -1,6 +1,48 @@
 import streamlit as st
+from data.cache import get_entry_index, get_export_key, get_session_key
+from data.csv_export import csv_export_file
+from data.session import SESSION_FORMATS, write_session
 
-def show_export(filtered_df):
+SESSION_MIME_TYPES = {"parquet": "application/vnd.apache.parquet", "arrow": "application/vnd.apache.arrow.file"}
+
+# The CSV is written in row batches (data/csv_export.py), each built by EntryIndex.frame from its slice of rows
+# rather than from one frame of them all, and only when "Prepare CSV" is clicked; the prepared file is kept in
+# the session for as long as its dataset, rows (the row ids of df selected in "All Errors") and compression
+# stay the same, so reruns don't rebuild it
+def show_export(df, rows):
     st.subheader("📥 Export")
-    csv = filtered_df.to_csv(index=False)
-    st.download_button("Download CSV", data=csv, file_name="log_summary.csv", mime="text/csv")
\ No newline at end of file
+    compress = st.checkbox("Compress (gzip)", value=False, key="export_gzip")
+    export_key = get_export_key(df, rows, compress)
+    prepared = st.session_state.get("export_csv")
+    if prepared is None or prepared[0] != export_key:
+        if not st.button(f"Prepare CSV ({len(rows):,} rows)", key="export_prepare"):
+            return
+        with st.spinner("Writing CSV..."):
+            prepared = export_key, csv_export_file(df, rows, compress, frame=get_entry_index(df).frame)
+        st.session_state["export_csv"] = prepared
+    csv_file = prepared[1]
+    if compress:
+        st.download_button("Download CSV", data=csv_file, file_name="log_summary.csv.gz", mime="application/gzip")
+    else:
+        st.download_button("Download CSV", data=csv_file, file_name="log_summary.csv", mime="text/csv")
+
+# Download of the whole parsed dataset, which "Load a saved session" (ui/widgets.py) opens without parsing;
+# like the CSV, the file is written only when "Prepare session" is clicked and kept while its key is unchanged
+def show_session_export(kind, df, key):
+    st.subheader("💾 Save session")
+    fmt = st.radio("Format", SESSION_FORMATS, format_func=str.capitalize, horizontal=True, key=f"{key}_format")
+    session_key = get_session_key(kind, df, fmt)
+    prepared = st.session_state.get(f"{key}_file")
+    if prepared is None or prepared[0] != session_key:
+        if not st.button(f"Prepare {fmt.capitalize()} session", key=f"{key}_prepare"):
+            return
+        with st.spinner("Writing session..."):
+            prepared = session_key, write_session(kind, df, fmt)
+        st.session_state[f"{key}_file"] = prepared
+    st.download_button(
+        f"Download {fmt.capitalize()} session",
+        data=prepared[1],
+        file_name=f"logs_session_{kind}.{fmt}",
+        mime=SESSION_MIME_TYPES[fmt],
+        key=f"{key}_download",
+    )
@@ -1,5 +1,5 @@
 import streamlit as st
-import re
+from analysis.metrics import error_summary
 
 
 # def show_metrics_dashboard(df):
@@ -24,28 +24,9 @@ import re
 #             st.write(f"**Total:** {total_counts.get(row['Source File'], 0)}")    
 
 
-def show_metrics_dashboard(df):
+def show_metrics_dashboard(cube):
     st.subheader("📊 Metrics Dashboard")
-    # Clean file names: remove extension and date
-    def clean_filename(fname):
-        # Remove extension
-        fname = re.sub(r'\.[^.]+$', '', fname)
-        # Remove date patterns like 2025-07-01 or 20250701 or similar
-        fname = re.sub(r'[-_.]?\d{4}[-_.]?\d{2}[-_.]?\d{2}', '', fname)
-        return fname
-
-    df = df.copy()
-    df["Source File"] = df["Source File"].apply(clean_filename)
-
-    summary = (
-        df.groupby(["Type", "Source File"])
-        .size()
-        .unstack(fill_value=0)
-        .sort_index()
-    )
-    # Add a "Total" row at the bottom for each file
-    summary.loc["Total"] = summary.sum(axis=0)
-    summary = summary.reset_index().rename(columns={"Type": "Error Type"})
+    summary = error_summary(cube)
 
     # Highlight the "Total" row with a background color
     def highlight_total_row(row):
@@ -0,0 +1,36 @@
+import numpy as np
+import streamlit as st
+from analysis.paging import PAGE_SIZES, page_bounds, sort_keys, sort_rows
+
+LOG_ORDER = "Log order"
+
+# Sorts rows (positions into df) server-side and sends only the visible page to the browser, whatever the
+# number of rows. frame(page_rows) builds the frame of a page (df.iloc by default) and keys(column) the
+# sort_keys of a column of df (computed on the fly by default; pass cached ones for large frames).
+def show_paged_table(df, rows, columns, key, frame=None, keys=None):
+    rows = np.asarray(rows)
+    n_rows = len(rows)
+    sortable = [col for col in columns if col not in ("Date", "Time")]
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        sort_by = st.selectbox("Sort by", options=[LOG_ORDER] + sortable, key=f"{key}_sort")
+    with col2:
+        descending = st.radio("Order", options=["Ascending", "Descending"], horizontal=True, key=f"{key}_order") == "Descending"
+    with col3:
+        page_size = st.selectbox("Rows per page", options=PAGE_SIZES, index=1, key=f"{key}_page_size")
+    _, _, _, n_pages = page_bounds(n_rows, 1, page_size)
+    # The page may not exist any more after a filter or page size change
+    page_key = f"{key}_page"
+    st.session_state[page_key] = min(st.session_state.get(page_key, 1), n_pages)
+    with col4:
+        page = st.number_input("Page", min_value=1, max_value=n_pages, step=1, key=page_key)
+
+    if sort_by != LOG_ORDER:
+        rows = sort_rows(rows, keys(sort_by) if keys else sort_keys(df[sort_by]), ascending=not descending)
+    start, end, page, n_pages = page_bounds(n_rows, page, page_size)
+    page_rows = rows[start:end]
+    shown = frame(page_rows) if frame else df.iloc[page_rows]
+    st.dataframe(shown[columns], use_container_width=True)
+    if n_rows:
+        st.caption(f"Rows {start + 1:,}–{end:,} of {n_rows:,} (page {page:,} of {n_pages:,})")
@@ -1,26 +1,9 @@
-from collections import defaultdict
 import streamlit as st
-import plotly.express as px
 import pandas as pd
 from data import cache
-
-def get_blocked_info(thread_states, thread_waiting_on, lock_owners, stack_map):
-    blocked_info = []
-    method_counts = defaultdict(int)
-    for thread_name, lock in thread_waiting_on.items():
-        if thread_states.get(thread_name) == "BLOCKED":
-            blocking_thread = lock_owners.get(lock, "Unknown")
-            blocked_stack = stack_map.get(thread_name, "N/A")
-            blocking_stack = stack_map.get(blocking_thread, "N/A")
-            blocked_info.append({
-                "Blocked Thread": thread_name,
-                "Waiting on Lock": lock,
-                "Blocked Stack": blocked_stack,
-                "Blocking Thread": blocking_thread,
-                "Blocking Stack": blocking_stack
-            })
-            method_counts[blocked_stack] += 1
-    return blocked_info, method_counts
+from analysis.threads import (
+    get_blocked_info, find_deadlock, hotspot_methods, threads_with_method, thread_state_counts, thread_group_counts
+)
 
 def show_blocking_relationships_table(blocked_info):
     st.subheader("Blocking Relationships Table")
@@ -37,7 +20,7 @@ def show_automated_observations(blocked_info):
 
 def show_hotspot_methods(method_counts):
     st.subheader("\U0001F525 Top Hotspot Methods")
-    hotspot_table = sorted(method_counts.items(), key=lambda x: x[1], reverse=True)
+    hotspot_table = hotspot_methods(method_counts)
     for method, count in hotspot_table[:5]:
         st.write(f"{method} - {count} BLOCKED threads")
     return hotspot_table
@@ -45,6 +28,8 @@ def show_hotspot_methods(method_counts):
 def show_blocking_relationship_graph(blocked_info):
     st.subheader("\U0001F4CA Blocking Relationship Graph")
     if blocked_info:
+        # plotly is only needed here, so it is not imported until a dump with blocked threads is shown
+        import plotly.express as px
         df_graph = pd.DataFrame(blocked_info)
         fig = px.sunburst(
             df_graph,
@@ -73,17 +58,7 @@ def show_blocking_method_deep_dive(hotspot_table, full_stack_map, thread_states)
         st.info("No valid methods found for deep dive.")
         return
     method_filter = st.selectbox("Select a method to drill down", method_options)
-    matching_threads = []
-
-    for thread_name, stack in full_stack_map.items():
-        # Ensure stack is a list before iterating and frame is a string
-        if isinstance(stack, list) and any(isinstance(frame, str) and method_filter in frame for frame in stack):
-            full_trace = "\n".join([frame for frame in stack if isinstance(frame, str)])
-            matching_threads.append({
-                "Thread Name": thread_name,
-                "Thread State": thread_states.get(thread_name, "UNKNOWN"),
-                "Stack Trace": full_trace
-            })
+    matching_threads = threads_with_method(full_stack_map, thread_states, method_filter)
 
     if matching_threads:
         st.write(f"{len(matching_threads)} thread(s) matched method '{method_filter}'")
@@ -94,21 +69,12 @@ def show_blocking_method_deep_dive(hotspot_table, full_stack_map, thread_states)
         st.info("No threads matched the selected method.")
 
 def show_thread_states_summary(thread_states):
-    import pandas as pd
     st.markdown("### Thread States Summary")
-    state_counts = pd.Series(thread_states).value_counts().reset_index()
-    state_counts.columns = ["State", "Count"]
-    st.dataframe(state_counts)
+    st.dataframe(thread_state_counts(thread_states))
 
 def show_thread_group_summary(thread_states):
-    import pandas as pd
     st.markdown("### Thread Group Summary")
-    group_counts = {}
-    for name in thread_states:
-        group = name.split('-')[0] if '-' in name else name
-        group_counts[group] = group_counts.get(group, 0) + 1
-    df = pd.DataFrame(list(group_counts.items()), columns=["Thread Group", "Count"])
-    df = df.sort_values("Count", ascending=False).reset_index(drop=True)
+    df = thread_group_counts(thread_states)
     # Pad the count column for visual centering (optional)
     df["Count"] = df["Count"].astype(str).str.center(30)
     st.dataframe(df, use_container_width=True)
@@ -142,28 +108,15 @@ def show_threads_by_state(thread_states, full_stack_map):
 
 
 def detect_deadlocks(thread_waiting_on, lock_owners):
-    # Build wait-for graph
-    wait_for = {}
-    for thread, lock in thread_waiting_on.items():
-        owner = lock_owners.get(lock)
-        if owner:
-            wait_for[thread] = owner
-    # Detect cycles
-    visited = set()
-    for start in wait_for:
-        path = set()
-        t = start
-        while t in wait_for and t not in path:
-            path.add(t)
-            t = wait_for[t]
-        if t == start:
-            # Prepare a summary string for the dashboard
-            summary = (
-                f"**Deadlock detected involving the following threads:**\n\n"
-                + "\n".join(f"- {thread}" for thread in path)
-            )
-            st.error(summary)
-            return True, path
+    path = find_deadlock(thread_waiting_on, lock_owners)
+    if path:
+        # Prepare a summary string for the dashboard
+        summary = (
+            f"**Deadlock detected involving the following threads:**\n\n"
+            + "\n".join(f"- {thread}" for thread in path)
+        )
+        st.error(summary)
+        return True, path
     st.success("No deadlocks detected in this thread dump.")
     return False, None
 
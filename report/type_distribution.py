@@ -1,22 +1,15 @@
 import streamlit as st
-import altair as alt
-import pandas as pd
+from analysis.type_distribution import type_distribution
 
-def show_type_distribution(_df):
+def show_type_distribution(cube):
+    import altair as alt
     st.subheader("📈 Type Distribution by File (Grouped Bar Chart)")
-    # Exclude warnings
-    _df = _df[_df["Type"].str.lower() != "warning"]
-    type_dist = _df.groupby(["Type", "Source File"]).size().reset_index(name="Count")
+    type_dist = type_distribution(cube)
 
     if type_dist.empty:
         st.info("No error/warning/exception data available to display.")
         return
-
-    # Ensure all combinations of Type and Source File are present (even if count is 0)
-    all_types = sorted(_df["Type"].unique())
-    all_files = sorted(_df["Source File"].unique())
-    full_index = pd.MultiIndex.from_product([all_types, all_files], names=["Type", "Source File"])
-    type_dist = type_dist.set_index(["Type", "Source File"]).reindex(full_index, fill_value=0).reset_index()
+    all_files = type_dist["Source File"].unique()
 
     # Altair grouped bar chart with labels
     chart = (
@@ -1,31 +1,30 @@
 import streamlit as st
+from data.cache import get_entry_index, get_sort_keys
+from report.errors_table import COLUMNS
+from report.paging import show_paged_table
 
-def show_type_filter(filtered_df):
+# rows are the row ids of df selected in "All Errors"; the filters narrow them on the cached EntryIndex, and
+# pages are sorted by the cached ranks of get_sort_keys, so only the shown page is built as a frame
+def show_type_filter(df, rows):
+    entry_index = get_entry_index(df)
     st.subheader("🔍 Filter by Type or Exception")
-    if filtered_df["Type"].nunique() > 0:
+    if len(rows) > 0:
         col1, col2 = st.columns(2)
         with col1:
             selected_file = st.selectbox(
                 "Select Source File",
-                options=["ALL"] + sorted(filtered_df["Source File"].unique()),
+                options=["ALL"] + entry_index.values_in("file", rows),
                 index=0
             )
         with col2:
             selected_type = st.selectbox(
                 "Select Type",
-                options=["ALL"] + sorted(filtered_df["Type"].unique()),
+                options=["ALL"] + entry_index.values_in("type", rows),
                 index=0
             )
 
-        df_filtered = filtered_df.copy()
-        if selected_file != "ALL":
-            df_filtered = df_filtered[df_filtered["Source File"] == selected_file]
-        if selected_type != "ALL":
-            df_filtered = df_filtered[df_filtered["Type"] == selected_type]
-
-        st.dataframe(
-            df_filtered[
-                ["Source File", "Line", "Date", "Time", "Type", "Code", "Message", "Timestamp"]
-            ],
-            use_container_width=True
-        )            
\ No newline at end of file
+        show_paged_table(
+            df, entry_index.narrow(rows, selected_file, selected_type), COLUMNS, key="type_filter",
+            frame=lambda page_rows: entry_index.frame(df, page_rows),
+            keys=lambda column: get_sort_keys(df, column)
+        )
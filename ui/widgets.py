@@ -1,15 +1,36 @@
 import streamlit as st
+from data.compressed import COMPRESSED_TYPES
+from data.session import SESSION_FORMATS
 
 
 # Function to create a file uploader widget
 def file_uploader(key=None):
     return st.file_uploader(
         "📂 Upload one or more 3DEXPERIENCE Log/Dump Files (stderr.log / mxtrace.log / any)",
-        type=["log", "txt", "tdump"],
+        type=["log", "txt", "tdump"] + COMPRESSED_TYPES,
         accept_multiple_files=True,
         key=key
     )
 
+# Text area for paths of log files on the server, read in place instead of being uploaded
+def server_paths_input(key):
+    with st.expander("📁 Analyze log files on this server"):
+        text = st.text_area("One file path per line; the files are read in place (memory-mapped), not uploaded", key=key)
+    return [line.strip() for line in text.splitlines() if line.strip()]
+
+# Text area for paths of log files on the server to follow while they are being written
+def follow_paths_input(key):
+    with st.expander("📡 Follow live log files on this server"):
+        text = st.text_area("One file path per line; new lines are parsed on every refresh", key=key)
+        if text.strip():
+            st.button("🔄 Refresh", key=f"{key}_refresh")
+    return [line.strip() for line in text.splitlines() if line.strip()]
+
+# Uploader for a session saved with report/export.py:show_session_export, loaded instead of parsing logs
+def session_uploader(key):
+    with st.expander("📦 Load a saved session"):
+        return st.file_uploader("Parquet or Arrow file downloaded from \"Save session\"", type=list(SESSION_FORMATS), key=key)
+
 # def file_uploader():
 #     # If clear_files is set, reset the flag (the uploader will show empty)
 #     if st.session_state.get("clear_files", False):
@@ -12,4 +12,24 @@ APACHE_ACCESS_LOG_PATTERN = re.compile(
 
 APACHE_SSL_LOG_PATTERN = re.compile(
     r'\[(?P<timestamp>[^\]]+)\] (?P<ip>\S+) (?P<tlsver>TLSv[0-9.]+) (?P<cipher>\S+) "(?P<method>\S+) (?P<url>\S+) \S+" (?P<size>\d+)'
-)
\ No newline at end of file
+)
+
+# Literal prefilter for the patterns above. A line can only match error_regex if its lowercase form
+# contains one of these keywords ("System Error" is covered by "error"); exception_regex is
+# case-sensitive on "Exception".
+ERROR_KEYWORDS = ("error", "warning", "notice", "severe")
+EXCEPTION_KEYWORD = "Exception"
+
+
+# Bytes versions of the patterns above, for scanning undecoded file contents (data/mmap_parser.py). On
+# ASCII text without the characters str regexes treat as extra whitespace or line boundaries
+# (\v, \f, \r, \x1c-\x1f) they match exactly like the str patterns.
+def bytes_pattern(pattern):
+    return re.compile(pattern.pattern.encode("ascii"), pattern.flags & ~re.UNICODE)
+
+
+error_regex_bytes = bytes_pattern(error_regex)
+exception_regex_bytes = bytes_pattern(exception_regex)
+timestamp_regex_bytes = bytes_pattern(timestamp_regex)
+mxtrace_ts_pattern_bytes = bytes_pattern(mxtrace_ts_pattern)
+apache_ts_pattern_bytes = bytes_pattern(apache_ts_pattern)